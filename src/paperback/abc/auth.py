@@ -1,25 +1,43 @@
+import csv
+import json
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Callable, ClassVar, Dict, Final, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Body,
     Depends,
     FastAPI,
     Header,
     HTTPException,
+    Query,
     Request,
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import EmailStr
+from pydantic import BaseModel, EmailStr, ValidationError
 
+from ..util import LineFeed, iterate_lines, ndjson_response
 from .base import Base
 from .models import (  # TokenListRes,
     Credentials,
+    ImportedUser,
+    ImportRes,
+    ImportRowError,
     InviteCode,
     InviteCodeListRes,
     MinimalInviteCode,
@@ -61,6 +79,19 @@ class BaseAuth(Base, metaclass=ABCMeta):
 
     public_org_id: str = "public"
 
+    # if true, `signin` returns token from `refresh` as access token
+    # and token from `signin` as refresh token
+    issues_access_tokens: bool = False
+
+    # number of imported rows passed to `import_users`/`import_orgs` at once
+    import_batch_size: int = 1000
+
+    import_content_types: ClassVar[Dict[str, str]] = {
+        "text/csv": "csv",
+        "application/x-ndjson": "jsonl",
+        "application/jsonl": "jsonl",
+    }
+
     @staticmethod
     def add_CORS(api: FastAPI):  # noqa: N802
         """
@@ -83,7 +114,7 @@ class BaseAuth(Base, metaclass=ABCMeta):
         self,
         greater_or_equal: Optional[int] = None,
         one_of: Optional[List[int]] = None,
-    ) -> Callable[[str], UserInfo]:
+    ) -> Callable[[str], Awaitable[UserInfo]]:
         """
         validates token with given parameters
 
@@ -100,8 +131,8 @@ class BaseAuth(Base, metaclass=ABCMeta):
 
         Returns
         -------
-        Callable[[str], UserInfo]
-            function which accept `Authentication` header
+        Callable[[str], Awaitable[UserInfo]]
+            coroutine function which accept `Authentication` header
             and returns info about tokens requester in UserInfos
 
         """
@@ -113,7 +144,7 @@ class BaseAuth(Base, metaclass=ABCMeta):
         if greater_or_equal is None and one_of is None:
             raise ValueError("either greater_or_equal or one_of should be provided")
 
-        def return_function(x_authentication: str = Header(...)) -> UserInfo:
+        async def return_function(x_authentication: str = Header(...)) -> UserInfo:
             # TODO: change to this in python3.9
             # token: str = x_authentication.removeprefix("Bearer: ")
             token: str = (
@@ -122,7 +153,7 @@ class BaseAuth(Base, metaclass=ABCMeta):
                 else x_authentication
             )
 
-            user: UserInfo = UserInfo(**self.token2user(token))
+            user: UserInfo = UserInfo(**(await self.token2user(token)))
             if greater_or_equal is not None:
                 if user.level_of_access < greater_or_equal:
                     raise HTTPException(
@@ -164,7 +195,7 @@ class BaseAuth(Base, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def token2user(self, token: str) -> Dict[str, Union[str, int]]:
+    async def token2user(self, token: str) -> Dict[str, Union[str, int]]:
         """
         decodes and validates token, returning user from token in "Authentication" header
 
@@ -185,10 +216,14 @@ class BaseAuth(Base, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def cleanup_tokens(self):
+    async def cleanup_tokens(self):
         """
-        will be added as job to BackgroundTasks on every signin
         should remove all expired tokens
+
+        Note
+        ----
+        module is responsible for running it periodically,
+        i.e. from task created in `__async__init__`
         """
         raise NotImplementedError
 
@@ -215,6 +250,25 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def refresh(self, refresh_token: str) -> str:
+        """
+        issues new short lived access token for token returned by `signin`
+
+        Note
+        ----
+        only called if `issues_access_tokens` is true
+
+        Parameters
+        ----------
+        refresh_token: str
+
+        Returns
+        -------
+        str
+            JSON Web Token, which can be verified without querying the database
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def signup(
         self,
@@ -273,14 +327,31 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
-    async def read_tokens(self, user_id: str) -> List[Dict[str, Any]]:
+    async def read_tokens(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        active_only: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        reads all tokens issued by user with id `user_id`
+        reads page of tokens issued by user with id `user_id`, newest first
 
         Parameters
         ----------
         user_id: str
             id of user-owner of tokens
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of tokens in page
+        active_only: bool
+            if `True` returns only tokens, which didn't expire
+
+        Returns
+        -------
+        Tuple[List[Dict[str, Any]], Optional[str]]
+            tokens and cursor of next page, `None` if it's the last page
         """
         raise NotImplementedError
 
@@ -363,14 +434,24 @@ class BaseAuth(Base, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    async def read_users(self) -> List[Dict[str, Union[str, int]]]:
+    async def read_users(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Dict[str, Union[str, int]]], Optional[str]]:
         """
-        reads all users and returns info in list of dicts
+        reads page of users ordered by user_id
+
+        Parameters
+        ----------
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of users in page
 
         Returns
         -------
-        List[Dict[str, Union[str, int]]]:
-            list of users without password
+        Tuple[List[Dict[str, Union[str, int]]], Optional[str]]
+            list of users without password and cursor of next page,
+            `None` if it's the last page
             Contains:
                 Dict[str, Union[str, int]]
                 Contains:
@@ -382,6 +463,22 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def iterate_users(self) -> AsyncIterator[Dict[str, Union[str, int]]]:
+        """
+        yields all users one by one, see `read_users` for contents
+
+        Note
+        ----
+        reads users page by page, should be overridden to stream rows from DB
+        """
+        cursor: Optional[str] = None
+        while True:
+            users, cursor = await self.read_users(cursor=cursor)
+            for user in users:
+                yield user
+            if cursor is None:
+                break
+
     @abstractmethod
     async def update_user(
         self,
@@ -495,6 +592,35 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def import_users(
+        self, users: List[Tuple[int, ImportedUser]]
+    ) -> List[ImportRowError]:
+        """
+        creates batch of users
+
+        Parameters
+        ----------
+        users: List[Tuple[int, ImportedUser]]
+            numbers of rows and users to create
+
+        Returns
+        -------
+        List[ImportRowError]
+            errors of rows, which weren't created
+
+        Note
+        ----
+        creates users one by one with `create_user`,
+        should be overridden to create whole batch at once
+        """
+        errors: List[ImportRowError] = []
+        for row, user in users:
+            try:
+                await self.create_user(**user.dict())
+            except HTTPException as exception:
+                errors.append(ImportRowError(row=row, detail=exception.detail))
+        return errors
+
     # organisation
 
     @abstractmethod
@@ -547,20 +673,28 @@ class BaseAuth(Base, metaclass=ABCMeta):
 
     @abstractmethod
     async def read_orgs(
-        self, columns: Optional[List[str]] = None
-    ) -> List[Dict[str, str]]:
+        self,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
         """
-        returns list with all organisations
+        returns page of organisations ordered by organisation_id
 
         Parameters
         ----------
         columns: List[str], optional
             list of columns. If `None` then all columns are selected
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of organisations in page
 
         Returns
         -------
-        List[Dict[str, str]]
-            list of organisations
+        Tuple[List[Dict[str, str]], Optional[str]]
+            list of organisations and cursor of next page,
+            `None` if it's the last page
             Contains:
                 Dict[str, str]
                     mapping from column to value, depends on `columns`
@@ -570,6 +704,22 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def iterate_orgs(self) -> AsyncIterator[Dict[str, str]]:
+        """
+        yields all organisations one by one, see `read_orgs` for contents
+
+        Note
+        ----
+        reads organisations page by page, should be overridden to stream rows from DB
+        """
+        cursor: Optional[str] = None
+        while True:
+            orgs, cursor = await self.read_orgs(cursor=cursor)
+            for org in orgs:
+                yield org
+            if cursor is None:
+                break
+
     @abstractmethod
     async def update_org(
         self,
@@ -611,6 +761,147 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def import_orgs(
+        self, orgs: List[Tuple[int, MinimalOrganisation]]
+    ) -> List[ImportRowError]:
+        """
+        creates batch of organisations
+
+        Parameters
+        ----------
+        orgs: List[Tuple[int, MinimalOrganisation]]
+            numbers of rows and organisations to create
+
+        Returns
+        -------
+        List[ImportRowError]
+            errors of rows, which weren't created
+
+        Note
+        ----
+        creates organisations one by one with `create_org`,
+        should be overridden to create whole batch at once
+        """
+        errors: List[ImportRowError] = []
+        for row, org in orgs:
+            try:
+                await self.create_org(org.organisation_id, org.organisation_name)
+            except HTTPException as exception:
+                errors.append(ImportRowError(row=row, detail=exception.detail))
+        return errors
+
+    async def import_records(
+        self,
+        request: Request,
+        model: Any,
+        importer: Callable[[List[Tuple[int, Any]]], Awaitable[List[ImportRowError]]],
+    ) -> ImportRes:
+        """
+        parses streamed CSV or JSON lines body of request
+        and passes it to `importer` in batches of `import_batch_size` rows
+
+        Parameters
+        ----------
+        request: Request
+            request with `text/csv` or `application/x-ndjson` body,
+            first line of CSV is header with names of fields
+        model: Type[BaseModel]
+            model of single row
+        importer: Callable[[List[Tuple[int, BaseModel]]], Awaitable[List[ImportRowError]]]
+            creates batch of rows, i.e. `import_users`
+        """
+        content_type: str = request.headers.get("content-type", "").split(";")[0]
+        body_format: Optional[str] = self.import_content_types.get(content_type.strip())
+        if body_format is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail={
+                    "eng": "body should be CSV or JSON lines",
+                    "rus": "тело запроса должно быть в формате CSV или JSON lines",
+                },
+            )
+
+        created: int = 0
+        errors: List[ImportRowError] = []
+        batch: List[Tuple[int, BaseModel]] = []
+        header: Optional[List[str]] = None
+        row: int = 0
+        # single reader parses whole body, so quoted fields can contain newlines
+        feed: LineFeed = LineFeed()
+        reader = csv.reader(feed)
+        record_lines: List[str] = []
+        line_number: int = 0
+
+        async def flush():
+            nonlocal created, batch
+            batch_errors: List[ImportRowError] = await importer(batch)
+            created += len(batch) - len(batch_errors)
+            errors.extend(batch_errors)
+            batch = []
+
+        lines: AsyncIterator[str] = iterate_lines(request.stream())
+        while True:
+            try:
+                line: str = await lines.__anext__()
+            except StopAsyncIteration:
+                break
+            except UnicodeDecodeError:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail={
+                        "eng": f"line {line_number + 1} isn't valid UTF-8, "
+                        f"{created} rows before it were created",
+                        "rus": f"строка {line_number + 1} не в кодировке UTF-8, "
+                        f"{created} строк до неё были созданы",
+                    },
+                )
+            line_number += 1
+
+            if body_format == "csv":
+                record_lines.append(line)
+                # quoted field continues on the next line
+                if sum(part.count('"') for part in record_lines) % 2 == 1:
+                    continue
+                if not any(part.strip() for part in record_lines):
+                    record_lines = []
+                    continue
+                feed.lines.extend(part + "\n" for part in record_lines)
+                record_lines = []
+                try:
+                    values: List[str] = next(reader)
+                except csv.Error as exception:
+                    row += 1
+                    errors.append(ImportRowError(row=row, detail=str(exception)))
+                    continue
+                if header is None:
+                    header = values
+                    continue
+            elif not line.strip():
+                continue
+
+            row += 1
+            try:
+                if header is not None:
+                    record: Any = {
+                        field: value for field, value in zip(header, values) if value
+                    }
+                else:
+                    record = json.loads(line)
+                batch.append((row, model.parse_obj(record)))
+            except (ValueError, ValidationError) as exception:
+                errors.append(ImportRowError(row=row, detail=str(exception)))
+
+            if len(batch) >= self.import_batch_size:
+                await flush()
+        if record_lines:
+            row += 1
+            errors.append(ImportRowError(row=row, detail="quoted field isn't closed"))
+        if batch:
+            await flush()
+
+        errors.sort(key=lambda error: error.row)
+        return ImportRes(created=created, errors=errors)
+
     # invite codes
 
     @abstractmethod
@@ -650,14 +941,24 @@ class BaseAuth(Base, metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    async def read_invite_codes(self) -> List[Dict[str, str]]:
+    async def read_invite_codes(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
         """
-        returns created invite codes
+        returns page of created invite codes ordered by code
+
+        Parameters
+        ----------
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of invite codes in page
 
         Returns
         ----------
-        List[Dict[str, str]]
-            list of invite codes
+        Tuple[List[Dict[str, str]], Optional[str]]
+            list of invite codes and cursor of next page,
+            `None` if it's the last page
             Dict[str, str]
                 code: str
                 issuer_id: str
@@ -665,6 +966,93 @@ class BaseAuth(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def iterate_invite_codes(self) -> AsyncIterator[Dict[str, str]]:
+        """
+        yields all invite codes one by one, see `read_invite_codes` for contents
+
+        Note
+        ----
+        reads invite codes page by page, should be overridden to stream rows from DB
+        """
+        cursor: Optional[str] = None
+        while True:
+            codes, cursor = await self.read_invite_codes(cursor=cursor)
+            for code in codes:
+                yield code
+            if cursor is None:
+                break
+
+    async def invite_code_visible(self, requester: UserInfo, code: InviteCode) -> bool:
+        """
+        checks if requester can see and delete invite code
+
+        Note
+        ----
+        admins see all codes, organizers see codes issued in their organisation,
+        anyone else sees own codes, codes to public organisation are visible to all
+        """
+        if requester.level_of_access == 3:
+            return True
+        if code.issuer_id == requester.user_id or code.add_to == self.public_org_id:
+            return True
+        if requester.level_of_access == 2:
+            issuer: UserInfo = UserInfo(**(await self.read_user(code.issuer_id)))
+            return issuer.member_of == requester.member_of
+        return False
+
+    async def read_visible_invite_codes(
+        self,
+        requester: UserInfo,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """
+        returns page of invite codes, which requester can see, ordered by code
+
+        Parameters
+        ----------
+        requester: UserInfo
+            user, who requests invite codes
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of invite codes in page
+
+        Returns
+        -------
+        Tuple[List[Dict[str, str]], Optional[str]]
+            see `read_invite_codes`
+
+        Note
+        ----
+        checks codes of page with `invite_code_visible` one by one,
+        so page can be shorter than `limit`. Should be overridden to filter codes
+        in one query to DB
+        """
+        raw_codes, next_cursor = await self.read_invite_codes(
+            cursor=cursor, limit=limit
+        )
+        codes: List[Dict[str, str]] = [
+            raw_code
+            for raw_code in raw_codes
+            if await self.invite_code_visible(requester, InviteCode(**raw_code))
+        ]
+        return codes, next_cursor
+
+    async def iterate_visible_invite_codes(
+        self, requester: UserInfo
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        yields all invite codes, which requester can see, one by one
+
+        Note
+        ----
+        see `read_visible_invite_codes`
+        """
+        async for raw_code in self.iterate_invite_codes():
+            if await self.invite_code_visible(requester, InviteCode(**raw_code)):
+                yield raw_code
+
     @abstractmethod
     async def delete_invite_code(self, code: str):
         """
@@ -710,18 +1098,44 @@ class BaseAuth(Base, metaclass=ABCMeta):
         async def signin(
             credentials: Credentials,
             request: Request,
-            background_tasks: BackgroundTasks,
         ) -> SignInRes:
             """
             generates new token if provided user_id and password are correct
+
+            if module issues access tokens, returns access token
+            together with refresh token
             """
-            background_tasks.add_task(self.cleanup_tokens)
-            return SignInRes(
-                response=await self.signin(
-                    request=request,
-                    password=credentials.password,
-                    identifier=credentials.identifier,
+            token: str = await self.signin(
+                request=request,
+                password=credentials.password,
+                identifier=credentials.identifier,
+            )
+            if self.issues_access_tokens:
+                return SignInRes(
+                    response=await self.refresh(token), refresh_token=token
                 )
+            return SignInRes(response=token)
+
+        @router.post(
+            "/refresh",
+            tags=["auth_module", "auth"],
+            response_model=SignInRes,
+        )
+        async def refresh(refresh_token: str = Body(..., embed=True)) -> SignInRes:
+            """
+            generates new access token from refresh token returned by `/signin`
+            """
+            if not self.issues_access_tokens:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "eng": "access tokens are disabled",
+                        "rus": "токены доступа отключены",
+                    },
+                )
+            return SignInRes(
+                response=await self.refresh(refresh_token),
+                refresh_token=refresh_token,
             )
 
         @router.post(
@@ -765,15 +1179,22 @@ class BaseAuth(Base, metaclass=ABCMeta):
         # tokens
         @router.get("/tokens", tags=["auth_module", "token"])
         async def read_tokens(
+            cursor: Optional[str] = None,
+            limit: int = Query(50, ge=1, le=1000),
+            active_only: bool = False,
             requester: UserInfo = Depends(token_tester(greater_or_equal=0)),
         ) -> TokenListRes:
             """
-            removes token by provided identifier:
-                either token itself or token uuid
+            reads tokens of requester page by page, newest first
             """
-            raw_tokens = await self.read_tokens(requester.user_id)
+            raw_tokens, next_cursor = await self.read_tokens(
+                requester.user_id,
+                cursor=cursor,
+                limit=limit,
+                active_only=active_only,
+            )
             tokens = [TokenRes(**dict(token)) for token in raw_tokens]
-            return TokenListRes(response=tokens)
+            return TokenListRes(response=tokens, next_cursor=next_cursor)
 
         @router.delete("/token", tags=["auth_module", "token"])
         async def delete_token(token_identifier: str = Body(...)):
@@ -814,6 +1235,25 @@ class BaseAuth(Base, metaclass=ABCMeta):
                 level_of_access=created_user["level_of_access"],
             )
 
+        @router.post(
+            "/usrs/import",
+            tags=["auth_module", "user", "access_level_3"],
+            response_model=ImportRes,
+            dependencies=[Depends(token_tester(greater_or_equal=3))],
+        )
+        async def import_users(request: Request) -> ImportRes:
+            """
+            creates users from streamed CSV (`text/csv`)
+            or JSON lines (`application/x-ndjson`) body
+
+            Note
+            ----
+            * every row has fields of `NewUser`, `level_of_access` and `member_of`
+            * users without `member_of` are assigned to public organisation
+            * rows, which can't be created, are listed in `errors` by their number
+            """
+            return await self.import_records(request, ImportedUser, self.import_users)
+
         @router.get(
             "/me",
             tags=["auth_module", "user", "access_level_0"],
@@ -849,25 +1289,38 @@ class BaseAuth(Base, metaclass=ABCMeta):
             "/usrs",
             tags=["auth_module", "user", "access_level_3"],
             response_model=UserListResponse,
+            dependencies=[Depends(token_tester(greater_or_equal=3))],
         )
-        async def read_all_users() -> UserListResponse:
+        async def read_all_users(
+            cursor: Optional[str] = None,
+            limit: int = Query(100, ge=1, le=1000),
+            stream: bool = False,
+        ) -> UserListResponse:
             """
-            reads all existing users
+            reads existing users page by page
+
+            if `stream` is set, all users are sent as newline delimited json instead
 
             created users are assigned to public organisation
             """
-            raw_users: List[Dict[str, Any]] = await self.read_users()
-            users: List[UserInfo] = [
-                UserInfo(
+
+            def to_user_info(user: Dict[str, Any]) -> UserInfo:
+                return UserInfo(
                     user_id=user["user_id"],
                     email=user["email"],
                     user_name=user["user_name"],
                     member_of=user["member_of"],
                     level_of_access=user["level_of_access"],
                 )
-                for user in raw_users
-            ]
-            return UserListResponse(response=users)
+
+            if stream:
+                return ndjson_response(
+                    to_user_info(user) async for user in self.iterate_users()
+                )
+
+            raw_users, next_cursor = await self.read_users(cursor=cursor, limit=limit)
+            users: List[UserInfo] = [to_user_info(user) for user in raw_users]
+            return UserListResponse(response=users, next_cursor=next_cursor)
 
         @router.patch(
             "/usrs/{user_id}/user_id",
@@ -1022,15 +1475,27 @@ class BaseAuth(Base, metaclass=ABCMeta):
             response_model=OrgListRes,
             dependencies=[Depends(token_tester(greater_or_equal=3))],
         )
-        async def read_organisations() -> OrgListRes:
+        async def read_organisations(
+            cursor: Optional[str] = None,
+            limit: int = Query(100, ge=1, le=1000),
+            stream: bool = False,
+        ) -> OrgListRes:
             """
-            returns list of organisations
+            returns organisations page by page
+
+            if `stream` is set, all organisations are sent as newline delimited json
+            instead
             """
-            raw_orgs: List[Dict[str, str]] = await self.read_orgs()
+            if stream:
+                return ndjson_response(
+                    MinimalOrganisation(**org) async for org in self.iterate_orgs()
+                )
+
+            raw_orgs, next_cursor = await self.read_orgs(cursor=cursor, limit=limit)
             orgs: List[MinimalOrganisation] = [
                 MinimalOrganisation(**org) for org in raw_orgs
             ]
-            return OrgListRes(response=orgs)
+            return OrgListRes(response=orgs, next_cursor=next_cursor)
 
         @router.post(
             "/orgs",
@@ -1043,6 +1508,26 @@ class BaseAuth(Base, metaclass=ABCMeta):
             """
             await self.create_org(org.organisation_id, org.organisation_name)
 
+        @router.post(
+            "/orgs/import",
+            tags=["auth_module", "organisation", "access_level_3"],
+            response_model=ImportRes,
+            dependencies=[Depends(token_tester(greater_or_equal=3))],
+        )
+        async def import_organisations(request: Request) -> ImportRes:
+            """
+            creates organisations from streamed CSV (`text/csv`)
+            or JSON lines (`application/x-ndjson`) body
+
+            Note
+            ----
+            * every row has fields of `MinimalOrganisation`
+            * rows, which can't be created, are listed in `errors` by their number
+            """
+            return await self.import_records(
+                request, MinimalOrganisation, self.import_orgs
+            )
+
         @router.get(
             "/orgs/{organisation_id}",
             tags=["auth_module", "organisation", "access_level_3"],
@@ -1217,39 +1702,28 @@ class BaseAuth(Base, metaclass=ABCMeta):
             response_model=InviteCodeListRes,
         )
         async def read_invite_codes(
+            cursor: Optional[str] = None,
+            limit: int = Query(100, ge=1, le=1000),
+            stream: bool = False,
             requester: UserInfo = Depends(token_tester(greater_or_equal=1)),
         ) -> InviteCodeListRes:
             """
-            acquires invite codes
+            acquires invite codes visible to requester page by page
+
+            if `stream` is set, all visible codes are sent as newline delimited json
+            instead
             """
-            raw_codes: List[Dict[str, str]] = await self.read_invite_codes()
+            if stream:
+                return ndjson_response(
+                    InviteCode(**code)
+                    async for code in self.iterate_visible_invite_codes(requester)
+                )
+
+            raw_codes, next_cursor = await self.read_visible_invite_codes(
+                requester, cursor=cursor, limit=limit
+            )
             codes: List[InviteCode] = [InviteCode(**code) for code in raw_codes]
-            if requester.level_of_access == 3:
-                # admin
-                return InviteCodeListRes(response=codes)
-            elif requester.level_of_access == 2:
-                # organizer
-                new_codes: List[InviteCode] = []
-                for code in codes:
-                    user: UserInfo = UserInfo(**(await self.read_user(code.issuer_id)))
-                    if (
-                        user.member_of == requester.member_of
-                        or user.user_id == requester.user_id
-                        or code.add_to == self.public_org_id
-                    ):
-                        new_codes.append(code)
-                return InviteCodeListRes(response=new_codes)
-            else:
-                # anyone else
-                new_codes: List[InviteCode] = []
-                for code in codes:
-                    user: UserInfo = UserInfo(**(await self.read_user(code.issuer_id)))
-                    if (
-                        user.user_id == requester.user_id
-                        or code.add_to == self.public_org_id
-                    ):
-                        new_codes.append(code)
-                return InviteCodeListRes(response=new_codes)
+            return InviteCodeListRes(response=codes, next_cursor=next_cursor)
 
         @router.get(
             "/invites/{invite_code}",
@@ -1289,11 +1763,8 @@ class BaseAuth(Base, metaclass=ABCMeta):
             """
             delete invite code by code itself
             """
-            codes: List[InviteCode] = (
-                await read_invite_codes(requester=requester)
-            ).response
-            codes_str: List[str] = [code.code for code in codes]
-            if invite_code not in codes_str:
+            code = InviteCode(**(await self.read_invite_code(invite_code)))
+            if not await self.invite_code_visible(requester, code):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="can't delete this invite code",
@@ -59,6 +59,27 @@ class Base(metaclass=ABCMeta):
         """
         pass
 
+    async def __async__del__(self):
+        """
+        additional finalization step, which will be awaited on app shutdown
+
+        Note
+        ----
+        Should not accept any arguments
+        """
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        runtime counters of module, i.e. cache hits and misses
+
+        Returns
+        -------
+        Dict[str, Any]
+            json serializable counters, empty by default
+        """
+        return {}
+
     @abstractmethod
     def create_router(
         self,
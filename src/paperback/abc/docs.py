@@ -5,7 +5,8 @@ from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Callable, ClassVar, Dict, Final, List, Optional
 
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 
 from .auth import BaseAuth
 from .base import Base
@@ -16,6 +17,7 @@ from .models import (
     CreateCorp,
     CreateDict,
     CreateDoc,
+    DocJob,
     LexicsAnalyzePreRes,
     LexicsAnalyzeReq,
     LexicsAnalyzeRes,
@@ -56,6 +58,9 @@ class BaseDocs(Base, metaclass=ABCMeta):
 
     TYPE: Final = "DOCS"
 
+    # if true, documents can be created in background with `enqueue_doc`
+    supports_jobs: bool = False
+
     @abstractmethod
     def __init__(self, cfg: SimpleNamespace, storage_dir: Path, auth_module: BaseAuth):
         """
@@ -126,6 +131,56 @@ class BaseDocs(Base, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    async def enqueue_doc(
+        self,
+        creator_id: str,
+        creator_type: str,
+        doc_id: str,
+        text: str,
+        analyzer_id: Optional["BaseDocs.AnalyzerEnum"] = None,
+        private: bool = False,
+        parent_corp_id: Optional[str] = None,
+        name: Optional[str] = None,
+        has_access: Optional[List[str]] = None,
+        author: Optional[str] = None,
+        created: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> str:
+        """
+        schedules creation of doc in background, accepts same parameters as `create_doc`
+
+        Note
+        ----
+        only called if `supports_jobs` is true
+
+        Returns
+        -------
+        str
+            id of job, which can be passed to `read_doc_job`
+        """
+        raise NotImplementedError
+
+    async def read_doc_job(self, job_id: str, requester_id: str) -> Dict[str, Any]:
+        """
+        reads state of job created by `enqueue_doc`
+
+        Parameters
+        ----------
+        job_id: str
+        requester_id: str
+            id of user, only creator of job can read it
+
+        Returns
+        -------
+        Dict[str, Any]
+            job_id: str
+            status: str
+            progress: Dict[str, Any], optional
+            result: Dict[str, Any], optional
+            error: str, optional
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def read_docs(
         self,
@@ -493,14 +548,59 @@ class BaseDocs(Base, metaclass=ABCMeta):
         @router.post("/docs", tags=["docs_module", "docs"])
         async def create_doc(
             doc: CreateDoc[str],
+            background: bool = False,
             requester: UserInfo = Depends(token_tester(greater_or_equal=0)),
         ):
             """
             creates document with given id if it's not occupied
-            """
-            return await self.create_doc(
+
+            with `background` document is analyzed and saved by worker,
+            response is 202 with job, which can be read from `/docs/jobs/{job_id}`
+            """
+            if not background:
+                return await self.create_doc(
+                    creator_id=requester.user_id, creator_type="user", **doc.dict()
+                )
+            if not self.supports_jobs:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "eng": "background creation of documents is not supported",
+                        "rus": "фоновое создание документов не поддерживается",
+                    },
+                )
+            job_id: str = await self.enqueue_doc(
                 creator_id=requester.user_id, creator_type="user", **doc.dict()
             )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=DocJob(job_id=job_id, status="PENDING").dict(),
+            )
+
+        @router.get(
+            "/docs/jobs/{job_id}",
+            tags=["docs_module", "docs"],
+            response_model=DocJob,
+        )
+        async def read_doc_job(
+            job_id: str,
+            requester: UserInfo = Depends(token_tester(greater_or_equal=0)),
+        ) -> DocJob:
+            """
+            returns status, progress and error of background creation of document,
+            only to user, who created it
+            """
+            if not self.supports_jobs:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "eng": "background creation of documents is not supported",
+                        "rus": "фоновое создание документов не поддерживается",
+                    },
+                )
+            return DocJob(
+                **(await self.read_doc_job(job_id, requester_id=requester.user_id))
+            )
 
         @router.get(
             "/docs",
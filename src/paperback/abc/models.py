@@ -6,6 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import (
     Any,
+    Awaitable,
     Callable,
     Dict,
     Generic,
@@ -34,6 +35,11 @@ class BaseRes(BaseModel):
 
 class SignInRes(BaseRes):
     response: str
+    refresh_token: Optional[str] = Field(
+        None,
+        description="long lived token for `/refresh`, "
+        "only present if `response` is short lived access token",
+    )
 
 
 class TokenRes(BaseModel):
@@ -41,11 +47,15 @@ class TokenRes(BaseModel):
     issued_by: str = Field(..., description="id of user, who issued a token")
     location: str
     device: str
-    issued_at: str = Field(..., description="iso formatted datetime of token creation")
+    issued_at: datetime = Field(..., description="datetime of token creation")
+    expires_at: datetime = Field(..., description="datetime of token expiration")
 
 
 class TokenListRes(BaseModel):
     response: List[TokenRes]
+    next_cursor: Optional[str] = Field(
+        None, description="cursor of next page, `None` if it's the last page"
+    )
 
 
 class Credentials(BaseModel):
@@ -74,6 +84,23 @@ class NewInvitedUser(NewUser):
     invitation_code: str
 
 
+class ImportedUser(NewUser):
+    level_of_access: int = Field(0, ge=0, le=3)
+    member_of: Optional[str] = Field(
+        None, description="id of organisation, public organisation if `None`"
+    )
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="number of data row, starting from 1")
+    detail: Any
+
+
+class ImportRes(BaseModel):
+    created: int
+    errors: List[ImportRowError]
+
+
 class UserInfo(BaseModel):
     user_id: str
     email: EmailStr
@@ -90,6 +117,9 @@ class UserInfo(BaseModel):
 
 class UserListResponse(BaseModel):
     response: List[UserInfo]
+    next_cursor: Optional[str] = Field(
+        None, description="cursor of next page, `None` if it's the last page"
+    )
 
 
 class UserUpdateUserId(BaseModel):
@@ -122,7 +152,7 @@ class TokenTester(Protocol):
         self,
         greater_or_equal: Optional[int] = None,
         one_of: Optional[List[int]] = None,
-    ) -> Callable[[str], UserInfo]:
+    ) -> Callable[[str], Awaitable[UserInfo]]:
         ...
 
 
@@ -137,6 +167,9 @@ class MinimalOrganisation(BaseModel):
 
 class OrgListRes(BaseModel):
     response: List[MinimalOrganisation]
+    next_cursor: Optional[str] = Field(
+        None, description="cursor of next page, `None` if it's the last page"
+    )
 
 
 class Organisation(MinimalOrganisation):
@@ -170,6 +203,9 @@ class InviteCode(MinimalInviteCode):
 
 class InviteCodeListRes(BaseModel):
     response: List[InviteCode]
+    next_cursor: Optional[str] = Field(
+        None, description="cursor of next page, `None` if it's the last page"
+    )
 
 
 # +------+
@@ -204,6 +240,16 @@ class CreateDoc(GenericModel, Generic[Analyzers]):
     tags: Optional[List[str]] = None
 
 
+class DocJob(BaseModel):
+    job_id: str
+    status: str = Field(
+        ..., description="PENDING, STARTED, PROGRESS, SUCCESS, FAILURE or RETRY"
+    )
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class ReadMinimalDoc(BaseModel):
     doc_id: str
     name: Optional[str] = None
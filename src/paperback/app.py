@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import List, Callable, Dict, Any, Set, Union
 from copy import deepcopy
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 import uuid
 
 from paperback import __version__
@@ -314,6 +314,13 @@ async def startup_event():
         await module.__async__init__()
 
 
+@api.on_event("shutdown")
+async def shutdown_event():
+    for name, module in plugin_name2module.items():
+        logger.debug("running async_del of module %s", name)
+        await module.__async__del__()
+
+
 @api.get("/info", tags=["root"])
 def stats():
     """basic app info
@@ -329,6 +336,22 @@ def stats():
     }
 
 
+@api.get(
+    "/stats",
+    tags=["root", "access_level_3"],
+    dependencies=[Depends(token_tester(greater_or_equal=3))],
+)
+def modules_stats():
+    """runtime counters of loaded modules, only available to admins
+
+    Returns
+    -------
+    dict
+        counters of each module by it's name
+    """
+    return {name: module.stats() for name, module in plugin_name2module.items()}
+
+
 @api.middleware("http")
 async def add_process_time_header(request: Request, call_next: Callable):
     start_time: float = time.time()
@@ -0,0 +1,321 @@
+import math
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence
+
+if TYPE_CHECKING:
+    import py2neo
+
+
+def time_calls(function: Callable[[str], object], samples: Sequence[str]) -> float:
+    """
+    returns mean time of single `function` call in microseconds
+    """
+    start: float = time.perf_counter()
+    for sample in samples:
+        function(sample)
+    return (time.perf_counter() - start) / max(len(samples), 1) * 1e6
+
+
+def bench_user_agents(
+    corpus: List[str],
+    requests: int,
+    cache_size: int,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    compares plain and memoized user agent parsing
+
+    Parameters
+    ----------
+    corpus: List[str]
+        recorded `User-Agent` headers, repeated lines model popular clients
+    requests: int
+        number of simulated signins, drawn from corpus
+    cache_size: int
+        size of memo cache
+    seed: int
+        seed for drawing requests from corpus
+
+    Returns
+    -------
+    Dict[str, float]
+        mean call time in microseconds, speedup and cache hit ratio
+    """
+    from paperback.std.auth.devices import DeviceParser
+
+    samples: List[str] = random.Random(seed).choices(corpus, k=requests)
+    parser: DeviceParser = DeviceParser(cache_size)
+
+    plain_us: float = time_calls(DeviceParser.parse, samples)
+    cached_us: float = time_calls(parser, samples)
+    lookups: int = parser.cache.hits + parser.cache.misses
+
+    return {
+        "distinct": len(set(corpus)),
+        "requests": requests,
+        "plain_us": plain_us,
+        "cached_us": cached_us,
+        "speedup": plain_us / cached_us,
+        "hit_ratio": parser.cache.hits / max(lookups, 1),
+    }
+
+
+def bench_jwt(curves: List[str], tokens: int) -> Dict[str, Dict[str, float]]:
+    """
+    measures signing and verification throughput of JWT per curve
+
+    Parameters
+    ----------
+    curves: List[str]
+        curves to compare, see `paperback.std.auth.keys.curve2algorithm`
+    tokens: int
+        number of tokens to sign and verify per curve
+
+    Returns
+    -------
+    Dict[str, Dict[str, float]]
+        per curve: algorithm, signatures and verifications per second,
+        and speedup of pre-parsed keys over PEM keys
+    """
+    from paperback.std.auth.keys import (
+        create_jwt,
+        curve2algorithm,
+        generate_keys,
+        load_keys,
+    )
+
+    res: Dict[str, Dict[str, float]] = {}
+    for curve in curves:
+        private_pem, public_pem = generate_keys(curve)
+        private_key, public_key = load_keys(curve, private_pem)
+        jwt = create_jwt(curve)
+        header: Dict[str, str] = {"alg": curve2algorithm[curve], "typ": "JWT"}
+        payloads: List[Dict[str, str]] = [
+            {"iss": "paperback", "sub": "user", "jti": str(uuid.uuid4())}
+            for _ in range(tokens)
+        ]
+
+        start: float = time.perf_counter()
+        signed: List[bytes] = [
+            jwt.encode(header, payload, private_key) for payload in payloads
+        ]
+        sign_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for token in signed:
+            jwt.decode(token, public_key)
+        verify_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for payload in payloads:
+            jwt.decode(jwt.encode(header, payload, private_pem), public_pem)
+        pem_time: float = time.perf_counter() - start
+
+        res[curve] = {
+            "algorithm": curve2algorithm[curve],
+            "sign_per_s": tokens / sign_time,
+            "verify_per_s": tokens / verify_time,
+            "parsed_speedup": pem_time / (sign_time + verify_time),
+        }
+    return res
+
+
+def recommend_rounds(scheme: str, rounds: int, latency: float, budget: float) -> int:
+    """
+    scales cost parameter of scheme, so that verification takes about `budget`
+
+    Note
+    ----
+    cost of argon2 and pbkdf2 grows linearly with rounds,
+    cost of bcrypt doubles with every round
+    """
+    ratio: float = budget / latency
+    if scheme == "bcrypt":
+        return min(max(rounds + math.floor(math.log2(ratio)), 4), 31)
+    if scheme == "pbkdf2_sha512":
+        return max(int(rounds * ratio) // 1000 * 1000, 1000)
+    return max(int(rounds * ratio), 1)
+
+
+def bench_hash(
+    schemes: List[str],
+    rounds: Dict[str, int],
+    concurrency: List[int],
+    verifies: int,
+    budget_ms: float,
+) -> Dict[str, Dict[str, object]]:
+    """
+    measures password verification cost per scheme on current machine
+
+    Parameters
+    ----------
+    schemes: List[str]
+        schemes of `crypto_context` to measure
+    rounds: Dict[str, int]
+        measured cost parameter per scheme
+    concurrency: List[int]
+        numbers of hashing processes to measure throughput with
+    verifies: int
+        number of verifications per concurrency level
+    budget_ms: float
+        acceptable latency of single verification in milliseconds
+
+    Returns
+    -------
+    Dict[str, Dict[str, object]]
+        per scheme: measured rounds, latency of single verification in ms,
+        throughput and latency in ms per concurrency level and recommended rounds
+    """
+    from paperback.std.auth.crypto import (
+        configure_context,
+        context_settings,
+        hash_password,
+        verify_password,
+    )
+
+    password: str = "correct horse battery staple"
+    res: Dict[str, Dict[str, object]] = {}
+    for scheme in schemes:
+        settings = context_settings(scheme, rounds)
+        configure_context(settings)
+        hashed_password: str = hash_password(password)
+
+        samples: List[float] = []
+        for _ in range(3):
+            start: float = time.perf_counter()
+            verify_password(password, hashed_password)
+            samples.append(time.perf_counter() - start)
+        latency: float = statistics.median(samples)
+
+        levels: Dict[int, Dict[str, float]] = {}
+        for workers in concurrency:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=configure_context,
+                initargs=(settings,),
+            ) as executor:
+                # start all processes before measuring
+                list(
+                    executor.map(
+                        verify_password,
+                        [password] * workers,
+                        [hashed_password] * workers,
+                    )
+                )
+                start = time.perf_counter()
+                list(
+                    executor.map(
+                        verify_password,
+                        [password] * verifies,
+                        [hashed_password] * verifies,
+                    )
+                )
+                elapsed: float = time.perf_counter() - start
+            levels[workers] = {
+                "verify_per_s": verifies / elapsed,
+                "latency_ms": elapsed * min(workers, verifies) / verifies * 1e3,
+            }
+
+        res[scheme] = {
+            "rounds": settings[f"{scheme}__rounds"],
+            "latency_ms": latency * 1e3,
+            "concurrency": levels,
+            "recommended_rounds": recommend_rounds(
+                scheme, settings[f"{scheme}__rounds"], latency, budget_ms / 1e3
+            ),
+        }
+    return res
+
+
+def synthetic_analyzer_result(
+    words: int, parent: "py2neo.Node", label: str
+) -> Dict[str, list]:
+    """
+    creates result shaped like result of `PyExLingWrapper` for `words` words,
+    every node also gets `label` for cleanup
+    """
+    from py2neo import Node, Relationship
+
+    text_node = Node("Text", label, text="")
+    nodes: list = [text_node]
+    relationships: list = [Relationship(parent, "contains", text_node)]
+    for sentence_start in range(0, words, 15):
+        sentence_node = Node("Sentence", label, idx=sentence_start)
+        nodes.append(sentence_node)
+        relationships.append(Relationship(text_node, "contains", sentence_node))
+        sentence_words: list = []
+        for clause_start in range(sentence_start, min(sentence_start + 15, words), 5):
+            clause_node = Node("Clause", label, idx=clause_start)
+            nodes.append(clause_node)
+            relationships.append(Relationship(sentence_node, "contains", clause_node))
+            for idx in range(clause_start, min(clause_start + 5, words)):
+                word_node = Node("Word", label, idx=idx, text=f"word{idx}")
+                nodes.append(word_node)
+                sentence_words.append(word_node)
+                relationships.append(Relationship(clause_node, "contains", word_node))
+        for prev_word, next_word in zip(sentence_words, sentence_words[1:]):
+            relationships.append(Relationship(prev_word, "next", next_word))
+    return {"nodes": nodes, "relationships": relationships}
+
+
+def bench_graph(graph: "py2neo.Graph", words: int, batch_size: int) -> Dict[str, float]:
+    """
+    compares writing of analyzer result entity by entity and with `GraphWriter`
+
+    Parameters
+    ----------
+    graph: py2neo.Graph
+        graph to write to, written nodes are removed afterwards
+    words: int
+        number of words in synthetic document
+    batch_size: int
+        batch size of `GraphWriter`
+
+    Returns
+    -------
+    Dict[str, float]
+        number of written entities and seconds per 1000 words for both writers
+    """
+    from py2neo import Node
+
+    from paperback.std.docs.graph_writer import GraphWriter
+
+    label: str = "PaperbackBench"
+    writer: GraphWriter = GraphWriter(batch_size)
+
+    def run(write: Callable) -> float:
+        tx = graph.begin()
+        parent = Node("AnalyzerResult", label)
+        tx.create(parent)
+        result = synthetic_analyzer_result(words, parent, label)
+        start: float = time.perf_counter()
+        write(tx, result)
+        tx.commit()
+        elapsed: float = time.perf_counter() - start
+        graph.run(f"MATCH (n:{label}) DETACH DELETE n")
+        return elapsed
+
+    def create_one_by_one(tx, result):
+        for node in result["nodes"]:
+            tx.create(node)
+        for relationship in result["relationships"]:
+            tx.create(relationship)
+
+    def create_batched(tx, result):
+        writer.write(tx, result["nodes"], result["relationships"])
+
+    sample = synthetic_analyzer_result(words, Node(label), label)
+    create_time: float = run(create_one_by_one)
+    unwind_time: float = run(create_batched)
+    return {
+        "words": words,
+        "nodes": len(sample["nodes"]),
+        "relationships": len(sample["relationships"]),
+        "create_s_per_1k": create_time / words * 1000,
+        "unwind_s_per_1k": unwind_time / words * 1000,
+        "speedup": create_time / unwind_time,
+    }
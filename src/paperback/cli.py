@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import click
 import uvicorn
@@ -113,3 +113,268 @@ def dev(ctx: click.Context, reload_dirs: List[Path]):
         reload_dirs=reload_dirs,
         use_colors=True,
     )
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "-c",
+    "--concurrency",
+    "concurrency",
+    default=2,
+    help="number of worker processes",
+    type=int,
+    show_default=True,
+)
+@click.pass_context
+def worker(ctx: click.Context, concurrency: int):
+    """
+    command for running workers, which analyze and save documents in background
+    """
+    from paperback.std.docs.tasks import app
+
+    app.worker_main(
+        [
+            "worker",
+            f"--concurrency={concurrency}",
+            f"--loglevel={ctx.obj['log_level']}",
+        ]
+    )
+
+
+@cli.group(context_settings=CONTEXT_SETTINGS)
+def bench():
+    """
+    micro-benchmarks of hot paths
+    """
+    pass
+
+
+@bench.command(context_settings=CONTEXT_SETTINGS)
+@click.argument(
+    "corpus_file",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "-n",
+    "--requests",
+    "requests",
+    default=100_000,
+    help="number of simulated signins",
+    type=int,
+)
+@click.option(
+    "-s",
+    "--cache-size",
+    "cache_size",
+    default=1024,
+    help="size of user agent cache",
+    type=int,
+)
+def ua(corpus_file: str, requests: int, cache_size: int):
+    """
+    compares plain and memoized user agent parsing on CORPUS_FILE
+
+    CORPUS_FILE should contain one recorded `User-Agent` header per line
+    """
+    from paperback.bench import bench_user_agents
+
+    corpus: List[str] = [
+        line.strip()
+        for line in Path(corpus_file).read_text().splitlines()
+        if line.strip()
+    ]
+    if not corpus:
+        raise click.BadParameter("corpus is empty", param_hint="CORPUS_FILE")
+
+    res = bench_user_agents(corpus, requests, cache_size)
+    click.echo(f"{res['distinct']} distinct user agents, {res['requests']} requests")
+    click.echo(f"plain:    {res['plain_us']:10.2f} us/call")
+    click.echo(
+        f"memoized: {res['cached_us']:10.2f} us/call, "
+        f"hit ratio {res['hit_ratio']:.2%}"
+    )
+    click.echo(f"speedup:  {res['speedup']:10.1f}x")
+
+
+@bench.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "-c",
+    "--curve",
+    "curves",
+    default=["secp256r1", "secp384r1", "secp521r1", "ed25519"],
+    help="curve to compare, can be repeated",
+    type=str,
+    multiple=True,
+)
+@click.option(
+    "-n",
+    "--tokens",
+    "tokens",
+    default=1000,
+    help="number of tokens to sign and verify per curve",
+    type=int,
+)
+def jwt(curves: List[str], tokens: int):
+    """
+    compares JWT signing and verification throughput of supported curves
+    """
+    from paperback.bench import bench_jwt
+
+    click.echo(
+        f"{'curve':<10} {'alg':<6} {'sign/s':>10} {'verify/s':>10} {'vs PEM':>8}"
+    )
+    for curve, res in bench_jwt(list(curves), tokens).items():
+        click.echo(
+            f"{curve:<10} {res['algorithm']:<6} "
+            f"{res['sign_per_s']:>10.0f} {res['verify_per_s']:>10.0f} "
+            f"{res['parsed_speedup']:>7.1f}x"
+        )
+
+
+@bench.command("hash", context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "-s",
+    "--scheme",
+    "schemes",
+    default=["argon2", "pbkdf2_sha512", "bcrypt"],
+    help="hashing scheme to measure, can be repeated",
+    type=click.Choice(["argon2", "pbkdf2_sha512", "bcrypt"]),
+    multiple=True,
+)
+@click.option(
+    "-r",
+    "--rounds",
+    "rounds",
+    default=[],
+    help="measured rounds as SCHEME=ROUNDS, defaults of auth module otherwise",
+    type=str,
+    multiple=True,
+)
+@click.option(
+    "-c",
+    "--concurrency",
+    "concurrency",
+    default=[],
+    help="number of hashing processes, can be repeated, "
+    "defaults to 1, 2, 4, ... up to number of CPUs",
+    type=int,
+    multiple=True,
+)
+@click.option(
+    "-n",
+    "--verifies",
+    "verifies",
+    default=32,
+    help="number of verifications per concurrency level",
+    type=int,
+)
+@click.option(
+    "-b",
+    "--budget",
+    "budget_ms",
+    default=250.0,
+    help="acceptable latency of single verification in milliseconds",
+    type=float,
+)
+def hash_(
+    schemes: List[str],
+    rounds: List[str],
+    concurrency: List[int],
+    verifies: int,
+    budget_ms: float,
+):
+    """
+    measures password verification latency and throughput of hashing schemes
+    and recommends `hash.<scheme>_rounds` options for latency budget
+    """
+    from paperback.bench import bench_hash
+
+    scheme_rounds: Dict[str, int] = {}
+    for option in rounds:
+        scheme, _, value = option.partition("=")
+        if not value.isdigit():
+            raise click.BadParameter(
+                f"`{option}` isn't SCHEME=ROUNDS", param_hint="--rounds"
+            )
+        scheme_rounds[scheme] = int(value)
+
+    levels: List[int] = list(concurrency)
+    if not levels:
+        cpus: int = os.cpu_count() or 1
+        levels = [2 ** i for i in range(cpus.bit_length()) if 2 ** i < cpus] + [cpus]
+
+    res = bench_hash(list(schemes), scheme_rounds, levels, verifies, budget_ms)
+    for scheme, scheme_res in res.items():
+        click.echo(
+            f"{scheme}: rounds {scheme_res['rounds']}, "
+            f"single verification {scheme_res['latency_ms']:.1f} ms"
+        )
+        click.echo(f"  {'processes':>9} {'verify/s':>10} {'latency ms':>11}")
+        for workers, level in scheme_res["concurrency"].items():
+            click.echo(
+                f"  {workers:>9} {level['verify_per_s']:>10.1f} "
+                f"{level['latency_ms']:>11.1f}"
+            )
+        click.echo(
+            f"  recommended for {budget_ms:.0f} ms: "
+            f"{scheme}_rounds = {scheme_res['recommended_rounds']}"
+        )
+
+
+@bench.command(context_settings=CONTEXT_SETTINGS)
+@click.option(
+    "--uri",
+    "uri",
+    default="bolt://localhost:7687",
+    help="uri of neo4j, which can be cleared of `PaperbackBench` nodes",
+    type=str,
+)
+@click.option(
+    "-u",
+    "--user",
+    "user",
+    default="neo4j",
+    help="neo4j user",
+    type=str,
+)
+@click.option(
+    "-p",
+    "--password",
+    "password",
+    default="password",
+    help="neo4j password",
+    type=str,
+)
+@click.option(
+    "-w",
+    "--words",
+    "words",
+    default=5000,
+    help="number of words in synthetic document",
+    type=int,
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    "batch_size",
+    default=1000,
+    help="batch size of UNWIND statements",
+    type=int,
+)
+def graph(uri: str, user: str, password: str, words: int, batch_size: int):
+    """
+    compares ingest time of analyzer results written entity by entity
+    and with batched UNWIND statements
+    """
+    import py2neo
+
+    from paperback.bench import bench_graph
+
+    res = bench_graph(py2neo.Graph(uri, auth=(user, password)), words, batch_size)
+    click.echo(
+        f"{res['words']} words, {res['nodes']} nodes, "
+        f"{res['relationships']} relationships"
+    )
+    click.echo(f"one by one: {res['create_s_per_1k']:8.3f} s per 1k words")
+    click.echo(f"unwind:     {res['unwind_s_per_1k']:8.3f} s per 1k words")
+    click.echo(f"speedup:    {res['speedup']:8.1f}x")
@@ -1,3 +1,5 @@
+import math
+
 from fastapi import status
 
 from paperback.exceptions import PaperBackError
@@ -6,3 +8,28 @@ from paperback.exceptions import PaperBackError
 class CantCreateUserError(PaperBackError):
     def __init__(self) -> None:
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail={}, headers={})
+
+
+class HashQueueFullError(PaperBackError):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "eng": "Too many password checks are in progress, try again later",
+                "rus": "Выполняется слишком много проверок паролей, "
+                "попробуйте позже",
+            },
+            headers={"Retry-After": "1"},
+        )
+
+
+class TooManyRequestsError(PaperBackError):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "eng": "Too many signin attempts, try again later",
+                "rus": "Слишком много попыток входа, попробуйте позже",
+            },
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
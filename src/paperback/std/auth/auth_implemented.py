@@ -1,30 +1,82 @@
+import asyncio
 import datetime
+import hmac
+import json
 import logging
 import re
+import time
 import uuid
-from collections import defaultdict
+import zlib
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
-
-import ecdsa
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import asyncpg
 import sqlalchemy as sa
-from authlib.jose import jwt
-from databases import Database
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from authlib.common.encoding import urlsafe_b64decode
+from authlib.jose import JsonWebToken, Key
 from email_validator import EmailNotValidError, validate_email
 from fastapi import HTTPException, Request, status
-from ipstack import GeoLookup
 from pydantic import EmailStr
-from user_agents import parse
 
 from paperback.abc import BaseAuth
-from paperback.abc.models import custom_charset
-from paperback.std.auth.crypto import crypto_context
+from paperback.abc.models import (
+    ImportedUser,
+    ImportRowError,
+    MinimalOrganisation,
+    UserInfo,
+    custom_charset,
+)
+from paperback.exceptions.auth import TooManyRequestsError
+from paperback.std.auth.cache import LRUCache
+from paperback.std.auth.crypto import (
+    HashPool,
+    configure_context,
+    context_settings,
+    default_rounds,
+    needs_update,
+)
+from paperback.std.auth.database import InstrumentedDatabase
+from paperback.std.auth.devices import DeviceParser
+from paperback.std.auth.geo import (
+    GeoBackend,
+    GeoLocator,
+    IPStackGeoBackend,
+    MMDBGeoBackend,
+)
+from paperback.std.auth.keys import (
+    create_jwt,
+    curve2algorithm,
+    generate_keys,
+    load_keys,
+)
+from paperback.std.auth.pagination import decode_cursor, encode_cursor
+from paperback.std.auth.ratelimit import RateLimiter
 
 
 class AuthImplemented(BaseAuth):
-    DEFAULTS: Mapping[str, Union[str, Mapping[str, Union[str, bool]]]] = {
+    DEFAULTS: Mapping[str, Union[str, Mapping[str, Union[str, bool, int]]]] = {
         "IPstack_api_key": "",
+        "geo": {
+            "db_file": "GeoLite2-City.mmdb",
+            "cache_size": 4096,
+            "unknown_ttl": 600,
+            "ipstack_timeout": 1,
+        },
+        "device": {
+            "cache_size": 1024,
+        },
         "root": {
             "username": "root",
             "password": "root",
@@ -35,16 +87,52 @@ class AuthImplemented(BaseAuth):
             "username": "postgres",
             "password": "password",
             "db": "papertext",
+            "min_size": 2,
+            "max_size": 10,
+            "acquire_timeout": 10,
+            "statement_cache_size": 100,
+        },
+        "hash": {
+            "algo": "pbkdf2_sha512",
+            "workers": 0,
+            "max_pending": 64,
+            "argon2_rounds": default_rounds["argon2"],
+            "pbkdf2_sha512_rounds": default_rounds["pbkdf2_sha512"],
+            "bcrypt_rounds": default_rounds["bcrypt"],
+            "rehash_queue_size": 1024,
+        },
+        "bulk": {
+            "batch_size": 1000,
+        },
+        "signin": {
+            "identifier_rate": 0.1,
+            "identifier_burst": 5,
+            "ip_rate": 1,
+            "ip_burst": 20,
+            "tracked_keys": 65536,
+            "max_concurrent_verifies": 0,
         },
-        "hash": {"algo": "pbkdf2_sha512"},
         "token": {
             "curve": "secp521r1",
             "generate_keys": False,
+            "cache_size": 4096,
+            "cache_ttl": 60,
+            "cleanup_interval": 3600,
+            "stateless": False,
+            "access_lifetime": 300,
         },
     }
 
     requires_dir: bool = True
 
+    revocation_channel: str = "paperback_auth_revocations"
+    # seconds between attempts to restore listener of `revocation_channel`
+    revocation_retry_delay: float = 5
+
+    # bump on every change of tables, indexes or `migrate_schema` steps
+    schema_version: int = 1
+    schema_lock_id: int = zlib.crc32(b"paperback_auth_schema")
+
     def __init__(self, cfg: SimpleNamespace, storage_dir: Path):
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.getLogger("paperback").level)
@@ -56,19 +144,85 @@ class AuthImplemented(BaseAuth):
         self.cfg: SimpleNamespace = cfg
 
         self.logger.debug("updating crypto context")
-        crypto_context.update(default=cfg.hash.algo)
-        self.logger.info("updated crypto context")
+        hash_settings: Dict[str, Any] = context_settings(
+            cfg.hash.algo,
+            {
+                scheme: int(getattr(cfg.hash, f"{scheme}_rounds"))
+                for scheme in default_rounds
+            },
+        )
+        configure_context(hash_settings)
+        self.logger.info("updated crypto context: %s", hash_settings)
+
+        self.logger.debug("creating hashing process pool")
+        self.hash_pool: HashPool = HashPool(
+            workers=int(cfg.hash.workers),
+            max_pending=int(cfg.hash.max_pending),
+            settings=hash_settings,
+        )
+        self.logger.info("created hashing process pool")
+
+        # queue is created in `__async__init__` to bind it to the running loop
+        self.rehash_queue_size: int = int(cfg.hash.rehash_queue_size)
+        self.rehash_queue: Optional["asyncio.Queue[Tuple[str, str, str]]"] = None
+        self.rehash_pending: Set[str] = set()
+        self.rehash_task: Optional[asyncio.Task] = None
+        self.rehashed: int = 0
+        self.rehash_dropped: int = 0
+
+        self.import_batch_size: int = int(cfg.bulk.batch_size)
+
+        self.logger.debug("setting up signin limits")
+        self.identifier_limiter: RateLimiter = RateLimiter(
+            float(cfg.signin.identifier_rate),
+            int(cfg.signin.identifier_burst),
+            int(cfg.signin.tracked_keys),
+        )
+        self.ip_limiter: RateLimiter = RateLimiter(
+            float(cfg.signin.ip_rate),
+            int(cfg.signin.ip_burst),
+            int(cfg.signin.tracked_keys),
+        )
+        # verifications above number of hashing processes only wait in queue
+        self.max_concurrent_verifies: int = int(cfg.signin.max_concurrent_verifies) or (
+            2 * self.hash_pool.workers
+        )
+        self.concurrent_verifies: int = 0
+        self.rejected_verifies: int = 0
+        self.logger.info(
+            "limited signin to %s concurrent verifications",
+            self.max_concurrent_verifies,
+        )
+
+        self.logger.debug("setting up geolocation")
+        geo_backends: List[GeoBackend] = []
+        geo_db_file: Path = self.storage_dir / cfg.geo.db_file
+        if geo_db_file.exists():
+            try:
+                geo_backends.append(MMDBGeoBackend(geo_db_file))
+                self.logger.debug("using geolocation DB %s", geo_db_file)
+            except Exception as exception:
+                self.logger.error("can't open geolocation DB: %s", exception)
+        else:
+            self.logger.warning("can't find geolocation DB %s", geo_db_file)
+        if cfg.IPstack_api_key:
+            self.logger.debug("using ipstack as fallback")
+            geo_backends.append(
+                IPStackGeoBackend(cfg.IPstack_api_key, float(cfg.geo.ipstack_timeout))
+            )
+        self.geo_locator: GeoLocator = GeoLocator(
+            geo_backends, int(cfg.geo.cache_size), float(cfg.geo.unknown_ttl)
+        )
+        self.logger.info("set up geolocation")
 
-        self.logger.debug("connecting to ipstack")
-        self.ip2geo: GeoLookup = GeoLookup(cfg.IPstack_api_key)
-        self.logger.info("connected to ipstack")
+        self.device_parser: DeviceParser = DeviceParser(int(cfg.device.cache_size))
 
         self.logger.debug("getting JWT keys")
 
         self.private_key_file: Path = self.storage_dir / "private.pem"
         self.public_key_file: Path = self.storage_dir / "public.pem"
-        self.private_key: bytes
-        self.public_key: bytes
+        self.private_key: Key
+        self.public_key: Key
 
         if cfg.token.generate_keys:
             self.logger.debug("option for generation keys is enabled")
@@ -87,19 +241,59 @@ class AuthImplemented(BaseAuth):
                 self.public_key_file.touch(exist_ok=True)
                 self.private_key_file.touch(exist_ok=True)
             self.logger.debug("generating new keys")
-            self.private_key, self.public_key = self.generate_keys(cfg.token.curve)
+            private_pem, public_pem = self.generate_keys(cfg.token.curve)
             self.logger.debug("saving new keys")
-            self.private_key_file.write_bytes(self.private_key)
-            self.public_key_file.write_bytes(self.public_key)
+            self.private_key_file.write_bytes(private_pem)
+            self.public_key_file.write_bytes(public_pem)
         else:
             if self.public_key_file.exists() and self.private_key_file.exists():
                 self.logger.debug("both keys are present")
             else:
                 self.logger.error("one of the keys if missing")
                 raise FileExistsError("one of the keys if missing")
-            self.private_key, self.public_key = self.read_keys(cfg.token.curve)
+        self.private_key, self.public_key = self.read_keys(cfg.token.curve)
+        self.jwt_algorithm: str = curve2algorithm[cfg.token.curve]
+        self.jwt: JsonWebToken = create_jwt(cfg.token.curve)
+
+        self.logger.info("acquired JWT keys, signing with %s", self.jwt_algorithm)
+
+        self.issues_access_tokens: bool = bool(cfg.token.stateless)
+        self.access_token_lifetime: datetime.timedelta = datetime.timedelta(
+            seconds=float(cfg.token.access_lifetime)
+        )
+        if self.issues_access_tokens:
+            self.logger.info(
+                "issuing access tokens valid for %s", self.access_token_lifetime
+            )
+
+        self.logger.debug("setting up token cache")
+        self.token_cache_ttl: float = float(cfg.token.cache_ttl)
+        self.token_cache: LRUCache[
+            str, Tuple[str, Dict[str, Any], Dict[str, Any]]
+        ] = LRUCache(int(cfg.token.cache_size), self.token_cache_ttl)
+        # revoked tokens are remembered for as long as they could be cached,
+        # so that lookups started before revocation can't cache them again,
+        # and for as long as access tokens issued for them are valid
+        revoked_ttl: float = self.token_cache_ttl
+        if self.issues_access_tokens:
+            revoked_ttl = max(revoked_ttl, self.access_token_lifetime.total_seconds())
+        self.revoked_tokens: LRUCache[str, bool] = LRUCache(
+            int(cfg.token.cache_size), revoked_ttl
+        )
+        # generation of last eviction of user's tokens, lookups of user's tokens,
+        # which started before it, don't cache their results
+        self.revocation_generation: int = 0
+        self.revoked_users: LRUCache[str, int] = LRUCache(
+            int(cfg.token.cache_size), revoked_ttl
+        )
+        # cache is only trusted while revocations from other workers are received
+        self.listening_for_revocations: bool = False
+        self.revocation_listener_task: Optional[asyncio.Task] = None
+        self.logger.info("set up token cache")
 
-        self.logger.info("acquired JWT keys")
+        self.token_lifetime: datetime.timedelta = datetime.timedelta(days=2)
+        self.token_cleanup_interval: float = float(cfg.token.cleanup_interval)
+        self.token_cleanup_task: Optional[asyncio.Task] = None
 
         self.logger.debug("setting up database")
         database_url: str = (
@@ -107,10 +301,21 @@ class AuthImplemented(BaseAuth):
             f"{self.cfg.db.host}:{self.cfg.db.port}/{self.cfg.db.db}"
         )
         self.logger.debug("database url: %s", database_url)
-        self.logger.debug("connecting to database")
-        self.database: Database = Database(database_url)
-        self.logger.debug("connected to database")
-        self.engine: sa.engine.Engine = sa.create_engine(database_url)
+        self.database_url: str = database_url
+        self.logger.debug("setting up connection pool")
+        self.database: InstrumentedDatabase = InstrumentedDatabase(
+            database_url,
+            min_size=int(self.cfg.db.min_size),
+            max_size=int(self.cfg.db.max_size),
+            acquire_timeout=float(self.cfg.db.acquire_timeout),
+            statement_cache_size=int(self.cfg.db.statement_cache_size),
+        )
+        self.logger.info("set up connection pool")
+        # sync engine is only used for startup schema work,
+        # so it doesn't keep connections open
+        self.engine: sa.engine.Engine = sa.create_engine(
+            database_url, poolclass=sa.pool.NullPool
+        )
 
         self.logger.debug("setting up tables")
         self.metadata: sa.MetaData = sa.MetaData(bind=self.engine)
@@ -153,7 +358,12 @@ class AuthImplemented(BaseAuth):
                 sa.String(256),
                 sa.ForeignKey("users.user_id"),
             ),
-            sa.Column("issued_at", sa.Text()),
+            sa.Column("issued_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column(
+                "expires_at", sa.DateTime(timezone=True), nullable=False, index=True
+            ),
+            # serves listing of user's tokens ordered by (issued_at, token_uuid)
+            sa.Index("ix_tokens_issued_by", "issued_by", "issued_at", "token_uuid"),
             extend_existing=True,
         )
         self.invitation_codes = sa.Table(
@@ -186,38 +396,149 @@ class AuthImplemented(BaseAuth):
             ),
             extend_existing=True,
         )
-        self.metadata.create_all(self.engine)
+        self.schema_versions: sa.Table = sa.Table(
+            "schema_versions",
+            self.metadata,
+            sa.Column("component", sa.String(64), primary_key=True),
+            sa.Column("version", sa.Integer, nullable=False),
+            extend_existing=True,
+        )
 
+        self.logger.debug("checking schema version")
+        version: Optional[int] = self.read_schema_version()
+        if version is None or version < self.schema_version:
+            self.migrate_schema()
+        elif version > self.schema_version:
+            self.logger.warning(
+                "schema version %s is newer than supported %s",
+                version,
+                self.schema_version,
+            )
         self.logger.info("set up tables")
 
-        self.logger.debug("creating publiv organisation")
-        self.public_org: Dict[str, str] = self.create_public_org()
-        self.logger.info("created publiv organisation")
-
-    def create_public_org(self) -> Dict[str, str]:
-        self.logger.debug("creating basic organisation")
-        conn = self.engine.connect()
-        select_org_with_same_id = self.organisations.select().where(
-            self.organisations.c.organisation_id == self.public_org_id
+        # sync engine is only used for startup schema work,
+        # requests go through connection pool of `self.database`
+        self.engine.dispose()
+
+    def read_schema_version(self) -> Optional[int]:
+        """
+        reads version of schema with single query
+
+        Returns
+        -------
+        Optional[int]
+            `None` if schema wasn't versioned yet
+        """
+        select = sa.select([self.schema_versions.c.version]).where(
+            self.schema_versions.c.component == "auth"
         )
-        org_with_same_id = conn.execute(select_org_with_same_id).fetchone()
-        if org_with_same_id is not None:
-            self.logger.debug(
-                "public organisation %s already exists", dict(org_with_same_id)
+        with self.engine.connect() as conn:
+            try:
+                return conn.execute(select).scalar()
+            except sa.exc.ProgrammingError:
+                return None
+
+    def migrate_schema(self):
+        """
+        creates missing tables and indexes, migrates old data
+        and stores `schema_version`
+
+        Note
+        ----
+        runs in single transaction under advisory lock,
+        so only one of concurrently starting workers does the work
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                sa.select([sa.func.pg_advisory_xact_lock(self.schema_lock_id)])
             )
-            conn.close()
-            return dict(org_with_same_id)
-        else:
-            self.logger.debug("public organisation doesn't exist")
-            org = {
-                "organisation_id": self.public_org_id,
-                "organisation_name": "Публичная организация",
-            }
-            insert = self.organisations.insert().values(**org)
-            conn.execute(insert)
-            self.logger.debug("created public organisation %s", org)
-            conn.close()
-            return org
+            self.metadata.create_all(conn)
+            version: Optional[int] = conn.execute(
+                sa.select([self.schema_versions.c.version]).where(
+                    self.schema_versions.c.component == "auth"
+                )
+            ).scalar()
+            if version is not None and version >= self.schema_version:
+                self.logger.debug("schema was migrated by another worker")
+                return
+
+            self.logger.info(
+                "migrating schema from version %s to %s", version, self.schema_version
+            )
+            self.migrate_token_timestamps(conn)
+            self.create_missing_indexes(conn)
+            self.create_public_org(conn)
+
+            upsert = pg_insert(self.schema_versions).values(
+                component="auth", version=self.schema_version
+            )
+            conn.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=[self.schema_versions.c.component],
+                    set_={"version": upsert.excluded.version},
+                )
+            )
+            self.logger.info("migrated schema")
+
+    def migrate_token_timestamps(self, conn: sa.engine.Connection):
+        """
+        converts `issued_at` of `tokens` table created by older versions
+        from iso formatted text to timestamp and adds indexed `expires_at`
+
+        Note
+        ----
+        older versions stored naive local time of this server,
+        so current utc offset is used for conversion
+        """
+        columns: Dict[str, Any] = {
+            column["name"]: column["type"]
+            for column in sa.inspect(conn).get_columns("tokens")
+        }
+        if "expires_at" in columns and not isinstance(columns["issued_at"], sa.Text):
+            return
+
+        self.logger.info("migrating timestamps of tokens")
+        utc_offset = datetime.datetime.now().astimezone().utcoffset()
+        offset = int(utc_offset.total_seconds()) if utc_offset is not None else 0
+        if isinstance(columns["issued_at"], sa.Text):
+            conn.execute(
+                "ALTER TABLE tokens ALTER COLUMN issued_at "
+                "TYPE TIMESTAMP WITH TIME ZONE "
+                f"USING (issued_at::timestamp - interval '{offset} seconds') "
+                "AT TIME ZONE 'UTC'"
+            )
+        if "expires_at" not in columns:
+            conn.execute(
+                "ALTER TABLE tokens ADD COLUMN expires_at TIMESTAMP WITH TIME ZONE"
+            )
+            conn.execute(
+                sa.text(
+                    "UPDATE tokens SET expires_at = issued_at + :lifetime"
+                ).bindparams(lifetime=self.token_lifetime)
+            )
+            conn.execute("ALTER TABLE tokens ALTER COLUMN expires_at SET NOT NULL")
+        self.logger.info("migrated timestamps of tokens")
+
+    def create_missing_indexes(self, conn: sa.engine.Connection):
+        """
+        creates indexes, which were added to already existing tables
+        """
+        inspector = sa.inspect(conn)
+        for table in self.metadata.sorted_tables:
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    self.logger.info("creating index %s", index.name)
+                    index.create(conn)
+
+    def create_public_org(self, conn: sa.engine.Connection):
+        self.logger.debug("creating public organisation")
+        insert = pg_insert(self.organisations).values(
+            organisation_id=self.public_org_id,
+            organisation_name="Публичная организация",
+        )
+        conn.execute(insert.on_conflict_do_nothing(index_elements=["organisation_id"]))
+        self.logger.debug("public organisation exists")
 
     async def create_root_user(
         self, username: str, password: str, public_org_id: str
@@ -243,7 +564,7 @@ class AuthImplemented(BaseAuth):
             root_user = {
                 "user_id": username,
                 "email": "root@papertext.ru",
-                "hashed_password": crypto_context.hash(password),
+                "hashed_password": await self.hash_pool.hash(password),
                 "user_name": "root",
                 "level_of_access": 3,
                 "member_of": public_org_id,
@@ -269,43 +590,82 @@ class AuthImplemented(BaseAuth):
         )
         self.logger.info("created root user")
 
+        self.logger.debug("listening for token revocations")
+        self.revocation_listener_task = asyncio.create_task(
+            self.listen_for_revocations()
+        )
+
+        self.logger.debug("scheduling removal of expired tokens")
+        self.token_cleanup_task = asyncio.create_task(
+            self.cleanup_tokens_periodically()
+        )
+
+        self.logger.debug("starting rehashing of outdated password hashes")
+        self.rehash_queue = asyncio.Queue(self.rehash_queue_size)
+        self.rehash_task = asyncio.create_task(self.rehash_passwords())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "token_cache": self.token_cache.stats(),
+            "geo_cache": self.geo_locator.cache.stats(),
+            "device_cache": self.device_parser.cache.stats(),
+            "db_pool": self.database.stats(),
+            "signin": {
+                "identifier_limiter": self.identifier_limiter.stats(),
+                "ip_limiter": self.ip_limiter.stats(),
+                "concurrent_verifies": self.concurrent_verifies,
+                "rejected_verifies": self.rejected_verifies,
+            },
+            "rehash": {
+                "queued": len(self.rehash_pending),
+                "rehashed": self.rehashed,
+                "dropped": self.rehash_dropped,
+            },
+        }
+
+    async def __async__del__(self):
+        for task in (
+            self.revocation_listener_task,
+            self.token_cleanup_task,
+            self.rehash_task,
+        ):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.logger.debug("stopped background tasks")
+
+        self.logger.debug("stopping hashing process pool")
+        self.hash_pool.shutdown()
+        self.geo_locator.close()
+
+        self.logger.debug("disconnecting from Auth DB")
+        await self.database.disconnect()
+        self.logger.info("disconnected from Auth DB")
+
     def generate_keys(self, curve: str) -> Tuple[bytes, bytes]:
-        def default():
-            self.logger.error("can't find specified curve")
-            raise KeyError("can't find specified curve")
-
-        def secp521r1():
-            self.logger.debug("creating secp521r1 keys")
-            sk: ecdsa.SigningKey = ecdsa.SigningKey.generate(curve=ecdsa.NIST521p)
-            vk: ecdsa.VerifyingKey = sk.verifying_key
-            sk_bytes: bytes = bytes(sk.to_pem())
-            vk_bytes: bytes = bytes(vk.to_pem())
-            return sk_bytes, vk_bytes
-
-        case: Dict[str, Callable[..., Tuple[bytes, bytes]]] = defaultdict(default)
-        case["secp521r1"] = secp521r1
-        return case[curve]()
-
-    def read_keys(self, curve: str) -> Tuple[bytes, bytes]:
-        def default():
+        self.logger.debug("creating %s keys", curve)
+        try:
+            return generate_keys(curve)
+        except KeyError as exception:
             self.logger.error("can't find specified curve")
-            raise KeyError("can't find specified curve")
+            raise exception
 
-        def secp521r1():
-            self.logger.debug("creating secp521r1 keys")
-            sk: ecdsa.SigningKey = ecdsa.SigningKey.from_pem(  # noqa
-                self.private_key_file.read_text()
-            )
-            vk: ecdsa.VerifyingKey = sk.verifying_key
-            sk_bytes: bytes = bytes(sk.to_pem())
-            vk_bytes: bytes = bytes(vk.to_pem())
-            return sk_bytes, vk_bytes
-
-        case: Dict[str, Callable[..., Tuple[bytes, bytes]]] = defaultdict(default)
-        case["secp521r1"] = secp521r1
-        return case[curve]()
+    def read_keys(self, curve: str) -> Tuple[Key, Key]:
+        self.logger.debug("reading %s keys", curve)
+        try:
+            return load_keys(curve, self.private_key_file.read_bytes())
+        except KeyError as exception:
+            self.logger.error("can't find specified curve")
+            raise exception
 
-    def validate_token(self, token: str) -> Dict[str, Any]:
+    def decode_token(self, token: str) -> Dict[str, Any]:
+        """
+        verifies signature and claims of token without querying the database
+        """
         claim_option: Dict[str, Dict[str, Any]] = {
             "iss": {
                 "essential": True,
@@ -322,7 +682,9 @@ class AuthImplemented(BaseAuth):
             },
         }
         try:
-            claims = jwt.decode(token, self.public_key, claims_options=claim_option)
+            claims = self.jwt.decode(
+                token, self.public_key, claims_options=claim_option
+            )
             claims.validate()
         except Exception as exception:
             self.logger.debug(token)
@@ -335,14 +697,162 @@ class AuthImplemented(BaseAuth):
                     "rus": "невозможно верефецировать токен",
                 },
             )
-        token_uuid = uuid.UUID(claims["jti"]).bytes
+        return claims
 
-        conn = self.engine.connect()
-        select = self.tokens.select().where(self.tokens.c.token_uuid == token_uuid)
-        tokens = conn.execute(select).fetchall()
-        if len(tokens) == 0:
-            self.logger.debug(token)
-            self.logger.error("can't verify token")
+    @staticmethod
+    def peek_jti(token: str) -> Optional[str]:
+        """
+        reads `jti` claim of token without verifying it's signature
+
+        Note
+        ----
+        result should only be used as a key for lookup of already verified tokens
+        """
+        try:
+            payload = token.split(".")[1]
+            claims = json.loads(urlsafe_b64decode(payload.encode("ascii")))
+            return str(claims["jti"])
+        except Exception:
+            return None
+
+    def evict_user_tokens(self, user_id: str):
+        self.revocation_generation += 1
+        self.revoked_users.set(user_id, self.revocation_generation)
+        evicted = self.token_cache.evict(
+            lambda _, entry: entry[2]["user_id"] == user_id
+        )
+        self.logger.debug("evicted %s cached tokens of user %s", evicted, user_id)
+
+    def revoke_cached_token(self, jti: str):
+        self.revoked_tokens.set(jti, True)
+        self.token_cache.pop(jti)
+        self.logger.debug("evicted cached token %s", jti)
+
+    def on_revocation(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ):
+        """
+        callback for notifications in `revocation_channel`
+
+        Parameters
+        ----------
+        connection: asyncpg.Connection
+        pid: int
+            id of database backend process, which sent notification
+        channel: str
+        payload: str
+            json with `type` of revoked entity (`token` or `user`) and it's `id`
+        """
+        try:
+            revocation: Dict[str, str] = json.loads(payload)
+            if revocation["type"] == "token":
+                self.revoke_cached_token(revocation["id"])
+            elif revocation["type"] == "user":
+                self.evict_user_tokens(revocation["id"])
+            else:
+                raise ValueError(f"unknown revocation type {revocation['type']}")
+        except Exception as exception:
+            self.logger.error("can't process revocation %s: %s", payload, exception)
+            self.token_cache.clear()
+
+    async def publish_revocation(self, revocation_type: str, identifier: str):
+        """
+        evicts token or all tokens of user from caches of all workers
+
+        Parameters
+        ----------
+        revocation_type: str
+            `token` or `user`
+        identifier: str
+            jti of token or user_id of user
+        """
+        if revocation_type == "token":
+            self.revoke_cached_token(identifier)
+        else:
+            self.evict_user_tokens(identifier)
+        try:
+            await self.database.execute(
+                "SELECT pg_notify(:channel, :payload)",
+                {
+                    "channel": self.revocation_channel,
+                    "payload": json.dumps({"type": revocation_type, "id": identifier}),
+                },
+            )
+        except Exception as exception:
+            self.logger.error("can't publish revocation: %s", exception)
+
+    async def listen_for_revocations(self):
+        """
+        keeps dedicated connection, which listens to `revocation_channel`
+
+        Note
+        ----
+        cached tokens are dropped and bypassed while connection is lost,
+        because revocations from other workers could be missed
+        """
+        while True:
+            connection_lost = asyncio.Event()
+            try:
+                connection: asyncpg.Connection = await asyncpg.connect(
+                    self.database_url
+                )
+            except Exception as exception:
+                self.logger.error("can't listen for revocations: %s", exception)
+                await asyncio.sleep(self.revocation_retry_delay)
+                continue
+
+            try:
+                connection.add_termination_listener(lambda _: connection_lost.set())
+                await connection.add_listener(
+                    self.revocation_channel, self.on_revocation
+                )
+                self.token_cache.clear()
+                self.listening_for_revocations = True
+                self.logger.info("listening for token revocations")
+                await connection_lost.wait()
+                self.logger.warning("lost connection for token revocations")
+            except Exception as exception:
+                self.logger.error("can't listen for revocations: %s", exception)
+            finally:
+                self.listening_for_revocations = False
+                self.token_cache.clear()
+                if not connection.is_closed():
+                    try:
+                        await connection.close()
+                    except Exception:
+                        connection.terminate()
+            await asyncio.sleep(self.revocation_retry_delay)
+
+    async def read_token_owner(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        resolves token to it's owner in one round trip,
+        deleted tokens and deleted users both produce an empty join
+        """
+        select = (
+            sa.sql.select(
+                [
+                    self.users.c.user_id,
+                    self.users.c.user_name,
+                    self.users.c.email,
+                    self.users.c.level_of_access,
+                    self.users.c.member_of,
+                ]
+            )
+            .select_from(
+                self.tokens.join(
+                    self.users, self.tokens.c.issued_by == self.users.c.user_id
+                )
+            )
+            .where(
+                sa.and_(
+                    self.tokens.c.token_uuid == uuid.UUID(claims["jti"]).bytes,
+                    self.tokens.c.issued_by == claims["sub"],
+                )
+            )
+        )
+        user = await self.database.fetch_one(select)
+        if user is None:
+            self.logger.error("can't verify token %s", claims["jti"])
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -350,51 +860,184 @@ class AuthImplemented(BaseAuth):
                     "rus": "токен был удалён",
                 },
             )
-        return claims
+        return dict(user)
 
-    def token2user(self, token: str) -> Dict[str, Union[str, int]]:
-        claims = self.validate_token(token)
+    def access_claims2user(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        reads user from claims of access token without querying the database
+
+        Note
+        ----
+        access token is rejected if it's refresh token was revoked
+        while this worker was running, otherwise revocation
+        only takes effect after access token expires
+        """
+        if not self.issues_access_tokens or str(claims["sid"]) in self.revoked_tokens:
+            self.logger.error("access token %s is rejected", claims["jti"])
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "end": "can't verify token",
+                    "rus": "токен был удалён",
+                },
+            )
+        return {
+            "user_id": claims["sub"],
+            "user_name": claims.get("user_name"),
+            "email": claims.get("email"),
+            "level_of_access": claims["loa"],
+            "member_of": claims["member_of"],
+        }
 
-        user_id: str = claims["sub"]
+    async def token2user(self, token: str) -> Dict[str, Union[str, int]]:
+        jti = self.peek_jti(token)
+        cached = (
+            self.token_cache.get(jti)
+            if jti is not None and self.listening_for_revocations
+            else None
+        )
+        if cached is not None and hmac.compare_digest(cached[0], token):
+            self.logger.debug("using cached token %s for user %s", jti, cached[2])
+            return dict(cached[2])
 
-        conn = self.engine.connect()
-        user = conn.execute(
-            self.users.select().where(self.users.c.user_id == user_id)
-        ).fetchone()
-        conn.close()
+        claims = self.decode_token(token)
+        if claims.get("scope") == "refresh":
+            self.logger.error("refresh token %s is used for access", claims["jti"])
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "end": "refresh token can't be used for access",
+                    "rus": "токен обновления не может быть использован для доступа",
+                },
+            )
+        if "sid" in claims:
+            return self.access_claims2user(claims)
 
-        user_dict: Dict[str, Any] = {
-            "user_id": user["user_id"],
-            "user_name": user["user_name"],
-            "email": user["email"],
-            "level_of_access": user["level_of_access"],
-            "member_of": user["member_of"],
-        }
+        generation: int = self.revocation_generation
+        user_dict: Dict[str, Any] = await self.read_token_owner(claims)
 
         self.logger.debug("decoded token %s for user %s", claims, user_dict)
-        return user_dict
+        if str(claims["jti"]) in self.revoked_tokens:
+            self.logger.error("token %s was revoked during lookup", claims["jti"])
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "end": "can't verify token",
+                    "rus": "токен был удалён",
+                },
+            )
+        revoked_at: Optional[int] = self.revoked_users.get(str(claims["sub"]))
+        if revoked_at is not None and revoked_at > generation:
+            self.logger.debug(
+                "tokens of user %s were evicted during lookup", claims["sub"]
+            )
+            return dict(user_dict)
+        self.token_cache.set(
+            str(claims["jti"]),
+            (token, dict(claims), user_dict),
+            ttl=min(self.token_cache_ttl, claims["exp"] - time.time()),
+        )
+        return dict(user_dict)
 
-    def cleanup_tokens(self):
+    async def cleanup_tokens(self):
         self.logger.debug("removing expired tokens")
-        conn = self.engine.connect()
-        result = conn.execute(
-            sa.sql.select([self.tokens.c.token_uuid, self.tokens.c.issued_at])
+        await self.database.execute(
+            self.tokens.delete().where(self.tokens.c.expires_at < sa.func.now())
         )
-        for row in result:
-            issued_at = datetime.datetime.fromisoformat(row["issued_at"])
-            delta = datetime.datetime.now() - issued_at
-            self.logger.debug(
-                f"selected token with {row['token_uuid']=}" f"{issued_at=} {delta=}"
-            )
-            # delete tokens older than 2 days and 2 hours
-            if delta.total_seconds() >= (24 * 2 + 2) * 60 * 60:
-                self.logger.debug(f"removing token with uuid {row['token_uuid']}")
-                conn.execute(
-                    self.tokens.delete().where(
-                        self.tokens.c.token_uuid == row["token_uuid"]
-                    )
+        self.logger.debug("removed expired tokens")
+
+    async def cleanup_tokens_periodically(self):
+        while True:
+            try:
+                await self.cleanup_tokens()
+            except Exception as exception:
+                self.logger.error("can't remove expired tokens: %s", exception)
+            await asyncio.sleep(self.token_cleanup_interval)
+
+    def admit_signin(self, identifier: str, real_ip: Optional[str]):
+        """
+        takes tokens from rate limiters of identifier and client IP
+
+        Raises
+        ------
+        TooManyRequestsError
+            if any of limiters is exhausted
+        """
+        retry_after: float = self.identifier_limiter.acquire(identifier.strip().lower())
+        if real_ip is not None:
+            retry_after = max(retry_after, self.ip_limiter.acquire(real_ip))
+        if retry_after > 0:
+            self.logger.warning(
+                "rate limited signin of %s from %s", identifier, real_ip
+            )
+            raise TooManyRequestsError(retry_after)
+
+    async def verify_signin_password(
+        self, password: str, hashed_password: Optional[str]
+    ) -> bool:
+        """
+        verifies password, unless too many verifications are already running
+
+        Raises
+        ------
+        TooManyRequestsError
+            if `max_concurrent_verifies` verifications are running
+        """
+        if self.concurrent_verifies >= self.max_concurrent_verifies:
+            self.rejected_verifies += 1
+            self.logger.warning("too many concurrent password verifications")
+            raise TooManyRequestsError(1)
+        self.concurrent_verifies += 1
+        try:
+            return await self.hash_pool.verify(password, hashed_password)
+        finally:
+            self.concurrent_verifies -= 1
+
+    def queue_rehash(self, user_id: str, password: str, hashed_password: str):
+        """
+        queues rehashing of verified password with current parameters
+
+        Note
+        ----
+        rehash is dropped if queue is full or user is already queued,
+        it will be queued again on next signin
+        """
+        if self.rehash_queue is None or user_id in self.rehash_pending:
+            return
+        try:
+            self.rehash_queue.put_nowait((user_id, password, hashed_password))
+        except asyncio.QueueFull:
+            self.rehash_dropped += 1
+            self.logger.debug("rehash queue is full, skipping user %s", user_id)
+            return
+        self.rehash_pending.add(user_id)
+
+    async def rehash_passwords(self):
+        """
+        rehashes queued passwords one at a time,
+        so that at most one hashing process is busy with rehashing
+        """
+        while True:
+            user_id, password, old_hash = await self.rehash_queue.get()
+            try:
+                new_hash: str = await self.hash_pool.hash(password)
+                # password could be changed since it was verified,
+                # so update only succeeds if hash is still the same
+                await self.database.execute(
+                    self.users.update()
+                    .where(self.users.c.user_id == user_id)
+                    .where(self.users.c.hashed_password == old_hash)
+                    .values(hashed_password=new_hash)
                 )
-        conn.close()
+                self.rehashed += 1
+                self.logger.debug("rehashed password of user %s", user_id)
+            except Exception as exception:
+                self.rehash_dropped += 1
+                self.logger.error(
+                    "can't rehash password of user %s: %s", user_id, exception
+                )
+            finally:
+                self.rehash_pending.discard(user_id)
 
     async def signin(
         self,
@@ -402,33 +1045,16 @@ class AuthImplemented(BaseAuth):
         password: str,
         identifier: Union[str, EmailStr],
     ) -> str:
+        self.admit_signin(identifier, request.headers.get("x-real-ip"))
+
         location: str = "Unknown"
         if "x-real-ip" in request.headers:
             real_ip: str = request.headers["x-real-ip"]
             self.logger.debug("requesters IP address is %s", real_ip)
-            try:
-                ipstack_res: Dict = self.ip2geo.get_location(real_ip)
-                location = (
-                    f"{ipstack_res['location']['country_flag_emoji']} "
-                    f"{ipstack_res['city']} / "
-                    f"{ipstack_res['region_name']} / "
-                    f"{ipstack_res['country_name']}"
-                )
-            except Exception as exception:
-                self.logger.error(
-                    "an error acquired when requesting ipstack: %s", exception
-                )
-                location = "Unknown"
+            location = await self.geo_locator.locate(real_ip)
         self.logger.debug("requesters geolocation is %s", location)
 
-        device: str = "Unknown"
-        if "user-agent" in request.headers:
-            ua_str: str = request.headers["user-agent"]
-            try:
-                ua = parse(ua_str)
-                device = str(ua)
-            except Exception:
-                device = "Unknown"
+        device: str = self.device_parser(request.headers.get("user-agent"))
         self.logger.debug("requesters device is %s", device)
 
         email: Optional[EmailStr] = None
@@ -476,7 +1102,7 @@ class AuthImplemented(BaseAuth):
 
         hashed_password = user["hashed_password"]
 
-        if not crypto_context.verify(password, hashed_password):
+        if not await self.verify_signin_password(password, hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={
@@ -484,8 +1110,11 @@ class AuthImplemented(BaseAuth):
                     "rus": "Неправильный пароль",
                 },
             )
+        if needs_update(hashed_password):
+            self.queue_rehash(user_id, password, hashed_password)
 
-        now: datetime.datetime = datetime.datetime.now()
+        now: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+        expires_at: datetime.datetime = now + self.token_lifetime
         token_uuid: bytes = uuid.uuid4().bytes
 
         insert = self.tokens.insert().values(
@@ -493,7 +1122,8 @@ class AuthImplemented(BaseAuth):
             location=location,
             device=device,
             issued_by=user_id,
-            issued_at=str(now),
+            issued_at=now,
+            expires_at=expires_at,
         )
 
         try:
@@ -509,16 +1139,53 @@ class AuthImplemented(BaseAuth):
                 },
             )
 
-        header: Dict[str, str] = {"alg": "ES384", "typ": "JWT"}
+        header: Dict[str, str] = {"alg": self.jwt_algorithm, "typ": "JWT"}
         payload: Dict[str, Any] = {
             "iss": "paperback",
             "sub": str(user_id),
-            "exp": int(round((now + datetime.timedelta(days=2)).timestamp(), 0)),
+            "exp": int(round(expires_at.timestamp(), 0)),
             "iat": int(round(now.timestamp(), 0)),
             "jti": str(uuid.UUID(bytes=token_uuid)),
         }
+        if self.issues_access_tokens:
+            # refresh token can only be exchanged for access tokens
+            payload["scope"] = "refresh"
         self.logger.debug("created token %s for user %s", payload, user_id)
-        return jwt.encode(header, payload, self.private_key)
+        return self.jwt.encode(header, payload, self.private_key)
+
+    async def refresh(self, refresh_token: str) -> str:
+        claims = self.decode_token(refresh_token)
+        if claims.get("scope") != "refresh":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={
+                    "end": "only refresh token can be used for refresh",
+                    "rus": "для обновления можно использовать только токен обновления",
+                },
+            )
+        user: Dict[str, Any] = await self.read_token_owner(claims)
+
+        now: datetime.datetime = datetime.datetime.now(datetime.timezone.utc)
+        expires_at: datetime.datetime = min(
+            now + self.access_token_lifetime,
+            datetime.datetime.fromtimestamp(claims["exp"], datetime.timezone.utc),
+        )
+        header: Dict[str, str] = {"alg": self.jwt_algorithm, "typ": "JWT"}
+        payload: Dict[str, Any] = {
+            "iss": "paperback",
+            "sub": str(user["user_id"]),
+            "exp": int(round(expires_at.timestamp(), 0)),
+            "iat": int(round(now.timestamp(), 0)),
+            "jti": str(uuid.uuid4()),
+            "sid": str(claims["jti"]),
+            "scope": "access",
+            "loa": user["level_of_access"],
+            "member_of": user["member_of"],
+            "email": user["email"],
+            "user_name": user["user_name"],
+        }
+        self.logger.debug("created access token %s", payload)
+        return self.jwt.encode(header, payload, self.private_key)
 
     async def signup(
         self,
@@ -536,9 +1203,29 @@ class AuthImplemented(BaseAuth):
     async def signout_everywhere(self, user_id: str):
         pass
 
-    async def read_tokens(self, user_id: str):
-        self.logger.debug("querying all tokens of user with id %s", user_id)
-        select = self.tokens.select().where(self.tokens.c.issued_by == user_id)
+    async def read_tokens(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        active_only: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        self.logger.debug("querying tokens of user with id %s", user_id)
+        sort_key = sa.tuple_(self.tokens.c.issued_at, self.tokens.c.token_uuid)
+        select = (
+            self.tokens.select()
+            .where(self.tokens.c.issued_by == user_id)
+            .order_by(self.tokens.c.issued_at.desc(), self.tokens.c.token_uuid.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            after = decode_cursor(
+                cursor,
+                [datetime.datetime.fromisoformat, lambda value: uuid.UUID(value).bytes],
+            )
+            select = select.where(sort_key < sa.tuple_(*after))
+        if active_only:
+            select = select.where(self.tokens.c.expires_at > sa.func.now())
 
         try:
             raw_tokens = await self.database.fetch_all(select)
@@ -552,8 +1239,15 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
-        tokens = [dict(raw_token) for raw_token in raw_tokens]
-        return tokens
+        tokens = [dict(raw_token) for raw_token in raw_tokens[:limit]]
+
+        next_cursor: Optional[str] = None
+        if len(raw_tokens) > limit:
+            last = tokens[-1]
+            next_cursor = encode_cursor(
+                [last["issued_at"].isoformat(), uuid.UUID(bytes=last["token_uuid"]).hex]
+            )
+        return tokens, next_cursor
 
     async def delete_token(self, token_identifier: str):
         match = re.match(
@@ -562,12 +1256,14 @@ class AuthImplemented(BaseAuth):
             token_identifier,
         )
         if match is None:
-            claims = self.validate_token(token_identifier)
-            token_uuid = claims["jti"]
+            claims = self.decode_token(token_identifier)
+            # access token is removed together with it's refresh token
+            token_uuid = claims.get("sid", claims["jti"])
             self.logger.debug("removing token by uuid %s", token_uuid)
         else:
             token_uuid = token_identifier
             self.logger.debug("removing token by uuid %s", token_uuid)
+        jti: str = str(uuid.UUID(token_uuid))
         token_uuid = uuid.UUID(token_uuid).bytes
 
         tokens = await self.database.fetch_all(
@@ -597,6 +1293,55 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
+        await self.publish_revocation("token", jti)
+
+    async def fetch_written(
+        self,
+        statement: sa.sql.ClauseElement,
+        missing_reference: Optional[Dict[str, str]] = None,
+        duplicate: Optional[Dict[str, str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        executes single writing statement with `RETURNING` clause
+
+        Parameters
+        ----------
+        statement: sa.sql.ClauseElement
+            insert or update with `RETURNING` clause
+        missing_reference: Dict[str, str], optional
+            detail of error if statement violates foreign key
+        duplicate: Dict[str, str], optional
+            detail of error if statement violates unique constraint,
+            which isn't handled by `ON CONFLICT`
+
+        Returns
+        -------
+        Dict[str, Any], optional
+            written row or `None` if no row was written,
+            i.e. on conflict or if no row matched update
+        """
+        try:
+            row = await self.database.fetch_one(statement)
+        except Exception as exception:
+            self.logger.error(exception)
+            detail: Dict[str, str] = {
+                "eng": "An error occurred when working with Auth DB",
+                "rus": "Произошла ошибка при обращении к базе данных "
+                "модуля авторизации",
+            }
+            if missing_reference is not None and isinstance(
+                exception, asyncpg.ForeignKeyViolationError
+            ):
+                detail = missing_reference
+            if duplicate is not None and isinstance(
+                exception, asyncpg.UniqueViolationError
+            ):
+                detail = duplicate
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+        return None if row is None else dict(row)
+
+    def user_info_columns(self) -> List[sa.Column]:
+        return [column for column in self.users.c if column.name != "hashed_password"]
 
     async def create_user(
         self,
@@ -619,10 +1364,33 @@ class AuthImplemented(BaseAuth):
             },
         )
 
-        users = await self.database.fetch_all(
-            self.users.select().where(self.users.c.user_id == user_id)
-        )
-        if len(users) > 0:
+        # hashing is expensive, so it's skipped for users, which already exist,
+        # user with the same id is reported first, even if other one has the email
+        try:
+            existing_user = await self.database.fetch_one(
+                sa.sql.select([self.users.c.user_id, self.users.c.email])
+                .where(
+                    sa.or_(
+                        self.users.c.user_id == user_id,
+                        self.users.c.email == email
+                        if email is not None
+                        else sa.false(),
+                    )
+                )
+                .order_by((self.users.c.user_id == user_id).desc())
+                .limit(1)
+            )
+        except Exception as exception:
+            self.logger.error(exception)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "eng": "An error occurred when working with Auth DB",
+                    "rus": "Произошла ошибка при обращении к базе данных "
+                    "модуля авторизации",
+                },
+            )
+        if existing_user is not None and existing_user["user_id"] == user_id:
             self.logger.error("users with id %s already exists", user_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -631,49 +1399,47 @@ class AuthImplemented(BaseAuth):
                     "rus": f"пользователь с id {user_id} уже существует",
                 },
             )
-
-        if not member_of:
-            member_of = self.public_org_id
-        else:
-            org = await self.database.fetch_all(
-                self.organisations.select().where(
-                    self.organisations.c.organisation_id == member_of
-                )
+        email_taken: Dict[str, str] = {
+            "eng": f"email {email} is already used",
+            "rus": f"email {email} уже используется",
+        }
+        if existing_user is not None and existing_user["email"] == email:
+            self.logger.error("email %s is already used", email)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=email_taken
             )
 
-            if len(org) == 0:
-                self.logger.error("can't find organisation with id %s", member_of)
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail={
-                        "end": f"can't find organisation with id {member_of}",
-                        "rus": f"организации с id {member_of} не существует",
-                    },
-                )
-            else:
-                member_of = org[0]["organisation_id"]
-
         new_user = {
             "user_id": user_id,
             "email": email,
-            "hashed_password": crypto_context.hash(password),
+            "hashed_password": await self.hash_pool.hash(password),
             "user_name": user_name,
             "level_of_access": level_of_access,
-            "member_of": member_of,
+            "member_of": member_of or self.public_org_id,
         }
-        insert = self.users.insert().values(**new_user)
+        insert = (
+            pg_insert(self.users)
+            .values(**new_user)
+            .on_conflict_do_nothing(index_elements=[self.users.c.user_id])
+            .returning(self.users.c.user_id)
+        )
 
         self.logger.debug("creating users with this info: %s", new_user)
-        try:
-            await self.database.execute(insert)
-        except Exception as exception:
-            self.logger.error(exception)
+        created = await self.fetch_written(
+            insert,
+            missing_reference={
+                "end": f"can't find organisation with id {member_of}",
+                "rus": f"организации с id {member_of} не существует",
+            },
+            duplicate=email_taken,
+        )
+        if created is None:
+            self.logger.error("users with id %s already exists", user_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
+                    "eng": f"users with id {user_id} already exists",
+                    "rus": f"пользователь с id {user_id} уже существует",
                 },
             )
         return new_user
@@ -696,12 +1462,39 @@ class AuthImplemented(BaseAuth):
             )
         return dict(user)
 
-    async def read_users(self) -> List[Dict[str, Union[str, int]]]:
-        self.logger.debug("querying all user")
-        select = self.users.select()
+    async def read_page(
+        self,
+        select: sa.sql.Select,
+        key: sa.Column,
+        cursor: Optional[str],
+        limit: int,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        reads page of rows ordered by unique text column `key`
+
+        Parameters
+        ----------
+        select: sa.sql.Select
+            query without ordering and limit
+        key: sa.Column
+            unique column used as keyset
+        cursor: str, optional
+            cursor of page returned by previous call, first page if `None`
+        limit: int
+            maximum number of rows in page
+
+        Returns
+        -------
+        Tuple[List[Dict[str, Any]], Optional[str]]
+            rows and cursor of next page, `None` if it's the last page
+        """
+        if cursor is not None:
+            (after,) = decode_cursor(cursor, [str])
+            select = select.where(key > after)
+        select = select.order_by(key).limit(limit + 1)
 
         try:
-            raw_users = await self.database.fetch_all(select)
+            raw_rows = await self.database.fetch_all(select)
         except Exception as exception:
             self.logger.error(exception)
             raise HTTPException(
@@ -712,8 +1505,156 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
-        users: List[Dict] = [dict(user) for user in raw_users]
-        return users
+        rows: List[Dict[str, Any]] = [dict(row) for row in raw_rows[:limit]]
+
+        next_cursor: Optional[str] = None
+        if len(raw_rows) > limit:
+            next_cursor = encode_cursor([rows[-1][key.name]])
+        return rows, next_cursor
+
+    async def read_users(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Dict[str, Union[str, int]]], Optional[str]]:
+        self.logger.debug("querying page of users")
+        return await self.read_page(
+            self.users.select(), self.users.c.user_id, cursor, limit
+        )
+
+    async def iterate_users(self) -> AsyncIterator[Dict[str, Union[str, int]]]:
+        self.logger.debug("streaming all users")
+        async for user in self.database.iterate(
+            self.users.select().order_by(self.users.c.user_id)
+        ):
+            yield dict(user)
+
+    async def copy_insert(
+        self,
+        table: sa.Table,
+        columns: List[str],
+        records: List[Tuple[Any, ...]],
+        where: str = "TRUE",
+    ) -> Set[Any]:
+        """
+        loads records into temporary copy of `table` with `COPY`
+        and moves them into `table` with single insert, skipping conflicting rows
+
+        Parameters
+        ----------
+        table: sa.Table
+        columns: List[str]
+            names of columns in order of values in records
+        records: List[Tuple[Any, ...]]
+        where: str
+            SQL condition, which records should satisfy to be inserted
+
+        Returns
+        -------
+        Set[Any]
+            primary keys of inserted rows
+        """
+        key: str = list(table.primary_key.columns)[0].name
+        staging: str = f"import_{table.name}"
+        column_list: str = ", ".join(columns)
+        async with self.database.connection() as connection:
+            async with connection.transaction():
+                raw_connection: asyncpg.Connection = connection.raw_connection
+                await raw_connection.execute(
+                    f"CREATE TEMPORARY TABLE {staging} (LIKE {table.name}) "
+                    "ON COMMIT DROP"
+                )
+                await raw_connection.copy_records_to_table(
+                    staging, records=records, columns=columns
+                )
+                rows = await raw_connection.fetch(
+                    f"INSERT INTO {table.name} ({column_list}) "
+                    f"SELECT {column_list} FROM {staging} WHERE {where} "
+                    f"ON CONFLICT DO NOTHING RETURNING {key}"
+                )
+        return {row[key] for row in rows}
+
+    async def import_users(
+        self, users: List[Tuple[int, ImportedUser]]
+    ) -> List[ImportRowError]:
+        self.logger.debug("importing %s users", len(users))
+        hashed_passwords: List[str] = await self.hash_pool.hash_many(
+            [user.password for _, user in users]
+        )
+        columns: List[str] = [
+            "user_id",
+            "email",
+            "hashed_password",
+            "user_name",
+            "level_of_access",
+            "member_of",
+        ]
+        records: List[Tuple[Any, ...]] = [
+            (
+                user.user_id,
+                user.email,
+                hashed_password,
+                user.user_name,
+                user.level_of_access,
+                user.member_of or self.public_org_id,
+            )
+            for (_, user), hashed_password in zip(users, hashed_passwords)
+        ]
+
+        try:
+            created: Set[str] = await self.copy_insert(
+                self.users,
+                columns,
+                records,
+                where="member_of IN (SELECT organisation_id FROM organisations)",
+            )
+            existing_orgs: Set[str] = {
+                row["organisation_id"]
+                for row in await self.database.fetch_all(
+                    sa.sql.select([self.organisations.c.organisation_id]).where(
+                        self.organisations.c.organisation_id.in_(
+                            {record[-1] for record in records}
+                        )
+                    )
+                )
+            }
+        except Exception as exception:
+            self.logger.error(exception)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "eng": "An error occurred when working with Auth DB",
+                    "rus": "Произошла ошибка при обращении к базе данных "
+                    "модуля авторизации",
+                },
+            )
+        self.logger.info("imported %s of %s users", len(created), len(users))
+
+        errors: List[ImportRowError] = []
+        for (row, user), record in zip(users, records):
+            if user.user_id in created:
+                created.discard(user.user_id)
+            elif record[-1] not in existing_orgs:
+                errors.append(
+                    ImportRowError(
+                        row=row,
+                        detail={
+                            "end": f"can't find organisation with id {record[-1]}",
+                            "rus": f"организации с id {record[-1]} не существует",
+                        },
+                    )
+                )
+            else:
+                errors.append(
+                    ImportRowError(
+                        row=row,
+                        detail={
+                            "eng": f"users with id {user.user_id} "
+                            "or this email already exists",
+                            "rus": f"пользователь с id {user.user_id} "
+                            "или этим email уже существует",
+                        },
+                    )
+                )
+        return errors
 
     async def update_user(
         self,
@@ -733,19 +1674,34 @@ class AuthImplemented(BaseAuth):
             )
 
         values: Dict[str, Any] = {
-            "user_id": new_user_id,
             "user_name": new_user_name,
             "level_of_access": new_level_of_access,
-            "organisation_id": new_organisation_id,
+            "member_of": new_organisation_id,
         }
         new_values: Dict[str, Any] = {
             key: val for key, val in values.items() if val is not None
         }
 
-        users = await self.database.fetch_all(
-            self.users.select().where(self.users.c.user_id == user_id)
+        self.logger.debug("updating user with id %s", user_id)
+        if new_values:
+            statement = (
+                self.users.update()
+                .where(self.users.c.user_id == user_id)
+                .values(**new_values)
+                .returning(*self.user_info_columns())
+            )
+        else:
+            statement = sa.sql.select(self.user_info_columns()).where(
+                self.users.c.user_id == user_id
+            )
+        user = await self.fetch_written(
+            statement,
+            missing_reference={
+                "end": f"can't find organisation with id {new_organisation_id}",
+                "rus": f"организации с id {new_organisation_id} не существует",
+            },
         )
-        if len(users) == 0:
+        if user is None:
             self.logger.error("users with id %s doesn't exists", user_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -754,45 +1710,8 @@ class AuthImplemented(BaseAuth):
                     "rus": f"пользователь с id {user_id} не существует",
                 },
             )
-
-        self.logger.debug("updating user with id %s", user_id)
-        update = (
-            self.users.update()
-            .where(self.users.c.user_id == user_id)
-            .values(**new_values)
-        )
-
-        try:
-            await self.database.execute(update)
-        except Exception as exception:
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
-
-        try:
-            user = await self.database.fetch_one(
-                self.users.select().where(self.users.c.user_id == user_id)
-            )
-            if user is None:
-                raise ValueError
-        except Exception as exception:
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
-        user = dict(user)
-        del user["hashed_password"]
+        if new_values:
+            await self.publish_revocation("user", user_id)
         return user
 
     async def update_user_password(
@@ -801,13 +1720,12 @@ class AuthImplemented(BaseAuth):
         old_password: Optional[str] = None,
         new_password: Optional[str] = None,
     ) -> Dict[str, Union[str, int]]:
-        current_hash: str = crypto_context.hash(old_password)
-        new_hash: str = crypto_context.hash(new_password)
-
-        users = await self.database.fetch_all(
-            self.users.select().where(self.users.c.user_id == user_id)
+        old_hash: Optional[str] = await self.database.fetch_val(
+            sa.sql.select([self.users.c.hashed_password]).where(
+                self.users.c.user_id == user_id
+            )
         )
-        if len(users) == 0:
+        if old_hash is None:
             self.logger.error("users with id %s doesn't exists", user_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -817,10 +1735,7 @@ class AuthImplemented(BaseAuth):
                 },
             )
 
-        user = users[0]
-        old_hash: str = user["hashed_password"]
-
-        if current_hash != old_hash:
+        if not await self.hash_pool.verify(old_password, old_hash):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
@@ -829,44 +1744,28 @@ class AuthImplemented(BaseAuth):
                 },
             )
 
-        self.logger.debug("updating password of user with id %s", user["user_id"])
+        new_hash: str = await self.hash_pool.hash(new_password)
+
+        self.logger.debug("updating password of user with id %s", user_id)
+        # password could be changed since it was verified,
+        # so update only succeeds if hash is still the same
         update = (
             self.users.update()
             .where(self.users.c.user_id == user_id)
+            .where(self.users.c.hashed_password == old_hash)
             .values(hashed_password=new_hash)
+            .returning(*self.user_info_columns())
         )
-
-        try:
-            await self.database.execute(update)
-        except Exception as exception:
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
-
-        try:
-            user = await self.database.fetch_one(
-                self.users.select().where(self.users.c.user_id == user_id)
-            )
-            if user is None:
-                raise ValueError
-        except Exception as exception:
-            self.logger.error(exception)
+        user = await self.fetch_written(update)
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
+                    "eng": f"incorrect password",
+                    "rus": f"неправильный пароль",
                 },
             )
-        user = dict(user)
-        del user["hashed_password"]
+        await self.publish_revocation("user", user_id)
         return user
 
     async def update_user_email(
@@ -909,19 +1808,29 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
+        await self.publish_revocation("user", user_id)
 
     async def create_org(
         self,
         organisation_id: str,
         organisation_name: Optional[str] = None,
     ) -> Dict[str, Union[str, List[str]]]:
-        # check if org with given this id exists
-        self.logger.debug("checking for organisation with id %s", organisation_id)
-        select_orgs_with_same_id = self.organisations.select().where(
-            self.organisations.c.organisation_id == organisation_id
+        self.logger.debug("creating organisation with id %s", organisation_id)
+        new_org = {
+            "organisation_id": organisation_id,
+            "organisation_name": organisation_name,
+        }
+        insert = (
+            pg_insert(self.organisations)
+            .values(**new_org)
+            .on_conflict_do_nothing(
+                index_elements=[self.organisations.c.organisation_id]
+            )
+            .returning(self.organisations.c.organisation_id)
         )
-        orgs_with_same_id = await self.database.fetch_all(select_orgs_with_same_id)
-        if len(orgs_with_same_id) > 0:
+
+        created = await self.fetch_written(insert)
+        if created is None:
             self.logger.debug("organisation with id %s already exists", organisation_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -930,32 +1839,7 @@ class AuthImplemented(BaseAuth):
                     "rus": f"организация с данным идентификатором ({organisation_id}) уже существует",
                 },
             )
-        else:
-            self.logger.debug("organisation with id %s doesn't exist", organisation_id)
-
-        # create organisation
-        self.logger.debug("creating organisation with id %s", organisation_id)
-        new_org = {
-            "uuid": uuid.uuid4().bytes,
-            "member_of": organisation_id,
-            "name": organisation_name,
-        }
-        insert = self.organisations.insert().values(**new_org)
-
-        try:
-            await self.database.execute(insert)
-            self.logger.debug("created organisation with id %s", organisation_id)
-        except Exception as exception:
-            self.logger.debug("can't created organisation with id %s", organisation_id)
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
+        self.logger.debug("created organisation with id %s", organisation_id)
         return new_org
 
     async def read_org(self, organisation_id: str) -> Dict[str, Union[str, List[str]]]:
@@ -979,11 +1863,36 @@ class AuthImplemented(BaseAuth):
         return dict(org)
 
     async def read_orgs(
-        self, columns: Optional[List[str]] = None
-    ) -> List[Dict[str, str]]:
-        self.logger.debug("querying all organisations")
+        self,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        self.logger.debug("querying page of organisations")
+        return await self.read_page(
+            self.organisations.select(),
+            self.organisations.c.organisation_id,
+            cursor,
+            limit,
+        )
+
+    async def iterate_orgs(self) -> AsyncIterator[Dict[str, str]]:
+        self.logger.debug("streaming all organisations")
+        async for org in self.database.iterate(
+            self.organisations.select().order_by(self.organisations.c.organisation_id)
+        ):
+            yield dict(org)
+
+    async def import_orgs(
+        self, orgs: List[Tuple[int, MinimalOrganisation]]
+    ) -> List[ImportRowError]:
+        self.logger.debug("importing %s organisations", len(orgs))
         try:
-            raw_orgs = await self.database.fetch_all(self.organisations.select())
+            created: Set[str] = await self.copy_insert(
+                self.organisations,
+                ["organisation_id", "organisation_name"],
+                [(org.organisation_id, org.organisation_name) for _, org in orgs],
+            )
         except Exception as exception:
             self.logger.error(exception)
             raise HTTPException(
@@ -994,8 +1903,25 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
-        orgs: List[Dict] = [dict(org) for org in raw_orgs]
-        return orgs
+        self.logger.info("imported %s of %s organisations", len(created), len(orgs))
+
+        errors: List[ImportRowError] = []
+        for row, org in orgs:
+            if org.organisation_id in created:
+                created.discard(org.organisation_id)
+            else:
+                errors.append(
+                    ImportRowError(
+                        row=row,
+                        detail={
+                            "eng": f"organisation with given organisation_id "
+                            f"({org.organisation_id}) already exists",
+                            "rus": f"организация с данным идентификатором "
+                            f"({org.organisation_id}) уже существует",
+                        },
+                    )
+                )
+        return errors
 
     async def update_org(
         self,
@@ -1012,20 +1938,20 @@ class AuthImplemented(BaseAuth):
                 },
             )
 
-        values: Dict[str, Any] = {
-            "new_organisation_name": new_organisation_name,
-            "new_organisation_id": new_organisation_id,
-        }
-        new_values: Dict[str, Any] = {
-            key: val for key, val in values.items() if val is not None
-        }
-
-        orgs = await self.database.fetch_all(
-            self.organisations.select().where(
+        self.logger.debug("updating organisation with id %s", old_organisation_id)
+        if new_organisation_name is not None:
+            statement = (
+                self.organisations.update()
+                .where(self.organisations.c.organisation_id == old_organisation_id)
+                .values(organisation_name=new_organisation_name)
+                .returning(*self.organisations.c)
+            )
+        else:
+            statement = self.organisations.select().where(
                 self.organisations.c.organisation_id == old_organisation_id
             )
-        )
-        if len(orgs) == 0:
+        org = await self.fetch_written(statement)
+        if org is None:
             self.logger.error("users with id %s doesn't exists", old_organisation_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -1034,46 +1960,7 @@ class AuthImplemented(BaseAuth):
                     "rus": f"организации с id {old_organisation_id} не существует",
                 },
             )
-
-        self.logger.debug("updating organisation with id %s", old_organisation_id)
-        update = (
-            self.organisations.update()
-            .where(self.organisations.c.organisation_id == old_organisation_id)
-            .values(**new_values)
-        )
-
-        try:
-            await self.database.execute(update)
-        except Exception as exception:
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
-
-        try:
-            org = await self.database.fetch_one(
-                self.organisations.select().where(
-                    self.organisations.c.organisation_id == old_organisation_id
-                )
-            )
-            if org is None:
-                raise ValueError
-        except Exception as exception:
-            self.logger.error(exception)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
-                },
-            )
-        return dict(org)
+        return org
 
     async def delete_org(self, organisation_id: str):
         orgs = await self.database.fetch_all(
@@ -1112,66 +1999,83 @@ class AuthImplemented(BaseAuth):
     async def create_invite_code(
         self, issuer: str, code: str, add_to: str
     ) -> Dict[str, Any]:
-        codes = await self.database.fetch_all(
-            self.invitation_codes.select().where(self.invitation_codes.c.code == code)
-        )
-        if len(codes) > 0:
-            self.logger.error("code %s already exists", code)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "eng": f"code {code} already exists",
-                    "rus": f"код {code} уже существует",
-                },
-            )
-
-        org = await self.database.fetch_all(
-            self.organisations.select().where(
-                self.organisations.c.organisation_id == add_to
-            )
-        )
-
-        if len(org) < 0:
-            self.logger.error("can't find organisation with id %s", add_to)
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "end": f"can't find organisation with id {add_to}",
-                    "rus": f"организации с id {add_to} не существует",
-                },
-            )
-
         new_code = {
-            "invitation_code_uuid": uuid.uuid4(),
+            "invitation_code_uuid": uuid.uuid4().bytes,
             "code": code,
             "issuer_id": issuer,
             "add_to": add_to,
+            "used_times": 0,
         }
-        insert = self.invitation_codes.insert().values(**new_code)
+        insert = (
+            pg_insert(self.invitation_codes)
+            .values(**new_code)
+            .on_conflict_do_nothing(index_elements=[self.invitation_codes.c.code])
+            .returning(*self.invite_code_columns())
+        )
 
-        self.logger.debug("creating users with this info: %s", new_code)
-        try:
-            await self.database.execute(insert)
-        except Exception as exception:
-            self.logger.error(exception)
+        self.logger.debug("creating invite code with this info: %s", new_code)
+        created = await self.fetch_written(
+            insert,
+            missing_reference={
+                "end": f"can't find organisation with id {add_to}",
+                "rus": f"организации с id {add_to} не существует",
+            },
+        )
+        if created is None:
+            self.logger.error("code %s already exists", code)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
+                    "eng": f"code {code} already exists",
+                    "rus": f"код {code} уже существует",
                 },
             )
-        return new_code
+        return created
+
+    def invite_code_columns(self) -> List[sa.sql.ColumnElement]:
+        """
+        columns of invite codes named as in `InviteCode` model
+        """
+        return [
+            self.invitation_codes.c.invitation_code_uuid,
+            self.invitation_codes.c.code,
+            self.invitation_codes.c.issuer_id,
+            self.invitation_codes.c.add_to,
+            self.invitation_codes.c.used_times.label("num_registered"),
+        ]
+
+    def select_invite_codes(self) -> sa.sql.Select:
+        return sa.sql.select(self.invite_code_columns())
+
+    def select_visible_invite_codes(self, requester: UserInfo) -> sa.sql.Select:
+        """
+        selects invite codes, which requester can see,
+        see `BaseAuth.invite_code_visible` for rules
+        """
+        select = self.select_invite_codes()
+        if requester.level_of_access == 3:
+            return select
+
+        visible = [
+            self.invitation_codes.c.issuer_id == requester.user_id,
+            self.invitation_codes.c.add_to == self.public_org_id,
+        ]
+        if requester.level_of_access == 2:
+            select = select.select_from(
+                self.invitation_codes.outerjoin(
+                    self.users,
+                    self.invitation_codes.c.issuer_id == self.users.c.user_id,
+                )
+            )
+            visible.append(self.users.c.member_of == requester.member_of)
+        return select.where(sa.or_(*visible))
 
     async def read_invite_code(self, code: str) -> Dict[str, str]:
         self.logger.debug("querying invitatiom_code with code %s", code)
-        select = self.invitation_codes.select().where(
-            self.invitation_codes.c.code == code
-        )
+        select = self.select_invite_codes().where(self.invitation_codes.c.code == code)
 
         try:
-            code = await self.database.fetch_one(select)
+            invite_code = await self.database.fetch_one(select)
         except Exception as exception:
             self.logger.error(exception)
             raise HTTPException(
@@ -1182,26 +2086,59 @@ class AuthImplemented(BaseAuth):
                     "модуля авторизации",
                 },
             )
-        return dict(code)
-
-    async def read_invite_codes(self) -> List[Dict[str, str]]:
-        self.logger.debug("querying all codes")
-        select = self.invitation_codes.select()
-
-        try:
-            raw_codes = await self.database.fetch_all(select)
-        except Exception as exception:
-            self.logger.error(exception)
+        if invite_code is None:
+            self.logger.error("invitation_code with code %s doesn't exists", code)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail={
-                    "eng": "An error occurred when working with Auth DB",
-                    "rus": "Произошла ошибка при обращении к базе данных "
-                    "модуля авторизации",
+                    "eng": f"invitation_code with code {code} doesn't exists",
+                    "rus": f"кода приглашения с кодом {code} не существует",
                 },
             )
-        codes: List[Dict] = [dict(code) for code in raw_codes]
-        return codes
+        return dict(invite_code)
+
+    async def read_invite_codes(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        self.logger.debug("querying page of codes")
+        return await self.read_page(
+            self.select_invite_codes(),
+            self.invitation_codes.c.code,
+            cursor,
+            limit,
+        )
+
+    async def iterate_invite_codes(self) -> AsyncIterator[Dict[str, str]]:
+        self.logger.debug("streaming all codes")
+        async for code in self.database.iterate(
+            self.select_invite_codes().order_by(self.invitation_codes.c.code)
+        ):
+            yield dict(code)
+
+    async def read_visible_invite_codes(
+        self,
+        requester: UserInfo,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        self.logger.debug("querying page of codes visible to %s", requester.user_id)
+        return await self.read_page(
+            self.select_visible_invite_codes(requester),
+            self.invitation_codes.c.code,
+            cursor,
+            limit,
+        )
+
+    async def iterate_visible_invite_codes(
+        self, requester: UserInfo
+    ) -> AsyncIterator[Dict[str, str]]:
+        self.logger.debug("streaming codes visible to %s", requester.user_id)
+        async for code in self.database.iterate(
+            self.select_visible_invite_codes(requester).order_by(
+                self.invitation_codes.c.code
+            )
+        ):
+            yield dict(code)
 
     async def delete_invite_code(self, code: str):
         codes = await self.database.fetch_all(
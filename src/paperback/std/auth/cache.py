@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    in-process least recently used cache with optional time to live
+
+    Parameters
+    ----------
+    maxsize: int
+        maximum number of entries, least recently used entries are evicted first
+    ttl: float, optional
+        default time to live of entries in seconds, entries don't expire if `None`
+
+    Attributes
+    ----------
+    hits: int
+        number of lookups, which found an entry
+    misses: int
+        number of lookups, which didn't find an entry
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self._data: "OrderedDict[K, Tuple[Optional[float], V]]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: K) -> Optional[V]:
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return None
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        returns value stored under `key` or `None` if it's missing or expired
+        """
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None):
+        """
+        stores `value` under `key`
+
+        Parameters
+        ----------
+        key: K
+        value: V
+        ttl: float, optional
+            time to live of this entry, overrides default `ttl` of cache
+        """
+        if ttl is None:
+            ttl = self.ttl
+        if self.maxsize <= 0 or (ttl is not None and ttl <= 0):
+            return
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """
+        removes entry with given `key` and returns it's value
+        """
+        entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def evict(self, predicate: Callable[[K, V], bool]) -> int:
+        """
+        removes all entries for which `predicate(key, value)` is true
+
+        Returns
+        -------
+        int
+            number of removed entries
+        """
+        keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,11 +1,141 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
 from passlib.context import CryptContext
 
+from paperback.exceptions.auth import HashQueueFullError
+
+# defaults of `hash.<scheme>_rounds` options,
+# use `paperback bench hash` to calibrate them for hardware
+default_rounds: Dict[str, int] = {
+    "argon2": 15,
+    "pbkdf2_sha512": 30_000,
+    "bcrypt": 15,
+}
+
 crypto_context = CryptContext(
-    schemes=["argon2", "pbkdf2_sha512", "bcrypt"],
+    schemes=list(default_rounds),
     deprecated="auto",
     argon2__max_threads=-1,
-    argon2__rounds=15,
-    pbkdf2_sha512__rounds=30_000,
     pbkdf2_sha512__salt_size=32,
-    bcrypt__rounds=15,
 )
+
+
+def context_settings(default: str, rounds: Dict[str, int]) -> Dict[str, Any]:
+    """
+    creates settings for `configure_context`
+
+    Parameters
+    ----------
+    default: str
+        default hashing scheme
+    rounds: Dict[str, int]
+        cost parameter per scheme, schemes missing here use `default_rounds`
+    """
+    settings: Dict[str, Any] = {"default": default}
+    for scheme, scheme_rounds in {**default_rounds, **rounds}.items():
+        settings[f"{scheme}__rounds"] = int(scheme_rounds)
+    return settings
+
+
+def configure_context(settings: Dict[str, Any]):
+    """
+    applies settings created by `context_settings` to `crypto_context`,
+    also used as initializer of hashing processes
+    """
+    crypto_context.update(**settings)
+
+
+def hash_password(password: str) -> str:
+    return crypto_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return crypto_context.verify(password, hashed_password)
+
+
+def needs_update(hashed_password: str) -> bool:
+    """
+    checks if hash uses deprecated scheme or parameters differing from configured,
+    cheap enough to be called outside of hashing processes
+    """
+    return crypto_context.needs_update(hashed_password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    return [crypto_context.hash(password) for password in passwords]
+
+
+class HashPool:
+    """
+    bounded pool of processes for hashing and verification of passwords
+
+    Parameters
+    ----------
+    workers: int
+        number of processes, number of CPUs is used if it's `0`
+    max_pending: int
+        maximum number of submitted and not yet finished jobs,
+        new jobs are rejected with `HashQueueFullError` after that
+    settings: Dict[str, Any]
+        settings of `crypto_context` in hashing processes, see `context_settings`
+    """
+
+    def __init__(self, workers: int, max_pending: int, settings: Dict[str, Any]):
+        self.max_pending: int = max_pending
+        self.pending: int = 0
+        self.workers: int = workers or os.cpu_count() or 1
+        # one process is left for interactive requests, unless there is only one
+        self.bulk_workers: int = max(self.workers - 1, 1)
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers or None,
+            initializer=configure_context,
+            initargs=(settings,),
+        )
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise HashQueueFullError
+        self.pending += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        if hashed_password is None:
+            return False
+        return await self.run(verify_password, password, hashed_password)
+
+    async def hash_many(self, passwords: List[str], chunk_size: int = 32) -> List[str]:
+        """
+        hashes passwords in chunks, one chunk per process at a time
+
+        Note
+        ----
+        bulk jobs aren't limited by `max_pending`, but they never occupy
+        more than `bulk_workers` processes, so that signins aren't stuck behind them
+        """
+        loop = asyncio.get_event_loop()
+        semaphore = asyncio.Semaphore(self.bulk_workers)
+
+        async def hash_chunk(chunk: List[str]) -> List[str]:
+            async with semaphore:
+                return await loop.run_in_executor(self.executor, hash_passwords, chunk)
+
+        chunks: List[List[str]] = [
+            passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+        ]
+        hashed: List[List[str]] = await asyncio.gather(
+            *(hash_chunk(chunk) for chunk in chunks)
+        )
+        return [hashed_password for chunk in hashed for hashed_password in chunk]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
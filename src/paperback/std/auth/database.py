@@ -0,0 +1,121 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import asyncpg
+from databases import Database
+from databases.backends.postgres import PostgresBackend
+
+
+class InstrumentedPool:
+    """
+    wrapper of `asyncpg.Pool`, which limits time of waiting for connection
+    and counts connections in use, waiting acquires and acquire latency
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+    acquire_timeout: float, optional
+        seconds to wait for free connection before `asyncio.TimeoutError`,
+        waits indefinitely if `None`
+
+    Note
+    ----
+    all other attributes are proxied to wrapped pool
+    """
+
+    def __init__(self, pool: asyncpg.pool.Pool, acquire_timeout: Optional[float]):
+        self.pool: asyncpg.pool.Pool = pool
+        self.acquire_timeout: Optional[float] = acquire_timeout
+        self.in_use: int = 0
+        self.waiting: int = 0
+        self.acquired: int = 0
+        self.timeouts: int = 0
+        self.acquire_time_total: float = 0.0
+        self.acquire_time_max: float = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    async def acquire(self, *, timeout: Optional[float] = None) -> asyncpg.Connection:
+        if timeout is None:
+            timeout = self.acquire_timeout
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            elapsed = time.perf_counter() - start
+            self.acquire_time_total += elapsed
+            self.acquire_time_max = max(self.acquire_time_max, elapsed)
+        self.acquired += 1
+        self.in_use += 1
+        return connection
+
+    async def release(self, connection: asyncpg.Connection, *, timeout=None):
+        try:
+            return await self.pool.release(connection, timeout=timeout)
+        finally:
+            self.in_use -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        attempts = self.acquired + self.timeouts
+        return {
+            "size": self.pool.get_size(),
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "idle": self.pool.get_idle_size(),
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_time_avg": self.acquire_time_total / attempts if attempts else 0.0,
+            "acquire_time_max": self.acquire_time_max,
+        }
+
+
+class InstrumentedPostgresBackend(PostgresBackend):
+    """
+    postgres backend of `databases`, which wraps it's pool in `InstrumentedPool`
+
+    Note
+    ----
+    `acquire_timeout` option is consumed here,
+    other options are passed to `asyncpg.create_pool` as is
+    """
+
+    def __init__(self, database_url, **options: Any):
+        self.acquire_timeout: Optional[float] = options.pop("acquire_timeout", None)
+        super().__init__(database_url, **options)
+
+    async def connect(self):
+        await super().connect()
+        self._pool = InstrumentedPool(self._pool, self.acquire_timeout)
+
+
+class InstrumentedDatabase(Database):
+    """
+    `databases.Database`, which exposes stats of it's connection pool
+    """
+
+    SUPPORTED_BACKENDS = {
+        **Database.SUPPORTED_BACKENDS,
+        "postgresql": "paperback.std.auth.database:InstrumentedPostgresBackend",
+        "postgres": "paperback.std.auth.database:InstrumentedPostgresBackend",
+    }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            counters of `InstrumentedPool`, empty if database isn't connected
+        """
+        pool = getattr(self._backend, "_pool", None)
+        if not isinstance(pool, InstrumentedPool):
+            return {}
+        return pool.stats()
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from user_agents import parse
+
+from paperback.std.auth.cache import LRUCache
+
+
+class DeviceParser:
+    """
+    memoized conversion of `User-Agent` header to human readable device string
+
+    Note
+    ----
+    parsing is regex heavy, while number of distinct user agents is small,
+    so results are kept in bounded cache keyed by raw header
+
+    Parameters
+    ----------
+    cache_size: int
+        maximum number of cached user agents
+    """
+
+    def __init__(self, cache_size: int):
+        self.cache: LRUCache[str, str] = LRUCache(cache_size)
+
+    @staticmethod
+    def parse(ua_str: str) -> str:
+        try:
+            return str(parse(ua_str))
+        except Exception:
+            return "Unknown"
+
+    def __call__(self, ua_str: Optional[str]) -> str:
+        if not ua_str:
+            return "Unknown"
+        device: Optional[str] = self.cache.get(ua_str)
+        if device is None:
+            device = self.parse(ua_str)
+            self.cache.set(ua_str, device)
+        return device
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from abc import ABCMeta, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ipstack import GeoLookup
+
+from paperback.std.auth.cache import LRUCache
+
+try:
+    import maxminddb
+except ImportError:
+    maxminddb = None
+
+
+def flag_emoji(country_code: str) -> str:
+    """
+    converts ISO 3166-1 alpha-2 country code to flag emoji
+    """
+    return "".join(chr(0x1F1E6 + ord(letter) - ord("A")) for letter in country_code)
+
+
+class GeoBackend(metaclass=ABCMeta):
+    """
+    source of geolocation of IP addresses
+    """
+
+    @abstractmethod
+    async def locate(self, ip: str) -> Optional[str]:
+        """
+        returns human readable location of `ip`
+
+        Parameters
+        ----------
+        ip: str
+            IPv4 or IPv6 address
+
+        Returns
+        -------
+        str, optional
+            location or `None` if backend doesn't know it
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MMDBGeoBackend(GeoBackend):
+    """
+    reads memory-mapped MaxMind DB file, i.e. GeoLite2 City database
+
+    Note
+    ----
+    requires optional `maxminddb` dependency
+    """
+
+    def __init__(self, db_file: Path):
+        if maxminddb is None:
+            raise ImportError("`maxminddb` is required for reading geolocation DB")
+        self.reader = maxminddb.open_database(str(db_file), maxminddb.MODE_MMAP)
+
+    async def locate(self, ip: str) -> Optional[str]:
+        record: Optional[Dict[str, Any]] = self.reader.get(ip)
+        if not record or "country" not in record:
+            return None
+
+        country: Dict[str, Any] = record["country"]
+        parts: List[str] = [
+            record.get("city", {}).get("names", {}).get("en", ""),
+            (record.get("subdivisions") or [{}])[0].get("names", {}).get("en", ""),
+            country.get("names", {}).get("en", ""),
+        ]
+        return f"{flag_emoji(country.get('iso_code', ''))} " + " / ".join(parts)
+
+    def close(self):
+        self.reader.close()
+
+
+class IPStackGeoBackend(GeoBackend):
+    """
+    queries ipstack API in thread pool, so that event loop isn't blocked
+
+    Parameters
+    ----------
+    api_key: str
+    timeout: float
+        seconds to wait for response
+    """
+
+    def __init__(self, api_key: str, timeout: float):
+        self.geo_lookup: GeoLookup = GeoLookup(api_key)
+        self.timeout: float = timeout
+
+    async def locate(self, ip: str) -> Optional[str]:
+        loop = asyncio.get_event_loop()
+        ipstack_res: Optional[Dict[str, Any]] = await asyncio.wait_for(
+            loop.run_in_executor(None, self.geo_lookup.get_location, ip),
+            timeout=self.timeout,
+        )
+        if not ipstack_res:
+            return None
+        return (
+            f"{ipstack_res['location']['country_flag_emoji']} "
+            f"{ipstack_res['city']} / "
+            f"{ipstack_res['region_name']} / "
+            f"{ipstack_res['country_name']}"
+        )
+
+
+class GeoLocator:
+    """
+    caches locations of IP addresses, which are resolved by first capable backend
+
+    Parameters
+    ----------
+    backends: List[GeoBackend]
+        backends in order of priority
+    cache_size: int
+        maximum number of cached IP addresses
+    unknown_ttl: float
+        seconds for which IP addresses, which no backend could resolve,
+        are remembered as unknown, so that paid backends aren't queried on every signin
+    """
+
+    unknown: str = "Unknown"
+
+    def __init__(
+        self, backends: List[GeoBackend], cache_size: int, unknown_ttl: float = 600
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.getLogger("paperback").level)
+
+        self.backends: List[GeoBackend] = backends
+        self.cache: LRUCache[str, str] = LRUCache(cache_size)
+        self.unknown_ttl: float = unknown_ttl
+
+    async def locate(self, ip: str) -> str:
+        location: Optional[str] = self.cache.get(ip)
+        if location is not None:
+            return location
+
+        for backend in self.backends:
+            try:
+                location = await backend.locate(ip)
+            except Exception as exception:
+                self.logger.error(
+                    "an error acquired when using %s: %s",
+                    type(backend).__name__,
+                    exception,
+                )
+                continue
+            if location is not None:
+                self.cache.set(ip, location)
+                return location
+        self.cache.set(ip, self.unknown, ttl=self.unknown_ttl)
+        return self.unknown
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
@@ -0,0 +1,128 @@
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+import ecdsa
+from authlib.jose import ECKey, JsonWebToken, Key, OKPKey
+
+curve2algorithm: Dict[str, str] = {
+    "secp256r1": "ES256",
+    "secp384r1": "ES384",
+    "secp521r1": "ES512",
+    "ed25519": "EdDSA",
+}
+
+curve2ecdsa: Dict[str, ecdsa.curves.Curve] = {
+    "secp256r1": ecdsa.NIST256p,
+    "secp384r1": ecdsa.NIST384p,
+    "secp521r1": ecdsa.NIST521p,
+}
+
+
+def unsupported_curve(curve: str) -> KeyError:
+    return KeyError(
+        f"unsupported curve `{curve}`, "
+        f"supported curves are {', '.join(curve2algorithm)}"
+    )
+
+
+def generate_keys(curve: str) -> Tuple[bytes, bytes]:
+    """
+    generates new key pair on given curve
+
+    Parameters
+    ----------
+    curve: str
+        one of `curve2algorithm` keys
+
+    Returns
+    -------
+    Tuple[bytes, bytes]
+        private and public keys in PEM
+    """
+
+    def default():
+        raise unsupported_curve(curve)
+
+    def nist():
+        sk: ecdsa.SigningKey = ecdsa.SigningKey.generate(curve=curve2ecdsa[curve])
+        vk: ecdsa.VerifyingKey = sk.verifying_key
+        return bytes(sk.to_pem()), bytes(vk.to_pem())
+
+    def ed25519():
+        key: OKPKey = OKPKey.generate_key("Ed25519", is_private=True)
+        return key.as_pem(is_private=True), key.as_pem()
+
+    case: Dict[str, Callable[[], Tuple[bytes, bytes]]] = defaultdict(default)
+    for nist_curve in curve2ecdsa:
+        case[nist_curve] = nist
+    case["ed25519"] = ed25519
+    return case[curve]()
+
+
+def load_keys(curve: str, private_pem: bytes) -> Tuple[Key, Key]:
+    """
+    parses private key and derives public key from it
+
+    Note
+    ----
+    returned objects are accepted by `authlib` as is,
+    so keys aren't parsed again on every signing or verification
+
+    Parameters
+    ----------
+    curve: str
+        one of `curve2algorithm` keys, key should be on this curve
+    private_pem: bytes
+        private key in PEM
+
+    Returns
+    -------
+    Tuple[Key, Key]
+        private and public keys
+    """
+
+    def default():
+        raise unsupported_curve(curve)
+
+    def nist():
+        private_key: ECKey = ECKey.import_key(private_pem)
+        if private_key.raw_key.curve.name != curve:
+            raise ValueError(
+                f"key is on curve `{private_key.raw_key.curve.name}`, "
+                f"but `{curve}` is configured"
+            )
+        public_key: ECKey = ECKey.import_key(private_key.raw_key.public_key())
+        return private_key, public_key
+
+    def ed25519():
+        private_key: OKPKey = OKPKey.import_key(private_pem)
+        if private_key.get("crv") != "Ed25519":
+            raise ValueError(
+                f"key is on curve `{private_key.get('crv')}`, "
+                f"but `{curve}` is configured"
+            )
+        public_key: OKPKey = OKPKey.import_key(private_key.raw_key.public_key())
+        return private_key, public_key
+
+    case: Dict[str, Callable[[], Tuple[Key, Key]]] = defaultdict(default)
+    for nist_curve in curve2ecdsa:
+        case[nist_curve] = nist
+    case["ed25519"] = ed25519
+    return case[curve]()
+
+
+def create_jwt(curve: str) -> JsonWebToken:
+    """
+    creates JWT (de)serializer, which only accepts algorithm of given curve
+
+    Note
+    ----
+    tokens signed on secp521r1 key were issued with `ES384` header before,
+    so this algorithm is also accepted for them
+    """
+    if curve not in curve2algorithm:
+        raise unsupported_curve(curve)
+    algorithms = [curve2algorithm[curve]]
+    if curve == "secp521r1":
+        algorithms.append("ES384")
+    return JsonWebToken(algorithms)
@@ -0,0 +1,47 @@
+import json
+from typing import Any, Callable, List
+
+from authlib.common.encoding import urlsafe_b64decode, urlsafe_b64encode
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    encodes sort key of last returned row into opaque cursor
+
+    Parameters
+    ----------
+    values: List[Any]
+        json serializable values of sort key columns
+    """
+    return urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, parsers: List[Callable[[Any], Any]]) -> List[Any]:
+    """
+    decodes cursor created by `encode_cursor`
+
+    Parameters
+    ----------
+    cursor: str
+    parsers: List[Callable[[Any], Any]]
+        converters of json values back to values of sort key columns
+
+    Raises
+    ------
+    HTTPException
+        if cursor is malformed
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has wrong number of values")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "eng": "malformed cursor",
+                "rus": "некорректный курсор",
+            },
+        )
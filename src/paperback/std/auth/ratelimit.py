@@ -0,0 +1,73 @@
+import time
+from typing import Dict
+
+from paperback.std.auth.cache import LRUCache
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens: float = tokens
+        self.updated_at: float = updated_at
+
+
+class RateLimiter:
+    """
+    in-process token bucket rate limiter with separate bucket for every key
+
+    Parameters
+    ----------
+    rate: float
+        tokens added to every bucket per second, limiter is disabled if it's `<= 0`
+    burst: int
+        capacity of bucket, i.e. number of requests allowed at once
+    maxsize: int
+        maximum number of tracked keys, least recently used buckets are forgotten
+
+    Attributes
+    ----------
+    rejected: int
+        number of rejected requests
+    """
+
+    def __init__(self, rate: float, burst: int, maxsize: int):
+        self.rate: float = rate
+        self.burst: float = float(max(burst, 1))
+        self.buckets: LRUCache[str, TokenBucket] = LRUCache(maxsize)
+        self.rejected: int = 0
+
+    def acquire(self, key: str) -> float:
+        """
+        takes token from bucket of `key`
+
+        Returns
+        -------
+        float
+            `0` if request is allowed,
+            otherwise number of seconds until bucket has a token again
+        """
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+            self.buckets.set(key, bucket)
+        else:
+            bucket.tokens = min(
+                self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate
+            )
+            bucket.updated_at = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        self.rejected += 1
+        return (1 - bucket.tokens) / self.rate
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "keys": len(self.buckets),
+            "maxsize": self.buckets.maxsize,
+            "rejected": self.rejected,
+        }
@@ -1,5 +1,7 @@
+import hashlib
+import json
 from abc import ABCMeta, abstractmethod
-from typing import List, TypedDict
+from typing import Any, Dict, List, TypedDict
 
 from py2neo import Node, Relationship
 
@@ -13,6 +15,26 @@ class AnalyzerResult(TypedDict):
 
 
 class Analyzer(metaclass=ABCMeta):
+    # part of key of cached results, bump on every change of output
+    cache_version: int = 1
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """
+        configuration, which affects output, i.e. hosts of services
+        """
+        return {}
+
+    @property
+    def cache_key(self) -> str:
+        """
+        key of cached results, changes with `cache_version` and `settings`
+        """
+        digest = hashlib.sha256(
+            json.dumps(self.settings, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return f"{self.cache_version}-{digest[:16]}"
+
     @abstractmethod
     def process(self, text: str, parent_node: Node) -> AnalyzerResult:
         """Process text and connect to `parent_node`
@@ -0,0 +1,270 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from py2neo import Node, Relationship
+
+from paperback.std.docs.abc import AnalyzerResult
+
+# index of parent node in serialized relationships
+PARENT: int = -1
+
+
+def serialize_result(result: AnalyzerResult, parent_node: Node) -> Dict[str, Any]:
+    """
+    converts result of analyzer into json, which doesn't depend on graph
+
+    Parameters
+    ----------
+    result: AnalyzerResult
+    parent_node: Node
+        node passed to analyzer, stored as reference, not as node
+
+    Raises
+    ------
+    ValueError
+        if relationships reference nodes, which are neither in result nor parent
+    """
+    node2idx: Dict[int, int] = {id(parent_node): PARENT}
+    nodes: List[Dict[str, Any]] = []
+    for node in result["nodes"]:
+        node2idx[id(node)] = len(nodes)
+        nodes.append({"labels": sorted(node.labels), "props": dict(node)})
+
+    relationships: List[Dict[str, Any]] = []
+    for rel in result["relationships"]:
+        try:
+            start = node2idx[id(rel.start_node)]
+            end = node2idx[id(rel.end_node)]
+        except KeyError:
+            raise ValueError("relationship references node outside of result")
+        relationships.append(
+            {
+                "type": type(rel).__name__,
+                "start": start,
+                "end": end,
+                "props": dict(rel),
+            }
+        )
+
+    return {
+        "nodes": nodes,
+        "relationships": relationships,
+        "commands_to_run": list(result["commands_to_run"]),
+    }
+
+
+def deserialize_result(data: Dict[str, Any], parent_node: Node) -> AnalyzerResult:
+    """
+    creates new nodes and relationships from output of `serialize_result`,
+    connected to `parent_node`
+    """
+    nodes: List[Node] = [
+        Node(*node["labels"], **node["props"]) for node in data["nodes"]
+    ]
+
+    def get_node(idx: int) -> Node:
+        return parent_node if idx == PARENT else nodes[idx]
+
+    return {
+        "nodes": nodes,
+        "relationships": [
+            Relationship(
+                get_node(rel["start"]),
+                rel["type"],
+                get_node(rel["end"]),
+                **rel["props"],
+            )
+            for rel in data["relationships"]
+        ],
+        "commands_to_run": list(data["commands_to_run"]),
+    }
+
+
+class AnalyzerCache:
+    """
+    content-addressed disk cache of analyzer results
+
+    Parameters
+    ----------
+    cache_dir: Path
+    max_size: int
+        maximum total size of cached files in bytes,
+        least recently used files are removed above it, cache is disabled if `<= 0`
+
+    Note
+    ----
+    result is stored in `<cache_dir>/<analyzer_id>/<cache_key>/<sha256 of text>`,
+    so change of `Analyzer.cache_key` makes old results unreachable,
+    they are evicted as least recently used;
+    index of files is read from disk on startup and then kept in memory,
+    usage is tracked by modification time, so order survives restarts
+    """
+
+    suffix: str = ".json.gz"
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.getLogger("paperback").level)
+
+        self.cache_dir: Path = cache_dir
+        self.max_size: int = max_size
+        self.lock = threading.Lock()
+        # path -> size, from least to most recently used
+        self.files: "OrderedDict[Path, int]" = OrderedDict()
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evicted: int = 0
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.scan()
+            self.logger.debug(
+                "found %s cached analyzer results of %s bytes",
+                len(self.files),
+                self.size,
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def path(self, analyzer_id: str, cache_key: str, text: str) -> Path:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return self.cache_dir / analyzer_id / cache_key / (digest + self.suffix)
+
+    def scan(self):
+        """
+        builds index from files on disk, called once on startup
+        """
+        entries: List[os.stat_result] = []
+        paths: List[Path] = []
+        for path in self.cache_dir.glob("*/*/*" + self.suffix):
+            try:
+                entries.append(path.stat())
+            except FileNotFoundError:
+                continue
+            paths.append(path)
+        order = sorted(range(len(paths)), key=lambda i: entries[i].st_mtime)
+        self.files = OrderedDict((paths[i], entries[i].st_size) for i in order)
+        self.size = sum(self.files.values())
+
+    def get(
+        self, analyzer_id: str, cache_key: str, text: str, parent_node: Node
+    ) -> Optional[AnalyzerResult]:
+        """
+        Returns
+        -------
+        AnalyzerResult, optional
+            cached result connected to `parent_node` or `None` on miss
+        """
+        if not self.enabled:
+            return None
+        path = self.path(analyzer_id, cache_key, text)
+        try:
+            raw = path.read_bytes()
+            data = json.loads(gzip.decompress(raw))
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError):
+            self.logger.warning("removing corrupted analyzer cache file %s", path)
+            self.remove(path)
+            self.misses += 1
+            return None
+
+        with self.lock:
+            if path in self.files:
+                self.files.move_to_end(path)
+            else:
+                # written by other process after startup
+                self.files[path] = len(raw)
+                self.size += len(raw)
+        self.hits += 1
+        self.logger.debug("using cached result of %s analyzer", analyzer_id)
+        return deserialize_result(data, parent_node)
+
+    def set(
+        self,
+        analyzer_id: str,
+        cache_key: str,
+        text: str,
+        parent_node: Node,
+        result: AnalyzerResult,
+    ):
+        """
+        stores result, results which can't be serialized are skipped
+        """
+        if not self.enabled:
+            return
+        try:
+            raw = json.dumps(
+                serialize_result(result, parent_node), ensure_ascii=False
+            ).encode("utf-8")
+        except (TypeError, ValueError) as exc:
+            self.logger.warning(
+                "can't cache result of %s analyzer: %s", analyzer_id, exc
+            )
+            return
+        data = gzip.compress(raw, compresslevel=1)
+        if len(data) > self.max_size:
+            return
+
+        path = self.path(analyzer_id, cache_key, text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to unique file and rename, so readers never see partial file
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.size += len(data) - self.files.pop(path, 0)
+            self.files[path] = len(data)
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        """
+        removes least recently used files until cache fits into `max_size`
+
+        Note
+        ----
+        must be called with `lock` held
+        """
+        while self.size > self.max_size and self.files:
+            path, size = self.files.popitem(last=False)
+            self.size -= size
+            self.evicted += 1
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.logger.debug("evicted analyzer results, cache size is %s bytes", self.size)
+
+    def remove(self, path: Path):
+        with self.lock:
+            self.size -= self.files.pop(path, 0)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self.files),
+            "size": self.size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
@@ -185,6 +185,10 @@ class TitanisWrapper(Analyzer):
             rst=True,
         )
 
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return {"host": self.host}
+
     def process(self, text: str, parent_node: Node) -> AnalyzerResult:
         titanis_result: Dict[Any, Any] = cast(Dict[Any, Any], self.titanis(text))
 
@@ -295,6 +299,14 @@ class PyExLingWrapper(Analyzer):
 
         return res
 
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "service": self.service,
+            "titanis_host": self.titanis_host,
+        }
+
     def process(self, text: str, parent_node: Node) -> AnalyzerResult:
         self.logger.debug("starting to analyzer text")
         start_time = time.time()
@@ -324,7 +336,7 @@ class PyExLingWrapper(Analyzer):
         self.logger.debug("titanis in pyexling result: %s", titanis_psy_res)
 
         titanis_node = Node("Psy", **titanis_psy_res)
-        res["nodes"].append(text_node)
+        res["nodes"].append(titanis_node)
         res["relationships"].append(Relationship(text_node, "analyze_result", titanis_node))
 
         for sent in xml_document:
@@ -345,11 +357,7 @@ class PyExLingWrapper(Analyzer):
 
                 for word in clause:
                     attribs = self.cleanup_word_attrib(word.attrib)
-                    word_node = Node(
-                        "Word",
-                        new=True,
-                        **attribs,
-                    )
+                    word_node = Node("Word", **attribs)
                     res["nodes"].append(word_node)
 
                     word_rel = Relationship(clause_node, "contains", word_node)
@@ -366,6 +374,19 @@ class PyExLingWrapper(Analyzer):
                     Relationship(words[i], "next", words[i + 1])
                 )
 
+            # syntax links only connect words of the same sentence
+            for word_node in words:
+                parent_idx = word_node.get("syntax_parent_idx")
+                if parent_idx in word_idx2word_node:
+                    res["relationships"].append(
+                        Relationship(
+                            word_idx2word_node[parent_idx],
+                            "syntax_link",
+                            word_node,
+                            link_name=word_node.get("syntax_link_name"),
+                        )
+                    )
+
             for role in [child for child in sent if child.tag == "role"]:
                 self.logger.debug("role: %s", role)
                 role_node = Node("role")
@@ -385,17 +406,5 @@ class PyExLingWrapper(Analyzer):
                         role_id=int(arg.attrib["role_id"]),
                     )
                     res["relationships"].append(arg_rel)
-        res["commands_to_run"].append(
-            """
-            MATCH (s:sentence)-[*2]->(c:word {new:true})
-            WITH c,s
-            MATCH (s:sentence)-[*2]->(p:word {new:true})
-            WHERE c.syntax_parent_idx = p.idx
-            CREATE (p)-[:syntax_link{link_name:c.syntax_link_name}]->(c)
-            SET c.new = false, p.new = false
-            """)
-        res["commands_to_run"].append(
-            "MATCH (w:word) REMOVE w.new"
-        )
 
         return res
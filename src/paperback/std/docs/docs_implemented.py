@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
 
 import py2neo
+from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from paperback.abc import BaseAuth, BaseDocs
@@ -16,8 +20,26 @@ from paperback.std.docs.abc import Analyzer, AnalyzerResult
 from paperback.abc.models import CreateDoc, ReadMinimalCorp, TokenTester, UserInfo
 from paperback.exceptions import PaperBackError
 from paperback.exceptions.docs import CorpusDoesntExist, DocumentNameError, DictNameError
+from paperback.std.docs.analyzer_cache import AnalyzerCache
 from paperback.std.docs.analyzers import PyExLingWrapper, TitanisWrapper
-from paperback.std.docs.tasks import add_document
+from paperback.std.docs.graph_writer import GraphWriter
+from paperback.std.docs.tasks import add_document, app as task_queue
+
+
+T = TypeVar("T")
+
+
+def graph_io(method: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    turns blocking method, which uses py2neo, into coroutine method,
+    which runs it in `DocsImplemented.graph_executor`
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: "DocsImplemented", *args, **kwargs) -> T:
+        return await self.run_graph(functools.partial(method, self, *args, **kwargs))
+
+    return wrapper
 
 
 class AnalyzerEnum(str, Enum):
@@ -28,6 +50,7 @@ class AnalyzerEnum(str, Enum):
 class DocsImplemented(BaseDocs):
     requires_dir: bool = True
     requires_auth: bool = True
+    supports_jobs: bool = True
     DEFAULTS: Dict[str, Any] = {
         "db": {
             "scheme": "bolt",
@@ -35,8 +58,19 @@ class DocsImplemented(BaseDocs):
             "password": "password",
             "host": "localhost",
             "port": "7687",
+            "pool_size": 8,
+            "query_timeout": 30,
+        },
+        "graph_writer": {
+            "batch_size": 1000,
+        },
+        "analyzer_cache": {
+            "max_size": 1024**3,  # in bytes, `0` disables cache
         },
         "analyzers": {
+            # analyzers are slow remote services, so they run in own pool of threads
+            "workers": 4,
+            "timeout": 300,
             "titanis": {
                 "host": "",
             },
@@ -48,6 +82,9 @@ class DocsImplemented(BaseDocs):
         },
     }
 
+    # bump on every change of constraints or indexes in `set_constraints`
+    schema_version: int = 1
+
     def __init__(self, cfg: SimpleNamespace, storage_dir: Path, auth_module: BaseAuth):
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.getLogger("paperback").level)
@@ -71,9 +108,35 @@ class DocsImplemented(BaseDocs):
             password=self.cfg.db.password,
             host=self.cfg.db.host,
             port=self.cfg.db.port,
+            max_connections=int(self.cfg.db.pool_size),
         )
         self.logger.debug("connected to neo4j database")
 
+        # py2neo is blocking, so graph I/O of handlers runs in bounded pool of threads
+        self.graph_executor = ThreadPoolExecutor(
+            max_workers=int(self.cfg.db.pool_size), thread_name_prefix="neo4j"
+        )
+        self.query_timeout: float = float(self.cfg.db.query_timeout)
+        self.analyzer_executor = ThreadPoolExecutor(
+            max_workers=int(self.cfg.analyzers.workers), thread_name_prefix="analyzer"
+        )
+        self.analyzer_timeout: float = float(self.cfg.analyzers.timeout)
+
+        self.graph_writer = GraphWriter(int(self.cfg.graph_writer.batch_size))
+
+        self.analyzer_cache = AnalyzerCache(
+            self.storage_dir / "analyzer_cache", int(self.cfg.analyzer_cache.max_size)
+        )
+
+        result_backend: str = str(task_queue.conf.result_backend or "")
+        if result_backend.startswith("rpc"):
+            self.logger.warning(
+                "background jobs are disabled, "
+                "results in `%s` can't be read by other processes",
+                result_backend,
+            )
+            self.supports_jobs = False
+
         self.logger.debug("creating default corpus")
         self.root_corp = self.graph_db.nodes.match("corp", corp_id="root").first()
         if self.root_corp is None:
@@ -103,9 +166,91 @@ class DocsImplemented(BaseDocs):
 
     async def __async__init__(self):
         await self.sync_modules()
-        self.set_constraints()
+        await self.run_graph(self.set_constraints)
+
+    async def __async__del__(self):
+        self.graph_executor.shutdown(wait=False)
+        self.analyzer_executor.shutdown(wait=False)
+
+    async def _run_blocking(
+        self,
+        executor: ThreadPoolExecutor,
+        function: Callable[[], T],
+        timeout: float,
+        detail: Dict[str, str],
+    ) -> T:
+        """
+        runs blocking `function` in `executor`
+
+        Note
+        ----
+        after `timeout` request fails with 504 and `detail`,
+        but function can't be interrupted and occupies it's thread until it finishes
+        """
+        loop = asyncio.get_event_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, function), timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.error("%s after %s s", detail["eng"], timeout)
+            raise PaperBackError(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail
+            )
+
+    async def run_graph(self, function: Callable[[], T]) -> T:
+        """
+        runs py2neo `function` in `graph_executor` with `query_timeout`
+        """
+        return await self._run_blocking(
+            self.graph_executor,
+            function,
+            self.query_timeout,
+            {
+                "eng": "Docs DB didn't respond in time",
+                "rus": "База данных модуля документов не ответила вовремя",
+            },
+        )
+
+    async def run_analyzer(self, function: Callable[[], T]) -> T:
+        """
+        runs analyzer `function` in `analyzer_executor` with `analyzer_timeout`
+        """
+        return await self._run_blocking(
+            self.analyzer_executor,
+            function,
+            self.analyzer_timeout,
+            {
+                "eng": "Analyzer didn't respond in time",
+                "rus": "Анализатор не ответил вовремя",
+            },
+        )
 
     def set_constraints(self):
+        """
+        creates uniqueness constraints, if version stored in `SchemaVersion` node differs
+
+        Note
+        ----
+        schema itself is only inspected, when version differs,
+        otherwise startup costs single query
+        """
+        version: Optional[int] = self.graph_db.evaluate(
+            "MATCH (v:SchemaVersion {component: $component}) RETURN v.version",
+            component="docs",
+        )
+        if version is not None and version >= self.schema_version:
+            if version > self.schema_version:
+                self.logger.warning(
+                    "schema version %s is newer than supported %s",
+                    version,
+                    self.schema_version,
+                )
+            return
+
+        self.logger.info(
+            "migrating schema from version %s to %s", version, self.schema_version
+        )
         if len(self.graph_db.schema.get_uniqueness_constraints("org")) == 0:
             self.graph_db.schema.create_uniqueness_constraint("org", "org_id")
         if len(self.graph_db.schema.get_uniqueness_constraints("user")) == 0:
@@ -114,17 +259,33 @@ class DocsImplemented(BaseDocs):
             self.graph_db.schema.create_uniqueness_constraint("corp", "corp_id")
         if len(self.graph_db.schema.get_uniqueness_constraints("doc")) == 0:
             self.graph_db.schema.create_uniqueness_constraint("doc", "doc_id")
+        self.graph_db.run(
+            "MERGE (v:SchemaVersion {component: $component}) SET v.version = $version",
+            component="docs",
+            version=self.schema_version,
+        )
+        self.logger.info("migrated schema")
 
     def sync_modules_on_startup(self):
         pass
 
     async def sync_modules(self):
+        orgs: List[Dict[str, Any]] = [
+            org async for org in self.auth_module.iterate_orgs()
+        ]
+        users: List[Dict[str, Any]] = [
+            user async for user in self.auth_module.iterate_users()
+        ]
+        await self.run_graph(functools.partial(self.write_auth_entities, orgs, users))
+
+    def write_auth_entities(
+        self, orgs: List[Dict[str, Any]], users: List[Dict[str, Any]]
+    ):
         org_nodes: Dict[str, py2neo.Node] = {}
         user_nodes: Dict[str, py2neo.Node] = {}
 
         tx = self.graph_db.begin()
-        self.logger.debug("orgs: %s", await self.auth_module.read_orgs())
-        for org in await self.auth_module.read_orgs():
+        for org in orgs:
             # creating organisation
             org_node = tx.graph.nodes.match(
                 "org",
@@ -139,8 +300,7 @@ class DocsImplemented(BaseDocs):
                 tx.create(org_node)
             org_nodes[org["organisation_id"]] = org_node
 
-        self.logger.debug("users: %s", await self.auth_module.read_users())
-        for user in await self.auth_module.read_users():
+        for user in users:
             # creating user
             user_node = tx.graph.nodes.match(
                 "user",
@@ -190,11 +350,208 @@ class DocsImplemented(BaseDocs):
         created: Optional[datetime] = None,
         tags: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
+        """
+        analyzes document in `analyzer_executor` and saves it in `graph_executor`,
+        so slow analyzer doesn't occupy connections to neo4j
+        """
         self.logger.debug("adding new document")
+        await self.run_graph(functools.partial(self.check_doc_id, doc_id))
+
+        analyzer_res_node = py2neo.Node("AnalyzerResult", analyzer_id=analyzer_id)
+        analyzer_result: AnalyzerResult = await self.run_analyzer(
+            functools.partial(self.analyze_doc, analyzer_id, text, analyzer_res_node)
+        )
 
+        await self.run_graph(
+            functools.partial(
+                self.save_doc,
+                creator_id=creator_id,
+                creator_type=creator_type,
+                doc_id=doc_id,
+                text=text,
+                private=private,
+                parent_corp_id=parent_corp_id,
+                name=name,
+                author=author,
+                created=created,
+                tags=tags,
+                analyzer_res_node=analyzer_res_node,
+                analyzer_result=analyzer_result,
+            )
+        )
+        self.logger.info("added document %s", doc_id)
+
+    async def enqueue_doc(
+        self,
+        creator_id: str,
+        creator_type: str,
+        doc_id: str,
+        text: str,
+        analyzer_id: Optional[AnalyzerEnum] = "pyexling",
+        private: bool = False,
+        parent_corp_id: Optional[str] = None,
+        name: Optional[str] = None,
+        has_access: Optional[List[str]] = None,
+        author: Optional[str] = None,
+        created: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+    ) -> str:
+        # arguments of job are sent as json
+        doc: Dict[str, Any] = {
+            "creator_id": creator_id,
+            "creator_type": creator_type,
+            "doc_id": doc_id,
+            "text": text,
+            "analyzer_id": analyzer_id,
+            "private": private,
+            "parent_corp_id": parent_corp_id,
+            "name": name,
+            "has_access": has_access,
+            "author": author,
+            "created": created.isoformat() if created is not None else None,
+            "tags": tags,
+        }
+        loop = asyncio.get_event_loop()
+        job = await loop.run_in_executor(
+            None, functools.partial(add_document.apply_async, (doc,))
+        )
+        self.logger.debug("enqueued document %s as job %s", doc_id, job.id)
+        return job.id
+
+    async def read_doc_job(self, job_id: str, requester_id: str) -> Dict[str, Any]:
+        def read_state() -> Dict[str, Any]:
+            job = AsyncResult(job_id, app=task_queue)
+            state: str = job.state
+            job_info: Dict[str, Any] = {"job_id": job_id, "status": state}
+            if state == "PENDING":
+                # unknown jobs are pending too, so there is nothing to hide
+                return job_info
+            doc: Dict[str, Any] = job.args[0] if job.args else {}
+            if doc.get("creator_id") != requester_id:
+                raise PaperBackError(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail={
+                        "eng": f"job {job_id} was created by another user",
+                        "rus": f"задача {job_id} создана другим пользователем",
+                    },
+                )
+            if state == "PROGRESS":
+                job_info["progress"] = job.info
+            elif state == "SUCCESS":
+                job_info["result"] = job.result
+            elif state == "FAILURE":
+                job_info["error"] = str(job.info)
+            return job_info
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, read_state)
+
+    def write_doc(
+        self,
+        creator_id: str,
+        creator_type: str,
+        doc_id: str,
+        text: str,
+        analyzer_id: Optional[AnalyzerEnum] = "pyexling",
+        private: bool = False,
+        parent_corp_id: Optional[str] = None,
+        name: Optional[str] = None,
+        has_access: Optional[List[str]] = None,
+        author: Optional[str] = None,
+        created: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+    ):
+        """
+        analyzes and saves document, blocks until it's done
+
+        Parameters
+        ----------
+        progress: Callable[[str, int, int], None], optional
+            called with name of stage, it's number and number of stages
+        """
+        self.logger.debug("adding new document")
+        if progress is None:
+            progress = lambda stage, step, steps: None  # noqa: E731
+
+        self.check_doc_id(doc_id)
+
+        progress("analyzing", 1, 2)
+        analyzer_res_node = py2neo.Node("AnalyzerResult", analyzer_id=analyzer_id)
+        analyzer_result = self.analyze_doc(analyzer_id, text, analyzer_res_node)
+
+        progress("writing", 2, 2)
+        self.save_doc(
+            creator_id=creator_id,
+            creator_type=creator_type,
+            doc_id=doc_id,
+            text=text,
+            private=private,
+            parent_corp_id=parent_corp_id,
+            name=name,
+            author=author,
+            created=created,
+            tags=tags,
+            analyzer_res_node=analyzer_res_node,
+            analyzer_result=analyzer_result,
+        )
+
+    def check_doc_id(self, doc_id: str):
+        """
+        fails early, before analyzing document, if `doc_id` is occupied
+
+        Raises
+        ------
+        DocumentNameError
+        """
+        if self.graph_db.nodes.match("Document", doc_id=doc_id).first() is not None:
+            raise DocumentNameError
+
+    def analyze_doc(
+        self, analyzer_id: AnalyzerEnum, text: str, analyzer_res_node: py2neo.Node
+    ) -> AnalyzerResult:
+        """
+        runs analyzer or reads its result from `analyzer_cache`,
+        doesn't touch neo4j
+        """
+        analyzer: Analyzer = self.analyzers[analyzer_id]
+        analyzer_name: str = AnalyzerEnum(analyzer_id).value
+        analyzer_result: Optional[AnalyzerResult] = self.analyzer_cache.get(
+            analyzer_name, analyzer.cache_key, text, analyzer_res_node
+        )
+        if analyzer_result is None:
+            analyzer_result = analyzer(text, analyzer_res_node)
+            self.analyzer_cache.set(
+                analyzer_name,
+                analyzer.cache_key,
+                text,
+                analyzer_res_node,
+                analyzer_result,
+            )
+        return analyzer_result
+
+    def save_doc(
+        self,
+        creator_id: str,
+        creator_type: str,
+        doc_id: str,
+        text: str,
+        private: bool,
+        parent_corp_id: Optional[str],
+        name: Optional[str],
+        author: Optional[str],
+        created: Optional[datetime],
+        tags: Optional[List[str]],
+        analyzer_res_node: py2neo.Node,
+        analyzer_result: AnalyzerResult,
+    ):
+        """
+        saves document and result of analyzer in one transaction
+        """
         tx = self.graph_db.begin()
 
-        # check that Document with the same id
+        # check that Document with the same id doesn't exist,
+        # it could be created while document was analyzed
 
         docs_with_same_name = tx.graph.nodes.match(
             "Document", doc_id=doc_id,
@@ -240,26 +597,22 @@ class DocsImplemented(BaseDocs):
 
         # add analyzer node
 
-        analyzer_res_node = py2neo.Node("AnalyzerResult", analyzer_id=analyzer_id)
         tx.create(analyzer_res_node)
         tx.create(py2neo.Relationship(doc_node, "analyzed", analyzer_res_node))
 
-        # add
+        # add result of analyzer
 
-        analyzer_result: AnalyzerResult = self.analyzers[analyzer_id](text, analyzer_res_node)
-
-        for node in analyzer_result["nodes"]:
-            tx.create(node)
-
-        for relationship in analyzer_result["relationships"]:
-            tx.create(relationship)
+        self.graph_writer.write(
+            tx, analyzer_result["nodes"], analyzer_result["relationships"]
+        )
 
         for command in analyzer_result["commands_to_run"]:
             tx.run(command)
 
         tx.commit()
 
-    async def read_docs(
+    @graph_io
+    def read_docs(
         self,
         requester_id: str,
         contains: Optional[str] = None,
@@ -333,7 +686,8 @@ class DocsImplemented(BaseDocs):
     async def delete_doc(self, doc_id: str):
         pass
 
-    async def create_corp(
+    @graph_io
+    def create_corp(
         self,
         issuer_id: str,
         issuer_type: str,
@@ -468,7 +822,8 @@ class DocsImplemented(BaseDocs):
     async def delete_corp(self, corp_id: str):
         pass
 
-    async def create_dict(
+    @graph_io
+    def create_dict(
         self,
         user_id: str,
         dict_id: str,
@@ -510,7 +865,8 @@ class DocsImplemented(BaseDocs):
 
         tx.commit()
 
-    async def read_dicts(
+    @graph_io
+    def read_dicts(
         self,
         user_id: str,
     ) -> List[Dict[str, Any]]:
@@ -534,7 +890,8 @@ class DocsImplemented(BaseDocs):
         self.logger.info("read dicts")
         return [dict(d) for d in dicts]
 
-    async def read_dict(
+    @graph_io
+    def read_dict(
         self,
         user_id: str,
         dict_id: str,
@@ -579,6 +936,6 @@ class DocsImplemented(BaseDocs):
             """
             creates document with given id if it's not occupied
             """
-            return self.create_doc(
+            return await self.create_doc(
                 creator_id=requester.user_id, creator_type="user", **doc.dict()
             )
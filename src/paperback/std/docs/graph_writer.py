@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from py2neo import Node, Relationship, Transaction
+
+
+def escape_name(name: str) -> str:
+    """
+    quotes label or relationship type for use in cypher
+    """
+    return "`" + name.replace("`", "``") + "`"
+
+
+def batches(rows: Sequence[Any], batch_size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(rows), batch_size):
+        yield rows[start : start + batch_size]
+
+
+class GraphWriter:
+    """
+    writes nodes and relationships with few parameterized `UNWIND` statements
+    instead of one statement per entity
+
+    Parameters
+    ----------
+    batch_size: int
+        maximum number of rows sent in single statement
+
+    Note
+    ----
+    nodes are grouped by set of labels and relationships by type,
+    as labels and types can't be parameters of cypher query
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size: int = max(batch_size, 1)
+
+    def write(
+        self,
+        tx: Transaction,
+        nodes: Iterable[Node],
+        relationships: Iterable[Relationship],
+    ):
+        """
+        creates nodes and relationships in transaction
+
+        Parameters
+        ----------
+        tx: Transaction
+        nodes: Iterable[Node]
+            new nodes, already created nodes are skipped
+        relationships: Iterable[Relationship]
+            new relationships, their nodes are created if they aren't
+
+        Note
+        ----
+        created nodes are bound to graph of transaction like after `tx.create`
+        """
+        relationships = list(relationships)
+        new_nodes: Dict[int, Node] = {}
+        for node in [
+            *nodes,
+            *(node for rel in relationships for node in (rel.start_node, rel.end_node)),
+        ]:
+            if node.identity is None:
+                new_nodes.setdefault(id(node), node)
+
+        node_ids: Dict[int, int] = self.create_nodes(tx, list(new_nodes.values()))
+        self.create_relationships(tx, relationships, node_ids)
+
+    def create_nodes(self, tx: Transaction, nodes: List[Node]) -> Dict[int, int]:
+        """
+        Returns
+        -------
+        Dict[int, int]
+            maps `id` of python objects to ids of created nodes
+        """
+        label2nodes: Dict[Tuple[str, ...], List[Node]] = defaultdict(list)
+        for node in nodes:
+            label2nodes[tuple(sorted(node.labels))].append(node)
+
+        node_ids: Dict[int, int] = {}
+        for labels, label_nodes in label2nodes.items():
+            query: str = (
+                "UNWIND $rows AS r "
+                f"CREATE (n{''.join(':' + escape_name(label) for label in labels)}) "
+                "SET n = r.props "
+                "RETURN r.key AS key, id(n) AS id"
+            )
+            for batch in batches(label_nodes, self.batch_size):
+                rows = [{"key": id(node), "props": dict(node)} for node in batch]
+                for record in tx.run(query, rows=rows).data():
+                    node_ids[record["key"]] = record["id"]
+            for node in label_nodes:
+                node.graph = tx.graph
+                node.identity = node_ids[id(node)]
+        return node_ids
+
+    def create_relationships(
+        self,
+        tx: Transaction,
+        relationships: List[Relationship],
+        node_ids: Dict[int, int],
+    ):
+        def identity(node: Node) -> int:
+            if node.identity is not None:
+                return node.identity
+            return node_ids[id(node)]
+
+        type2rows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for rel in relationships:
+            type2rows[type(rel).__name__].append(
+                {
+                    "start": identity(rel.start_node),
+                    "end": identity(rel.end_node),
+                    "props": dict(rel),
+                }
+            )
+
+        for rel_type, rows in type2rows.items():
+            query: str = (
+                "UNWIND $rows AS r "
+                "MATCH (a) WHERE id(a) = r.start "
+                "MATCH (b) WHERE id(b) = r.end "
+                f"CREATE (a)-[x:{escape_name(rel_type)}]->(b) "
+                "SET x = r.props"
+            )
+            for batch in batches(rows, self.batch_size):
+                tx.run(query, rows=batch)
@@ -1,4 +1,5 @@
-from typing import Literal, Any, Union
+from collections import deque
+from typing import AsyncIterator, Deque, Literal, Any, Union
 
 
 AsyncLibName = Literal["asyncio", "uvloop"]
@@ -24,3 +25,58 @@ def get_response_class() -> Any:
         ORJSONResponse = None  # noqa
 
     return ORJSONResponse or JSONResponse
+
+
+def ndjson_response(models: Any) -> Any:
+    """
+    streams pydantic models as newline delimited json
+
+    Parameters
+    ----------
+    models: AsyncIterator[BaseModel]
+        models to send, each is serialized when it's produced
+    """
+    from starlette.responses import StreamingResponse
+
+    async def lines():
+        async for model in models:
+            yield model.json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def iterate_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    splits streamed utf-8 body into lines without reading it whole
+    """
+    buffer: bytes = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+class LineFeed:
+    """
+    iterator over lines, which are added after it's creation,
+    lets `csv.reader` parse lines of streamed body one record at a time
+
+    Note
+    ----
+    reader should only be advanced after all lines of record are added,
+    i.e. when quotes of added lines are balanced
+    """
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self) -> "LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
@@ -0,0 +1,240 @@
+import asyncio
+import datetime
+import logging
+import sys
+import threading
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from config import config_from_dict
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from py2neo import Node
+from sqlalchemy.dialects import postgresql
+
+# clients of analyzer services aren't published on PyPI,
+# stub them, so that `paperback.std` can be imported in tests
+for name, attr in [("pyexling", "PyExLing"), ("titanis", "Titanis")]:
+    try:
+        __import__(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        setattr(module, attr, object)
+        sys.modules[name] = module
+
+from paperback.std.auth.auth_implemented import AuthImplemented  # noqa: E402
+from paperback.std.docs.analyzer_cache import AnalyzerCache  # noqa: E402
+from paperback.std.docs.docs_implemented import (  # noqa: E402
+    AnalyzerEnum,
+    DocsImplemented,
+)
+from paperback.std.docs.graph_writer import GraphWriter  # noqa: E402
+
+
+class FakeDatabase:
+    """
+    stands in for `databases.Database`, records queries instead of running them
+
+    Attributes
+    ----------
+    queries: List[Any]
+        executed queries in order
+    responder: Callable[[str, Any, Any], Any]
+        called with name of method, query and values, returns rows or value,
+        can be coroutine function
+    """
+
+    def __init__(self):
+        self.queries: List[Any] = []
+        self.responder: Callable[[str, Any, Any], Any] = lambda *_: None
+
+    @staticmethod
+    def sql(query: Any) -> str:
+        if isinstance(query, str):
+            return query
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def sqls(self) -> List[str]:
+        return [self.sql(query) for query in self.queries]
+
+    async def run(self, method: str, query: Any, values: Any = None) -> Any:
+        self.queries.append(query)
+        result = self.responder(method, query, values)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def fetch_one(self, query, values=None):
+        return await self.run("fetch_one", query, values)
+
+    async def fetch_all(self, query, values=None):
+        return await self.run("fetch_all", query, values) or []
+
+    async def fetch_val(self, query, values=None):
+        return await self.run("fetch_val", query, values)
+
+    async def execute(self, query, values=None):
+        return await self.run("execute", query, values)
+
+    async def iterate(self, query, values=None):
+        for row in await self.run("iterate", query, values) or []:
+            yield row
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+@pytest.fixture
+def auth_module(tmp_path, monkeypatch):
+    """
+    `AuthImplemented` with fresh keys and `FakeDatabase` instead of postgres
+    """
+    monkeypatch.setattr(
+        AuthImplemented, "read_schema_version", lambda self: self.schema_version
+    )
+    cfg = deepcopy(AuthImplemented.DEFAULTS)
+    cfg["token"]["generate_keys"] = True
+    cfg["hash"]["workers"] = 1
+    module = AuthImplemented(config_from_dict(cfg), tmp_path)
+    module.database = FakeDatabase()
+    yield module
+    module.hash_pool.shutdown()
+
+
+@pytest.fixture
+def auth_client(auth_module) -> TestClient:
+    """
+    client of app with routes of `auth_module`
+    """
+    api = FastAPI()
+    api.include_router(auth_module.create_router(auth_module.token_tester))
+    return TestClient(api)
+
+
+def issue_token(
+    module: AuthImplemented, user_id: str, jti: Optional[str] = None, **claims: Any
+) -> str:
+    """
+    signs token in the same way as `AuthImplemented.signin`
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    payload: Dict[str, Any] = {
+        "iss": "paperback",
+        "sub": user_id,
+        "exp": int((now + datetime.timedelta(hours=1)).timestamp()),
+        "iat": int(now.timestamp()),
+        "jti": jti or str(uuid.uuid4()),
+        **claims,
+    }
+    header = {"alg": module.jwt_algorithm, "typ": "JWT"}
+    return module.jwt.encode(header, payload, module.private_key).decode("ascii")
+
+
+class FakeMatch:
+    def __init__(self, nodes: List[Node]):
+        self.nodes = nodes
+
+    def first(self):
+        return self.nodes[0] if self.nodes else None
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+
+class FakeNodes:
+    def __init__(self, graph: "FakeGraph"):
+        self.graph = graph
+
+    def match(self, label: str, **props) -> FakeMatch:
+        return FakeMatch(
+            [
+                node
+                for node in self.graph.committed
+                if node.has_label(label)
+                and all(node.get(key) == value for key, value in props.items())
+            ]
+        )
+
+
+class FakeTransaction:
+    def __init__(self, graph: "FakeGraph"):
+        self.graph = graph
+        self.created: List[Any] = []
+
+    def create(self, subgraph: Any):
+        self.created.append(subgraph)
+
+    def run(self, *args):
+        raise AssertionError("analyzer results are empty")
+
+    def commit(self):
+        self.graph.committed.extend(
+            node for node in self.created if isinstance(node, Node)
+        )
+
+
+class FakeGraph:
+    """
+    stands in for `py2neo.Graph`, keeps nodes of committed transactions in list
+    """
+
+    def __init__(self):
+        self.committed: List[Node] = []
+        self.nodes = FakeNodes(self)
+        self.graph = self
+
+    def begin(self) -> FakeTransaction:
+        return FakeTransaction(self)
+
+
+class BlockingAnalyzer:
+    """
+    analyzer, which returns empty result after `release` is set
+    """
+
+    cache_key = "1-test"
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, text: str, parent_node: Node) -> Dict[str, Any]:
+        self.started.set()
+        self.release.wait(10)
+        return {"nodes": [], "relationships": [], "commands_to_run": []}
+
+
+@pytest.fixture
+def docs_module(tmp_path):
+    """
+    docs module with single connection to graph and analyzer, which hangs until released
+    """
+    module = DocsImplemented.__new__(DocsImplemented)
+    module.logger = logging.getLogger("tests")
+    module.graph_db = FakeGraph()
+    module.graph_db.committed.append(Node("user", user_id="alice"))
+    module.root_corp = Node("corp", corp_id="root")
+    module.graph_executor = ThreadPoolExecutor(max_workers=1)
+    module.query_timeout = 5
+    module.analyzer_executor = ThreadPoolExecutor(max_workers=1)
+    module.analyzer_timeout = 5
+    module.analyzer_cache = AnalyzerCache(tmp_path, 0)
+    module.graph_writer = GraphWriter(1000)
+    module.analyzers = {AnalyzerEnum.pyexling: BlockingAnalyzer()}
+    yield module
+    module.analyzers[AnalyzerEnum.pyexling].release.set()
+    module.graph_executor.shutdown()
+    module.analyzer_executor.shutdown()
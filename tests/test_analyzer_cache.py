@@ -0,0 +1,130 @@
+import os
+from typing import Any, Dict
+
+import pytest
+from py2neo import Node, Relationship
+
+from paperback.std.docs.abc import Analyzer
+from paperback.std.docs.analyzer_cache import (
+    AnalyzerCache,
+    deserialize_result,
+    serialize_result,
+)
+
+
+def analyze(text: str, parent_node: Node) -> Dict[str, Any]:
+    text_node = Node("Text", text=text)
+    words = [Node("Word", "Token", text=word) for word in text.split()]
+    return {
+        "nodes": [text_node, *words],
+        "relationships": [
+            Relationship(parent_node, "contains", text_node),
+            *(
+                Relationship(text_node, "contains", word, idx=i)
+                for i, word in enumerate(words)
+            ),
+        ],
+        "commands_to_run": ["MATCH (n) RETURN n"],
+    }
+
+
+class HostAnalyzer(Analyzer):
+    def __init__(self, host: str):
+        self.host = host
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return {"host": self.host}
+
+    def process(self, text: str, parent_node: Node):
+        return analyze(text, parent_node)
+
+
+def test_result_survives_serialization():
+    parent = Node("AnalyzerResult")
+    result = analyze("two words", parent)
+    new_parent = Node("AnalyzerResult")
+
+    restored = deserialize_result(serialize_result(result, parent), new_parent)
+
+    assert [dict(node) for node in restored["nodes"]] == [
+        dict(node) for node in result["nodes"]
+    ]
+    assert restored["nodes"][1].labels == result["nodes"][1].labels
+    assert restored["relationships"][0].start_node is new_parent
+    assert restored["relationships"][0].end_node is restored["nodes"][0]
+    assert restored["relationships"][2].end_node is restored["nodes"][2]
+    assert type(restored["relationships"][2]).__name__ == "contains"
+    assert dict(restored["relationships"][2]) == {"idx": 1}
+    assert restored["commands_to_run"] == result["commands_to_run"]
+
+
+def test_relationship_to_unknown_node_isnt_serialized():
+    parent = Node("AnalyzerResult")
+    result = analyze("word", parent)
+    result["relationships"].append(Relationship(Node("Other"), "contains", parent))
+
+    with pytest.raises(ValueError):
+        serialize_result(result, parent)
+
+
+def test_least_recently_used_results_are_evicted_without_rescan(tmp_path, monkeypatch):
+    parent = Node("AnalyzerResult")
+    texts = [f"text number {i}" for i in range(4)]
+    cache = AnalyzerCache(tmp_path, 10**6)
+    cache.set("pyexling", "1-key", texts[0], parent, analyze(texts[0], parent))
+    file_size = cache.size
+    cache.max_size = 3 * file_size
+
+    def scan():
+        raise AssertionError("index must be kept in memory")
+
+    monkeypatch.setattr(cache, "scan", scan)
+    for text in texts[1:3]:
+        cache.set("pyexling", "1-key", text, parent, analyze(text, parent))
+    assert cache.get("pyexling", "1-key", texts[0], parent) is not None
+
+    cache.set("pyexling", "1-key", texts[3], parent, analyze(texts[3], parent))
+
+    assert cache.get("pyexling", "1-key", texts[1], parent) is None
+    assert not cache.path("pyexling", "1-key", texts[1]).exists()
+    for text in [texts[0], texts[2], texts[3]]:
+        assert cache.get("pyexling", "1-key", text, parent) is not None
+    assert cache.stats()["evicted"] == 1
+    assert cache.size == 3 * file_size
+
+
+def test_index_is_restored_from_disk_in_order_of_use(tmp_path):
+    parent = Node("AnalyzerResult")
+    cache = AnalyzerCache(tmp_path, 10**6)
+    for i, text in enumerate(["first", "second"]):
+        cache.set("pyexling", "1-key", text, parent, analyze(text, parent))
+        os.utime(cache.path("pyexling", "1-key", text), (1000 - i, 1000 - i))
+
+    restored = AnalyzerCache(tmp_path, 10**6)
+
+    assert list(restored.files) == [
+        cache.path("pyexling", "1-key", "second"),
+        cache.path("pyexling", "1-key", "first"),
+    ]
+    assert restored.size == cache.size
+
+
+def test_corrupted_result_is_removed(tmp_path):
+    parent = Node("AnalyzerResult")
+    cache = AnalyzerCache(tmp_path, 10**6)
+    cache.set("pyexling", "1-key", "text", parent, analyze("text", parent))
+    cache.path("pyexling", "1-key", "text").write_bytes(b"not gzip")
+
+    assert cache.get("pyexling", "1-key", "text", parent) is None
+    assert not cache.path("pyexling", "1-key", "text").exists()
+    assert cache.stats()["files"] == 0
+    assert cache.size == 0
+
+
+def test_cache_key_depends_on_settings_of_analyzer():
+    first = HostAnalyzer("http://first")
+
+    assert first.cache_key == HostAnalyzer("http://first").cache_key
+    assert first.cache_key != HostAnalyzer("http://second").cache_key
+    assert first.cache_key.startswith(f"{first.cache_version}-")
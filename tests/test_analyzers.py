@@ -0,0 +1,88 @@
+import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List
+
+from py2neo import Node, Relationship
+
+from paperback.std.docs.analyzers import PyExLingWrapper
+
+DOCUMENT = """
+<text>
+  <sentence text="Мама мыла раму.">
+    <clause>
+      <word idx="0" text="Мама" syntax_parent_idx="1" syntax_link_name="subj"/>
+      <word idx="1" text="мыла" syntax_parent_idx="-1"/>
+    </clause>
+    <clause>
+      <word idx="2" text="раму" syntax_parent_idx="1" syntax_link_name="obj"/>
+    </clause>
+  </sentence>
+  <sentence text="Да.">
+    <clause>
+      <word idx="0" text="Да" syntax_parent_idx="1" syntax_link_name="subj"/>
+    </clause>
+  </sentence>
+</text>
+"""
+
+
+class FakePyExLing:
+    def txt2xml(self, text: str) -> ET.Element:
+        return ET.fromstring(DOCUMENT)
+
+
+def fake_titanis(text: str) -> Dict[str, Dict[str, Any]]:
+    return {"PsyCues": {"nouns": 2}, "PsyDict": {"positive": 0.5}}
+
+
+def create_analyzer() -> PyExLingWrapper:
+    analyzer = PyExLingWrapper.__new__(PyExLingWrapper)
+    analyzer.logger = logging.getLogger("tests")
+    analyzer.pyexling = FakePyExLing()
+    analyzer.titanis = fake_titanis
+    return analyzer
+
+
+def links(relationships: List[Relationship], rel_type: str) -> List[tuple]:
+    return [
+        (rel.start_node["text"], rel.end_node["text"], dict(rel))
+        for rel in relationships
+        if type(rel).__name__ == rel_type
+    ]
+
+
+def test_syntax_links_are_built_within_sentences():
+    parent = Node("AnalyzerResult")
+
+    result = create_analyzer()("Мама мыла раму. Да.", parent)
+
+    assert links(result["relationships"], "syntax_link") == [
+        ("мыла", "Мама", {"link_name": "subj"}),
+        ("мыла", "раму", {"link_name": "obj"}),
+    ]
+    assert links(result["relationships"], "next") == [
+        ("Мама", "мыла", {}),
+        ("мыла", "раму", {}),
+    ]
+    assert result["commands_to_run"] == []
+
+
+def test_psy_node_is_attached_to_text():
+    parent = Node("AnalyzerResult")
+
+    result = create_analyzer()("Мама мыла раму. Да.", parent)
+
+    (psy,) = [node for node in result["nodes"] if node.has_label("Psy")]
+    assert dict(psy) == {"PsyCues_nouns": 2, "PsyDict_positive": 0.5}
+    (text,) = [node for node in result["nodes"] if node.has_label("Text")]
+    assert any(
+        rel.start_node is text and rel.end_node is psy
+        for rel in result["relationships"]
+        if type(rel).__name__ == "analyze_result"
+    )
+    # every node of relationships is in result, so graph writer creates it
+    nodes = {id(node) for node in result["nodes"]} | {id(parent)}
+    assert all(
+        id(rel.start_node) in nodes and id(rel.end_node) in nodes
+        for rel in result["relationships"]
+    )
@@ -0,0 +1,62 @@
+from paperback.std.auth import cache
+from paperback.std.auth.cache import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert "b" not in lru
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_ttl_expires_entries(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    lru = LRUCache(10, ttl=5)
+    lru.set("default", 1)
+    lru.set("short", 2, ttl=1)
+
+    clock.now += 2
+    assert lru.get("short") is None
+    assert lru.get("default") == 1
+
+    clock.now += 3
+    assert lru.get("default") is None
+    assert len(lru) == 0
+
+
+def test_non_positive_size_or_ttl_disables_caching():
+    empty = LRUCache(0)
+    empty.set("a", 1)
+    assert len(empty) == 0
+
+    lru = LRUCache(10)
+    lru.set("a", 1, ttl=0)
+    assert "a" not in lru
+
+
+def test_pop_evict_and_stats():
+    lru = LRUCache(10)
+    for i in range(5):
+        lru.set(i, i * 10)
+
+    assert lru.pop(0) == 0
+    assert lru.pop(0) is None
+    assert lru.evict(lambda key, value: value >= 30) == 2
+    assert lru.get(1) == 10
+    assert lru.get(4) is None
+    assert lru.stats() == {"size": 2, "maxsize": 10, "hits": 1, "misses": 1}
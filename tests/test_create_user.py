@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any, List
+
+import asyncpg
+import pytest
+import sqlalchemy as sa
+from fastapi import HTTPException
+
+
+def count_hashes(module) -> List[str]:
+    hashed: List[str] = []
+
+    async def hash_password(password: str) -> str:
+        hashed.append(password)
+        return "hashed"
+
+    module.hash_pool.hash = hash_password
+    return hashed
+
+
+def test_existing_user_id_is_rejected_without_hashing(auth_module):
+    hashed = count_hashes(auth_module)
+    auth_module.database.responder = lambda *_: {"user_id": "alice"}
+
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(auth_module.create_user("alice", "password", email="a@b.com"))
+
+    assert info.value.status_code == 409
+    assert "alice" in info.value.detail["eng"]
+    assert hashed == []
+    assert len(auth_module.database.queries) == 1
+
+
+def test_existing_email_is_rejected_without_hashing(auth_module):
+    hashed = count_hashes(auth_module)
+    auth_module.database.responder = lambda *_: {"user_id": "bob", "email": "a@b.com"}
+
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(auth_module.create_user("alice", "password", email="a@b.com"))
+
+    assert info.value.status_code == 409
+    assert "a@b.com" in info.value.detail["eng"]
+    assert hashed == []
+
+
+def test_taken_user_id_is_reported_before_taken_email(auth_module):
+    hashed = count_hashes(auth_module)
+    engine = sa.create_engine("sqlite://")
+    # without indexes rows are scanned in order of insertion,
+    # so user with the email is found first, unless query is ordered
+    engine.execute(
+        "CREATE TABLE users (user_id TEXT, email TEXT, hashed_password TEXT, "
+        "user_name TEXT, level_of_access INTEGER, member_of TEXT)"
+    )
+    engine.execute(
+        auth_module.users.insert(),
+        [
+            {"user_id": "bob", "email": "a@b.com"},
+            {"user_id": "alice", "email": "alice@b.com"},
+        ],
+    )
+    auth_module.database.responder = lambda method, query, values: (
+        engine.execute(query).first()
+    )
+
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(auth_module.create_user("alice", "password", email="a@b.com"))
+
+    assert "users with id alice" in info.value.detail["eng"]
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(auth_module.create_user("carol", "password", email="a@b.com"))
+    assert "email a@b.com" in info.value.detail["eng"]
+    assert hashed == []
+
+
+def test_email_taken_by_concurrent_insert_is_conflict(auth_module):
+    hashed = count_hashes(auth_module)
+
+    def responder(method: str, query: Any, values: Any):
+        if auth_module.database.sql(query).startswith("INSERT"):
+            raise asyncpg.UniqueViolationError("users_email_key")
+        return None
+
+    auth_module.database.responder = responder
+
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(auth_module.create_user("alice", "password", email="a@b.com"))
+
+    assert info.value.status_code == 409
+    assert "a@b.com" in info.value.detail["eng"]
+    assert hashed == ["password"]
+
+
+def test_new_user_is_hashed_once_and_inserted(auth_module):
+    hashed = count_hashes(auth_module)
+
+    def responder(method: str, query: Any, values: Any):
+        if auth_module.database.sql(query).startswith("INSERT"):
+            return {"user_id": "alice"}
+        return None
+
+    auth_module.database.responder = responder
+
+    user = asyncio.run(auth_module.create_user("alice", "password"))
+
+    assert user["hashed_password"] == "hashed"
+    assert hashed == ["password"]
+    assert len(auth_module.database.queries) == 2
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from fastapi import FastAPI, Header
+from fastapi.testclient import TestClient
+
+from paperback.abc.models import UserInfo
+from paperback.std.docs import tasks
+from paperback.std.docs.docs_implemented import AnalyzerEnum
+
+
+def token_tester(greater_or_equal=None, one_of=None):
+    async def read_user(x_authentication: str = Header(...)) -> UserInfo:
+        return UserInfo(
+            user_id=x_authentication, email=f"{x_authentication}@example.com"
+        )
+
+    return read_user
+
+
+@pytest.fixture
+def task_queue(tmp_path, monkeypatch, docs_module):
+    """
+    runs jobs in place with in-memory broker and results in shared directory
+    """
+    settings = {
+        "broker_url": "memory://",
+        "result_backend": f"file://{tmp_path}",
+        "task_always_eager": True,
+        "task_store_eager_result": True,
+    }
+    old_settings = {key: tasks.app.conf[key] for key in settings}
+    tasks.app.conf.update(settings)
+    # backend is created for each thread from config on first use
+    monkeypatch.setattr(tasks.app, "_local", threading.local())
+    monkeypatch.setattr(tasks, "docs_module", docs_module)
+    docs_module.analyzers[AnalyzerEnum.pyexling].release.set()
+    yield tasks.app
+    tasks.app.conf.update(old_settings)
+
+
+@pytest.fixture
+def client(docs_module, task_queue) -> TestClient:
+    api = FastAPI()
+    api.include_router(docs_module.create_router(token_tester))
+    return TestClient(api)
+
+
+def create_doc(client: TestClient, user_id: str, doc_id: str) -> str:
+    response = client.post(
+        "/docs",
+        params={"background": True},
+        json={"doc_id": doc_id, "text": "text", "analyzer_id": "pyexling"},
+        headers={"X-Authentication": user_id},
+    )
+    assert response.status_code == 202
+    return response.json()["job_id"]
+
+
+def test_job_is_read_by_its_creator(client, docs_module):
+    job_id = create_doc(client, "alice", "doc")
+
+    response = client.get(f"/docs/jobs/{job_id}", headers={"X-Authentication": "alice"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "SUCCESS"
+    assert response.json()["result"] == {"doc_id": "doc"}
+    assert docs_module.graph_db.nodes.match("Document", doc_id="doc").first()
+
+
+def test_job_is_hidden_from_other_users(client):
+    job_id = create_doc(client, "alice", "doc")
+
+    response = client.get(f"/docs/jobs/{job_id}", headers={"X-Authentication": "bob"})
+
+    assert response.status_code == 403
+    assert "result" not in response.json()
+
+
+def test_unknown_job_is_pending(client):
+    response = client.get("/docs/jobs/unknown", headers={"X-Authentication": "bob"})
+
+    assert response.json() == {
+        "job_id": "unknown",
+        "status": "PENDING",
+        "progress": None,
+        "result": None,
+        "error": None,
+    }
+
+
+def test_docs_plugin_defaults_to_standard_implementation():
+    name, cls = tasks.find_docs_plugin()
+
+    assert name == "docs"
+    assert cls.__name__ == "DocsImplemented"
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from paperback.exceptions import PaperBackError
+from paperback.std.docs.docs_implemented import AnalyzerEnum
+
+
+def test_reads_progress_while_analyzer_hangs(docs_module):
+    analyzer = docs_module.analyzers[AnalyzerEnum.pyexling]
+
+    async def scenario():
+        creation = asyncio.ensure_future(
+            docs_module.create_doc(
+                creator_id="alice", creator_type="user", doc_id="doc", text="text"
+            )
+        )
+        loop = asyncio.get_event_loop()
+        assert await loop.run_in_executor(None, analyzer.started.wait, 5)
+
+        # graph pool has one thread, reads would wait for analyzer if it held it
+        reads = await asyncio.wait_for(
+            asyncio.gather(
+                *(docs_module.read_docs(requester_id="bob") for _ in range(10))
+            ),
+            1,
+        )
+        assert not creation.done()
+
+        analyzer.release.set()
+        await creation
+        return reads
+
+    assert asyncio.run(scenario()) == [[]] * 10
+    assert docs_module.graph_db.nodes.match("Document", doc_id="doc").first()
+
+
+def test_analyzer_timeout_doesnt_save_document(docs_module):
+    docs_module.analyzer_timeout = 0.1
+    docs_module.query_timeout = 0.1
+
+    with pytest.raises(PaperBackError) as info:
+        asyncio.run(
+            docs_module.create_doc(
+                creator_id="alice", creator_type="user", doc_id="doc", text="text"
+            )
+        )
+    assert info.value.status_code == 504
+    assert "Analyzer" in info.value.detail["eng"]
+
+    # graph pool stays free while analyzer is still running
+    assert asyncio.run(docs_module.read_docs(requester_id="bob")) == []
+    docs_module.analyzers[AnalyzerEnum.pyexling].release.set()
+    docs_module.analyzer_executor.shutdown()
+    assert docs_module.graph_db.nodes.match("Document").first() is None
@@ -0,0 +1,40 @@
+import asyncio
+from typing import List, Optional
+
+from paperback.std.auth import cache
+from paperback.std.auth.geo import GeoBackend, GeoLocator
+
+
+class CountingBackend(GeoBackend):
+    def __init__(self, locations):
+        self.locations = locations
+        self.calls: List[str] = []
+
+    async def locate(self, ip: str) -> Optional[str]:
+        self.calls.append(ip)
+        location = self.locations.get(ip)
+        if isinstance(location, Exception):
+            raise location
+        return location
+
+
+def test_known_and_unknown_locations_are_cached(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    backend = CountingBackend(
+        {"1.1.1.1": "Sydney", "3.3.3.3": TimeoutError("ipstack is slow")}
+    )
+    locator = GeoLocator([backend], cache_size=16, unknown_ttl=60)
+
+    async def locate_all():
+        return [
+            await locator.locate(ip) for ip in ["1.1.1.1", "2.2.2.2", "3.3.3.3"] * 3
+        ]
+
+    assert asyncio.run(locate_all()) == ["Sydney", "Unknown", "Unknown"] * 3
+    assert backend.calls == ["1.1.1.1", "2.2.2.2", "3.3.3.3"]
+
+    # unknown locations are retried after shorter ttl, known ones stay cached
+    now[0] += 61
+    assert asyncio.run(locate_all())[:3] == ["Sydney", "Unknown", "Unknown"]
+    assert backend.calls[3:] == ["2.2.2.2", "3.3.3.3"]
@@ -0,0 +1,78 @@
+import itertools
+from typing import Any, Dict, List, Tuple
+
+from py2neo import Node, Relationship
+
+from paperback.std.docs.graph_writer import GraphWriter, escape_name
+
+
+class FakeResult:
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+
+    def data(self) -> List[Dict[str, Any]]:
+        return self.records
+
+
+class FakeTransaction:
+    """
+    records statements and assigns ids to created nodes
+    """
+
+    def __init__(self):
+        self.graph = object()
+        self.statements: List[Tuple[str, List[Dict[str, Any]]]] = []
+        self.ids = itertools.count(100)
+
+    def run(self, query: str, rows: List[Dict[str, Any]]) -> FakeResult:
+        self.statements.append((query, rows))
+        if "RETURN" not in query:
+            return FakeResult([])
+        return FakeResult([{"key": row["key"], "id": next(self.ids)} for row in rows])
+
+
+def test_nodes_and_relationships_are_grouped_into_batches():
+    parent = Node("AnalyzerResult")
+    parent.identity = 1
+    text = Node("Text", text="two words")
+    words = [Node("Word", idx=i) for i in range(5)]
+    relationships = [Relationship(parent, "contains", text)]
+    relationships += [Relationship(text, "contains", word) for word in words]
+    relationships += [Relationship(a, "next", b) for a, b in zip(words, words[1:])]
+    tx = FakeTransaction()
+
+    GraphWriter(batch_size=2).write(tx, [text, *words], relationships)
+
+    queries = [query for query, _ in tx.statements]
+    # 1 batch of texts, 3 of words, 3 of `contains` and 2 of `next`
+    assert len(queries) == 9
+    assert sum("CREATE (n:`Text`)" in query for query in queries) == 1
+    assert sum("CREATE (n:`Word`)" in query for query in queries) == 3
+    assert sum("[x:`contains`]" in query for query in queries) == 3
+    assert sum("[x:`next`]" in query for query in queries) == 2
+    assert all(len(rows) <= 2 for _, rows in tx.statements)
+
+    assert parent.identity == 1
+    assert all(node.identity is not None for node in [text, *words])
+    assert all(node.graph is tx.graph for node in [text, *words])
+    contains = [rows for query, rows in tx.statements if "`contains`" in query]
+    assert contains[0][0] == {"start": 1, "end": text.identity, "props": {}}
+
+
+def test_nodes_of_relationships_are_created_once():
+    a, b = Node("Word", "Token", idx=0), Node("Token", "Word", idx=1)
+    tx = FakeTransaction()
+
+    GraphWriter().write(tx, [a], [Relationship(a, "next", b, weight=1)])
+
+    created = [rows for query, rows in tx.statements if "RETURN" in query]
+    assert len(created) == 1
+    assert sorted(row["props"]["idx"] for row in created[0]) == [0, 1]
+    assert tx.statements[-1][1] == [
+        {"start": a.identity, "end": b.identity, "props": {"weight": 1}}
+    ]
+
+
+def test_names_are_escaped():
+    assert escape_name("Word") == "`Word`"
+    assert escape_name("we`ird") == "`we``ird`"
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+from fastapi.testclient import TestClient
+
+from paperback.std.auth import crypto
+from paperback.std.auth.crypto import HashPool
+from tests.conftest import issue_token
+
+ADMIN = {
+    "user_id": "root",
+    "user_name": "Root",
+    "email": "root@example.com",
+    "level_of_access": 3,
+    "member_of": "public",
+}
+
+
+def prepare_import(module, client: TestClient) -> List[Tuple[int, Any]]:
+    imported: List[Tuple[int, Any]] = []
+
+    async def import_users(users):
+        imported.extend(users)
+        return []
+
+    module.import_users = import_users
+    module.database.responder = lambda *_: dict(ADMIN)
+    client.headers["X-Authentication"] = issue_token(module, "root")
+    return imported
+
+
+def test_csv_fields_can_contain_newlines(auth_module, auth_client):
+    imported = prepare_import(auth_module, auth_client)
+    body = (
+        "user_id,email,password,user_name\r\n"
+        'alice,alice@example.com,secret,"Alice\r\nLiddell"\r\n'
+        "\r\n"
+        'bob,bob@example.com,"pass, ""word""",Bob\r\n'
+    )
+
+    response = auth_client.post(
+        "/usrs/import", data=body.encode("utf-8"), headers={"content-type": "text/csv"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 2, "errors": []}
+    assert [(row, user.user_id) for row, user in imported] == [(1, "alice"), (2, "bob")]
+    assert imported[0][1].user_name == "Alice\nLiddell"
+    assert imported[1][1].password == 'pass, "word"'
+
+
+def test_unclosed_quote_is_reported(auth_module, auth_client):
+    imported = prepare_import(auth_module, auth_client)
+    body = 'user_id,email,password\nalice,alice@example.com,"secret\n'
+
+    response = auth_client.post(
+        "/usrs/import", data=body.encode("utf-8"), headers={"content-type": "text/csv"}
+    )
+
+    assert response.json()["created"] == 0
+    assert response.json()["errors"][0]["row"] == 1
+
+
+def test_non_utf8_body_is_unprocessable(auth_module, auth_client):
+    imported = prepare_import(auth_module, auth_client)
+    body = (
+        "user_id,email,password\n".encode("utf-8")
+        + "alice,alice@example.com,secret\n".encode("utf-8")
+        + "bob,bob@example.com,пароль\n".encode("cp1251")
+    )
+
+    response = auth_client.post(
+        "/usrs/import", data=body, headers={"content-type": "text/csv"}
+    )
+
+    assert response.status_code == 422
+    assert "line 3" in response.json()["detail"]["eng"]
+
+
+def test_bulk_hashing_leaves_process_for_signins(monkeypatch):
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def hash_passwords(passwords: List[str]) -> List[str]:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return [password[::-1] for password in passwords]
+
+    monkeypatch.setattr(crypto, "hash_passwords", hash_passwords)
+    pool = HashPool(workers=3, max_pending=8, settings={})
+    pool.executor.shutdown()
+    pool.executor = ThreadPoolExecutor(max_workers=3)
+    try:
+        passwords = [f"password{i}" for i in range(200)]
+        hashed = asyncio.run(pool.hash_many(passwords, chunk_size=4))
+    finally:
+        pool.shutdown()
+
+    assert hashed == [password[::-1] for password in passwords]
+    assert max_running == pool.bulk_workers == 2
@@ -0,0 +1,59 @@
+import uuid
+from typing import Any, Dict, Optional
+
+from tests.conftest import issue_token
+
+ORGANIZER: Dict[str, Any] = {
+    "user_id": "organizer",
+    "user_name": "Organizer",
+    "email": "organizer@example.com",
+    "level_of_access": 1,
+    "member_of": "public",
+}
+
+
+def serve_invite_code(module, invite_code: Optional[Dict[str, Any]]):
+    def responder(method: str, query: Any, values: Any):
+        sql = module.database.sql(query)
+        if "FROM tokens JOIN users" in sql:
+            return dict(ORGANIZER)
+        if "FROM invitation_codes" in sql and method == "fetch_one":
+            return invite_code
+        if "FROM invitation_codes" in sql and method == "fetch_all":
+            return [invite_code] if invite_code else []
+
+    module.database.responder = responder
+
+
+def test_deleting_missing_invite_code_is_conflict(auth_module, auth_client):
+    serve_invite_code(auth_module, None)
+    headers = {"X-Authentication": issue_token(auth_module, "organizer")}
+
+    response = auth_client.delete("/invites/missing", headers=headers)
+
+    assert response.status_code == 409
+    assert "missing" in response.json()["detail"]["eng"]
+    assert not any(sql.startswith("DELETE") for sql in auth_module.database.sqls())
+
+
+def test_reading_missing_invite_code_is_conflict(auth_module, auth_client):
+    serve_invite_code(auth_module, None)
+
+    assert auth_client.get("/invites/missing").status_code == 409
+
+
+def test_deleting_own_invite_code(auth_module, auth_client):
+    serve_invite_code(
+        auth_module,
+        {
+            "invitation_code_uuid": uuid.uuid4(),
+            "code": "welcome1",
+            "issuer_id": "organizer",
+            "add_to": "public",
+            "num_registered": 0,
+        },
+    )
+    headers = {"X-Authentication": issue_token(auth_module, "organizer")}
+
+    assert auth_client.delete("/invites/welcome1", headers=headers).status_code == 200
+    assert auth_module.database.sqls()[-1].startswith("DELETE FROM invitation_codes")
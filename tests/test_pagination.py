@@ -0,0 +1,277 @@
+import datetime
+import json
+import uuid
+from typing import Any, Dict, List
+
+import pytest
+import sqlalchemy as sa
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from paperback.std.auth.pagination import decode_cursor, encode_cursor
+from tests.conftest import issue_token
+
+
+def serve_keyset(module, key: str, rows: List[Dict[str, Any]], requester):
+    """
+    answers keyset queries from `rows` as postgres would,
+    token lookups return `requester`
+    """
+    rows = sorted(rows, key=lambda row: row[key])
+
+    def responder(method: str, query: Any, values: Any):
+        sql = module.database.sql(query)
+        if "FROM tokens JOIN users" in sql:
+            return dict(requester)
+        params = query.compile().params
+        after = [value for name, value in params.items() if name.startswith(key)]
+        page = [row for row in rows if not after or row[key] > after[0]]
+        return page[: query._limit]
+
+    module.database.responder = responder
+
+
+def serve_sqlite(module, tables: Dict[str, List[Dict[str, Any]]], requester):
+    """
+    runs queries in in-memory sqlite filled with `tables`,
+    token lookups return `requester`
+    """
+    engine = sa.create_engine("sqlite://")
+    module.metadata.create_all(engine)
+    for name, rows in tables.items():
+        engine.execute(module.metadata.tables[name].insert(), rows)
+
+    def responder(method: str, query: Any, values: Any):
+        if "FROM tokens JOIN users" in module.database.sql(query):
+            return dict(requester)
+        return [dict(row) for row in engine.execute(query)]
+
+    module.database.responder = responder
+
+
+def read_all_pages(client: TestClient, url: str, headers: Dict[str, str]):
+    items: List[Dict[str, Any]] = []
+    pages = 0
+    cursor = None
+    while True:
+        params = {"limit": 1000}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        pages += 1
+        items.extend(response.json()["response"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def test_users_are_read_with_one_keyset_query_per_page(auth_module, auth_client):
+    users = [
+        {
+            "user_id": f"user{i:05}",
+            "user_name": f"User {i}",
+            "email": f"user{i}@example.com",
+            "level_of_access": 0,
+            "member_of": "public",
+        }
+        for i in range(2500)
+    ]
+    users[0]["level_of_access"] = 3
+    serve_keyset(auth_module, "user_id", users, users[0])
+    headers = {"X-Authentication": issue_token(auth_module, users[0]["user_id"])}
+
+    items, pages = read_all_pages(auth_client, "/usrs", headers)
+
+    assert [item["user_id"] for item in items] == [user["user_id"] for user in users]
+    assert pages == 3
+    sqls = [sql for sql in auth_module.database.sqls() if "FROM tokens JOIN" not in sql]
+    assert len(sqls) == pages
+    assert all("ORDER BY users.user_id" in sql and "LIMIT" in sql for sql in sqls)
+    assert "users.user_id >" not in sqls[0]
+    assert all("users.user_id >" in sql for sql in sqls[1:])
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_users_are_read_only_by_admins(auth_module, auth_client, stream):
+    user = {
+        "user_id": "alice",
+        "user_name": "Alice",
+        "email": "alice@example.com",
+        "level_of_access": 2,
+        "member_of": "public",
+    }
+    serve_keyset(auth_module, "user_id", [user], user)
+    client = auth_client
+    params = {"stream": stream}
+
+    assert client.get("/usrs", params=params).status_code == 422
+    headers = {"X-Authentication": issue_token(auth_module, "alice")}
+    assert client.get("/usrs", params=params, headers=headers).status_code == 401
+    assert not any("FROM users" in sql for sql in auth_module.database.sqls()[1:])
+
+
+def test_visible_invite_codes_are_read_without_per_code_lookups(
+    auth_module, auth_client
+):
+    organizer = {
+        "user_id": "organizer",
+        "user_name": "Organizer",
+        "email": "organizer@example.com",
+        "level_of_access": 2,
+        "member_of": "university",
+    }
+    codes = [
+        {
+            "invitation_code_uuid": uuid.uuid4(),
+            "code": f"code{i:06}",
+            "issuer_id": f"issuer{i % 50}",
+            "add_to": "university",
+            "num_registered": 0,
+        }
+        for i in range(3000)
+    ]
+    serve_keyset(auth_module, "code", codes, organizer)
+    headers = {"X-Authentication": issue_token(auth_module, "organizer")}
+
+    items, pages = read_all_pages(auth_client, "/invites", headers)
+
+    assert len(items) == len(codes)
+    assert pages == 3
+    sqls = auth_module.database.sqls()
+    # one token lookup per request and one query per page
+    assert len(sqls) == 2 * pages
+    code_queries = [sql for sql in sqls if "FROM invitation_codes" in sql]
+    assert len(code_queries) == pages
+    assert all("member_of" in sql for sql in code_queries)
+
+
+ORG_USERS: List[Dict[str, Any]] = [
+    {"user_id": "admin", "level_of_access": 3, "member_of": "public"},
+    {"user_id": "organizer", "level_of_access": 2, "member_of": "university"},
+    {"user_id": "student", "level_of_access": 1, "member_of": "university"},
+    {"user_id": "stranger", "level_of_access": 2, "member_of": "other"},
+]
+ORG_CODES: List[Dict[str, Any]] = [
+    {"code": "organizer-university", "issuer_id": "organizer", "add_to": "university"},
+    {"code": "student-university", "issuer_id": "student", "add_to": "university"},
+    {"code": "stranger-other", "issuer_id": "stranger", "add_to": "other"},
+    {"code": "stranger-public", "issuer_id": "stranger", "add_to": "public"},
+    {"code": "admin-other", "issuer_id": "admin", "add_to": "other"},
+]
+
+
+@pytest.mark.parametrize(
+    "user_id, visible",
+    [
+        # own codes and codes to public organisation
+        ("student", {"student-university", "stranger-public"}),
+        # and codes of issuers from the same organisation
+        (
+            "organizer",
+            {"organizer-university", "student-university", "stranger-public"},
+        ),
+        ("stranger", {"stranger-other", "stranger-public"}),
+        # all codes
+        ("admin", {code["code"] for code in ORG_CODES}),
+    ],
+)
+def test_invite_codes_are_filtered_by_access_level(
+    auth_module, auth_client, user_id, visible
+):
+    users = [
+        {**user, "user_name": user["user_id"], "email": f"{user['user_id']}@a.com"}
+        for user in ORG_USERS
+    ]
+    codes = [
+        {**code, "invitation_code_uuid": uuid.uuid4().bytes, "used_times": 0}
+        for code in ORG_CODES
+    ]
+    requester = next(user for user in users if user["user_id"] == user_id)
+    serve_sqlite(auth_module, {"users": users, "invitation_codes": codes}, requester)
+    headers = {"X-Authentication": issue_token(auth_module, user_id)}
+
+    response = auth_client.get("/invites", headers=headers)
+    streamed = auth_client.get("/invites", params={"stream": True}, headers=headers)
+
+    assert response.status_code == 200
+    assert {code["code"] for code in response.json()["response"]} == visible
+    assert streamed.status_code == 200
+    assert {
+        json.loads(line)["code"] for line in streamed.text.splitlines() if line
+    } == visible
+
+
+def test_cursor_round_trip():
+    values = ["2021-08-01T10:00:00+00:00", uuid.uuid4().hex]
+    cursor = encode_cursor(values)
+
+    assert decode_cursor(cursor, [str, str]) == values
+    assert decode_cursor(encode_cursor([12]), [int]) == [12]
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1, 2]), "e30="])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as info:
+        decode_cursor(cursor, [str])
+    assert info.value.status_code == 400
+
+
+def test_tokens_are_read_with_one_keyset_query_per_page(auth_module, auth_client):
+    owner = {
+        "user_id": "alice",
+        "user_name": "Alice",
+        "email": "alice@example.com",
+        "level_of_access": 0,
+        "member_of": "public",
+    }
+    start = datetime.datetime(2021, 8, 1, tzinfo=datetime.timezone.utc)
+    tokens = [
+        {
+            "token_uuid": uuid.uuid4().bytes,
+            "issued_by": "alice",
+            "location": "Unknown",
+            "device": "Other",
+            # pairs of tokens share time, so that pages are split by uuid too
+            "issued_at": start + datetime.timedelta(minutes=i // 2),
+            "expires_at": start + datetime.timedelta(days=1),
+        }
+        for i in range(2500)
+    ]
+    tokens.sort(
+        key=lambda token: (token["issued_at"], token["token_uuid"]), reverse=True
+    )
+
+    def responder(method: str, query: Any, values: Any):
+        sql = auth_module.database.sql(query)
+        if "FROM tokens JOIN users" in sql:
+            return dict(owner)
+        params = query.compile().params
+        # limit is bound as parameter too
+        after = [
+            params[name]
+            for name in sorted(params)
+            if name.startswith("param_") and not isinstance(params[name], int)
+        ]
+        page = [
+            token
+            for token in tokens
+            if not after or (token["issued_at"], token["token_uuid"]) < tuple(after)
+        ]
+        return page[: query._limit]
+
+    auth_module.database.responder = responder
+    headers = {"X-Authentication": issue_token(auth_module, "alice")}
+
+    items, pages = read_all_pages(auth_client, "/tokens", headers)
+
+    assert [uuid.UUID(item["token_uuid"]).bytes for item in items] == [
+        token["token_uuid"] for token in tokens
+    ]
+    assert pages == 3
+    sqls = [sql for sql in auth_module.database.sqls() if "FROM tokens JOIN" not in sql]
+    assert len(sqls) == pages
+    assert all(
+        "ORDER BY tokens.issued_at DESC, tokens.token_uuid DESC" in sql for sql in sqls
+    )
+    assert all("(tokens.issued_at, tokens.token_uuid) <" in sql for sql in sqls[1:])
@@ -0,0 +1,52 @@
+import pytest
+
+from paperback.std.auth import ratelimit
+from paperback.std.auth.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_is_allowed_then_rejected_until_refill(clock):
+    limiter = RateLimiter(rate=2, burst=3, maxsize=16)
+
+    assert [limiter.acquire("alice") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("alice") == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert limiter.acquire("alice") == 0
+    assert limiter.acquire("alice") > 0
+    assert limiter.stats() == {"keys": 1, "maxsize": 16, "rejected": 2}
+
+
+def test_bucket_refills_up_to_burst(clock):
+    limiter = RateLimiter(rate=1, burst=2, maxsize=16)
+    limiter.acquire("alice")
+    limiter.acquire("alice")
+
+    clock[0] += 100
+    assert limiter.acquire("alice") == 0
+    assert limiter.acquire("alice") == 0
+    assert limiter.acquire("alice") > 0
+
+
+def test_keys_have_separate_buckets_and_are_bounded(clock):
+    limiter = RateLimiter(rate=1, burst=1, maxsize=2)
+
+    assert limiter.acquire("alice") == 0
+    assert limiter.acquire("bob") == 0
+    assert limiter.acquire("alice") > 0
+
+    limiter.acquire("carol")
+    assert limiter.stats()["keys"] == 2
+
+
+def test_non_positive_rate_disables_limiter(clock):
+    limiter = RateLimiter(rate=0, burst=1, maxsize=2)
+
+    assert all(limiter.acquire("alice") == 0 for _ in range(100))
+    assert limiter.stats()["rejected"] == 0
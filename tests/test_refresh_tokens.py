@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import issue_token
+
+USER: Dict[str, Any] = {
+    "user_id": "alice",
+    "user_name": "Alice",
+    "email": "alice@example.com",
+    "level_of_access": 1,
+    "member_of": "public",
+}
+
+
+@pytest.fixture
+def stateless_auth(auth_module):
+    auth_module.issues_access_tokens = True
+    auth_module.database.responder = lambda *_: dict(USER)
+    return auth_module
+
+
+def test_refresh_token_is_rejected_for_access(stateless_auth):
+    refresh_token = issue_token(stateless_auth, "alice", scope="refresh")
+
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(stateless_auth.token2user(refresh_token))
+    assert info.value.status_code == 403
+
+
+def test_access_token_is_rejected_for_refresh(stateless_auth):
+    refresh_token = issue_token(stateless_auth, "alice", scope="refresh")
+    access_token = asyncio.run(stateless_auth.refresh(refresh_token)).decode("ascii")
+
+    assert asyncio.run(stateless_auth.token2user(access_token))["user_id"] == "alice"
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(stateless_auth.refresh(access_token))
+    assert info.value.status_code == 403
+
+
+def test_token_without_scope_is_rejected_for_refresh(stateless_auth):
+    with pytest.raises(HTTPException):
+        asyncio.run(stateless_auth.refresh(issue_token(stateless_auth, "alice")))
+
+
+def test_routes_check_scope_of_tokens(stateless_auth, auth_client):
+    stateless_auth.database.responder = lambda method, *_: (
+        [] if method == "fetch_all" else dict(USER)
+    )
+    client = auth_client
+    refresh_token = issue_token(stateless_auth, "alice", scope="refresh")
+
+    response = client.post("/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    access_token = response.json()["response"]
+
+    assert client.get("/tokens", headers={"X-Authentication": access_token}).ok
+    assert (
+        client.get("/tokens", headers={"X-Authentication": refresh_token}).status_code
+        == 403
+    )
+    assert (
+        client.post("/refresh", json={"refresh_token": access_token}).status_code == 403
+    )
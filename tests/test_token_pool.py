@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict
+
+from paperback.std.auth.database import InstrumentedPool
+from tests.conftest import FakeDatabase, issue_token
+
+USER: Dict[str, Any] = {
+    "user_id": "alice",
+    "user_name": "Alice",
+    "email": "alice@example.com",
+    "level_of_access": 0,
+    "member_of": "public",
+}
+
+
+class FakePool:
+    """
+    stands in for `asyncpg.Pool` with `max_size` connections
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.free: "asyncio.Queue[object]" = asyncio.Queue()
+        for _ in range(max_size):
+            self.free.put_nowait(object())
+
+    async def acquire(self, *, timeout=None) -> object:
+        return await asyncio.wait_for(self.free.get(), timeout)
+
+    async def release(self, connection: object, *, timeout=None):
+        self.free.put_nowait(connection)
+
+    def get_size(self) -> int:
+        return self.max_size
+
+    def get_min_size(self) -> int:
+        return self.max_size
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    def get_idle_size(self) -> int:
+        return self.free.qsize()
+
+
+class PooledDatabase(FakeDatabase):
+    """
+    `FakeDatabase`, which holds connection of `pool` during every query
+    """
+
+    def __init__(self, pool: InstrumentedPool):
+        super().__init__()
+        self.pool = pool
+        self.max_in_use = 0
+
+    async def run(self, method: str, query: Any, values: Any = None) -> Any:
+        connection = await self.pool.acquire()
+        try:
+            self.max_in_use = max(self.max_in_use, self.pool.in_use)
+            return await super().run(method, query, values)
+        finally:
+            await self.pool.release(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+
+def test_concurrent_requests_share_bounded_pool(auth_module):
+    requests = 300
+    tokens = [issue_token(auth_module, "alice") for _ in range(requests)]
+    read_user = auth_module.token_tester(greater_or_equal=0)
+
+    async def responder(method: str, query: Any, values: Any):
+        # connection is held while postgres answers
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return dict(USER)
+
+    async def main():
+        pool = InstrumentedPool(FakePool(max_size=5), acquire_timeout=5)
+        auth_module.database = PooledDatabase(pool)
+        auth_module.database.responder = responder
+        users = await asyncio.gather(*(read_user(token) for token in tokens))
+        return users, auth_module.database
+
+    users, database = asyncio.run(main())
+
+    assert [user.user_id for user in users] == ["alice"] * requests
+    # every token is new, so every request reads it's owner from database
+    assert len(database.queries) == requests
+    assert database.max_in_use == 5
+    stats = database.stats()
+    assert stats["timeouts"] == 0
+    assert stats["acquired"] == requests
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["idle"] == 5
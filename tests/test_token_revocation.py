@@ -0,0 +1,174 @@
+import asyncio
+import uuid
+from typing import Any, Dict, Set
+
+import pytest
+from fastapi import HTTPException
+
+from paperback.std.auth import auth_implemented
+from tests.conftest import FakeDatabase, issue_token
+
+USER: Dict[str, Any] = {
+    "user_id": "alice",
+    "user_name": "Alice",
+    "email": None,
+    "level_of_access": 0,
+    "member_of": "public",
+}
+
+
+def serve_tokens(module, tokens: Set[bytes]):
+    """
+    answers queries of token lookup and revocation from `tokens`,
+    notifications are delivered to `module` as if they came from postgres
+    """
+    database: FakeDatabase = module.database
+
+    async def responder(method: str, query: Any, values: Any):
+        sql = database.sql(query)
+        # let other tasks run between start and end of every query
+        await asyncio.sleep(0)
+        if sql.startswith("SELECT pg_notify"):
+            module.on_revocation(None, 0, values["channel"], values["payload"])
+        elif sql.startswith("DELETE FROM tokens"):
+            tokens.clear()
+        elif "FROM tokens JOIN users" in sql:
+            row = dict(USER) if tokens else None
+            # row is read before revocation, but arrives after it
+            for _ in range(5):
+                await asyncio.sleep(0)
+            return row
+        elif sql.startswith("SELECT tokens"):
+            return [{"token_uuid": token} for token in tokens]
+
+    database.responder = responder
+
+
+def test_revocation_invalidates_cache_for_concurrent_validations(auth_module):
+    jti = str(uuid.uuid4())
+    token = issue_token(auth_module, "alice", jti)
+    tokens = {uuid.UUID(jti).bytes}
+    serve_tokens(auth_module, tokens)
+    auth_module.listening_for_revocations = True
+
+    async def main():
+        revoked = asyncio.Event()
+        accepted_after_revocation = 0
+
+        async def validate():
+            nonlocal accepted_after_revocation
+            for _ in range(20):
+                was_revoked = revoked.is_set()
+                try:
+                    await auth_module.token2user(token)
+                except HTTPException as exception:
+                    assert exception.status_code == 403
+                    continue
+                if was_revoked:
+                    accepted_after_revocation += 1
+
+        async def revoke():
+            await asyncio.sleep(0)
+            await auth_module.delete_token(jti)
+            revoked.set()
+
+        await asyncio.gather(revoke(), *(validate() for _ in range(50)))
+
+        assert accepted_after_revocation == 0
+        assert jti not in auth_module.token_cache
+        with pytest.raises(HTTPException):
+            await auth_module.token2user(token)
+        assert jti not in auth_module.token_cache
+
+    asyncio.run(main())
+    assert not tokens
+
+
+def test_cached_token_skips_database(auth_module):
+    jti = str(uuid.uuid4())
+    token = issue_token(auth_module, "alice", jti)
+    serve_tokens(auth_module, {uuid.UUID(jti).bytes})
+    auth_module.listening_for_revocations = True
+
+    async def main():
+        for _ in range(10):
+            assert (await auth_module.token2user(token))["user_id"] == "alice"
+
+    asyncio.run(main())
+    assert len(auth_module.database.queries) == 1
+    assert jti in auth_module.token_cache
+
+
+def test_user_eviction_during_lookup_isnt_undone(auth_module):
+    jti = str(uuid.uuid4())
+    token = issue_token(auth_module, "alice", jti)
+    serve_tokens(auth_module, {uuid.UUID(jti).bytes})
+    auth_module.listening_for_revocations = True
+
+    async def main():
+        lookup = asyncio.create_task(auth_module.token2user(token))
+        # lookup has read the user, but hasn't received the row yet
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        auth_module.evict_user_tokens("alice")
+        assert (await lookup)["user_id"] == "alice"
+        assert jti not in auth_module.token_cache
+
+        await auth_module.token2user(token)
+        assert jti in auth_module.token_cache
+
+    asyncio.run(main())
+
+
+class FakeConnection:
+    """
+    stands in for `asyncpg.Connection`, which listens for notifications
+    """
+
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.closed = False
+        self.listeners: Dict[str, Any] = {}
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel: str, callback):
+        if self.fail:
+            raise ConnectionResetError("connection was reset")
+        self.listeners[channel] = callback
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def test_listener_is_restored_after_failure(auth_module, monkeypatch):
+    connections = []
+
+    async def connect(url: str) -> FakeConnection:
+        connections.append(FakeConnection(fail=not connections))
+        return connections[-1]
+
+    monkeypatch.setattr(auth_implemented.asyncpg, "connect", connect)
+    auth_module.revocation_retry_delay = 0
+
+    async def main():
+        listener = asyncio.create_task(auth_module.listen_for_revocations())
+        for _ in range(100):
+            await asyncio.sleep(0)
+            if auth_module.listening_for_revocations:
+                break
+        listener.cancel()
+        assert auth_module.listening_for_revocations
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+    asyncio.run(main())
+    assert len(connections) == 2
+    assert connections[0].closed
+    assert auth_module.revocation_channel in connections[1].listeners
+    assert connections[1].closed
+    assert not auth_module.listening_for_revocations